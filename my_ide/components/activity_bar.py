@@ -20,6 +20,7 @@ class ActivityBar(QWidget):
         # 添加按钮
         self.add_button("resource_manager","./my_ide/resources/activity_bar/resource_manager.png","资源管理器")
         self.add_button("search_panel","./my_ide/resources/activity_bar/search_panel.png","搜索")
+        self.add_button("outline_panel","./my_ide/resources/activity_bar/outline.png","大纲")
         
         self.layout.itemAt(0).widget().setChecked(True)  # 默认选中第一个按钮
 
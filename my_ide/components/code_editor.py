@@ -1,20 +1,78 @@
 import re
-from PySide6.QtWidgets import QPlainTextEdit
-from PySide6.QtGui import QKeyEvent, QTextCursor
-from PySide6.QtCore import Qt
+import time
+from PySide6.QtWidgets import QPlainTextEdit, QCompleter
+from PySide6.QtGui import QKeyEvent, QTextCursor, QPainter
+from PySide6.QtCore import Qt, QTimer, QStringListModel, Signal, QRectF
+
+from my_ide.core.completion import DocumentWords, CompletionEngine
+from my_ide.core.outline import DocumentStructure, innermost_region, replaced_line_count
+from my_ide.config.settings import (COMPLETION_MIN_PREFIX, COMPLETION_MAX_RESULTS, COMPLETION_BUDGET_MS,
+                                    EDITOR_SYNC_SCAN_LINES, EDITOR_SCAN_SLICE_MS, OUTLINE_UPDATE_MS)
+
+# 光标前正在输入的标识符
+_PREFIX_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*$')
+
 
 class CodeEditor(QPlainTextEdit):
     """
-    一个增强的 QPlainTextEdit，支持自动缩进功能。
+    一个增强的 QPlainTextEdit，支持自动缩进、代码补全和代码折叠。
     """
+    structure_changed = Signal()  # 编辑停止 OUTLINE_UPDATE_MS 后发出，大纲据此刷新
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.tab_stop_width_spaces = 4  # 以空格计的Tab宽度
 
+        # 补全用的标识符和折叠用的花括号/region，按块记录
+        # words 和 structure 中的行和文档的前 len(words) 个块一一对应，没有扫描的块由定时器在空闲时分批处理
+        self.words = DocumentWords()
+        self.structure = DocumentStructure()
+        self.completion = CompletionEngine(self.words)
+        self._block_count = self.document().blockCount()
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setSingleShot(True)
+        self._scan_timer.setInterval(0)
+        self._scan_timer.timeout.connect(self._scan_blocks)
+        self._structure_timer = QTimer(self)
+        self._structure_timer.setSingleShot(True)
+        self._structure_timer.setInterval(OUTLINE_UPDATE_MS)
+        self._structure_timer.timeout.connect(self.structure_changed)
+        self.document().contentsChange.connect(self._on_contents_change)
+        self.cursorPositionChanged.connect(self._reveal_cursor)
+        self._scan_timer.start()
+
+        self.completer = QCompleter(self)
+        self.completer.setWidget(self)
+        self.completer.setModel(QStringListModel(self.completer))
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseSensitive)
+        self.completer.activated.connect(self._insert_completion)
+
     def keyPressEvent(self, event: QKeyEvent):
         """
-        重写 keyPressEvent 来处理回车键，以实现自动缩进。
+        重写 keyPressEvent 来处理回车键，以实现自动缩进；输入标识符时弹出补全列表。
         """
+        popup = self.completer.popup()
+        # 补全列表显示时这些键由 QCompleter 处理(选择或关闭)
+        if popup.isVisible() and event.key() in (Qt.Key_Enter, Qt.Key_Return, Qt.Key_Escape,
+                                                 Qt.Key_Tab, Qt.Key_Backtab):
+            event.ignore()
+            return
+        if event.key() == Qt.Key_Space and event.modifiers() & Qt.ControlModifier:
+            self._show_completions(forced=True)
+            return
+        self._handle_key(event)
+        if event.modifiers() & (Qt.ControlModifier | Qt.AltModifier):
+            return
+        text = event.text()
+        if text and (text[-1].isalnum() or text[-1] == '_'):
+            self._show_completions(forced=False)
+        elif event.key() == Qt.Key_Backspace and popup.isVisible():
+            self._show_completions(forced=False)
+        else:
+            popup.hide()
+
+    def _handle_key(self, event: QKeyEvent):
         # 只处理回车键事件 (Enter 或 Return)
         if event.key() in (Qt.Key_Enter, Qt.Key_Return):
             cursor = self.textCursor()
@@ -50,4 +108,202 @@ class CodeEditor(QPlainTextEdit):
             return
 
         # 对于其他所有按键，执行默认行为
-        super().keyPressEvent(event)
\ No newline at end of file
+        super().keyPressEvent(event)
+
+    # --- 补全 ---
+    def _completion_prefix(self):
+        cursor = self.textCursor()
+        match = _PREFIX_RE.search(cursor.block().text()[:cursor.positionInBlock()])
+        return match.group(0) if match else ""
+
+    def _show_completions(self, forced):
+        popup = self.completer.popup()
+        prefix = self._completion_prefix()
+        if len(prefix) < (1 if forced else COMPLETION_MIN_PREFIX):
+            popup.hide()
+            return
+        words = self.completion.complete(prefix, self.textCursor().blockNumber(),
+                                         COMPLETION_MAX_RESULTS, COMPLETION_BUDGET_MS)
+        if not words:
+            popup.hide()
+            return
+        self.completer.model().setStringList(words)
+        self.completer.setCompletionPrefix(prefix)
+        popup.setCurrentIndex(self.completer.completionModel().index(0, 0))
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
+
+    def _insert_completion(self, word):
+        prefix = self._completion_prefix()
+        if not word.startswith(prefix):
+            return
+        cursor = self.textCursor()
+        cursor.insertText(word[len(prefix):])
+        self.setTextCursor(cursor)
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """只重新扫描变化的块"""
+        document = self.document()
+        block_count = document.blockCount()
+        first_block = document.findBlock(position)
+        first = first_block.blockNumber()
+        last_block = document.findBlock(position + chars_added)
+        last = last_block.blockNumber() if last_block.isValid() else block_count - 1
+        # 变化前这几行对应 old_count 个块
+        old_count = replaced_line_count(first, last, block_count, self._block_count)
+        self._block_count = block_count
+        self._structure_timer.start()
+        processed = len(self.words)
+        if first >= processed:
+            return  # 还没有扫描到这里
+        if old_count < 1 or first + old_count > processed or last - first + 1 > EDITOR_SYNC_SCAN_LINES:
+            # 大段修改，从 first 开始重新分批扫描
+            self.words.replace_lines(first, processed - first, [])
+            self.structure.replace_lines(first, processed - first, [])
+            self._scan_timer.start()
+            return
+        texts = []
+        block = first_block
+        for _ in range(last - first + 1):
+            texts.append(block.text())
+            block = block.next()
+        self.words.replace_lines(first, old_count, texts)
+        self.structure.replace_lines(first, old_count, texts, self._line_text)
+
+    def _scan_blocks(self):
+        """扫描还没有扫描的块，每批不超过 EDITOR_SCAN_SLICE_MS"""
+        document = self.document()
+        deadline = time.perf_counter() + EDITOR_SCAN_SLICE_MS / 1000
+        block = document.findBlockByNumber(len(self.words))
+        texts = []
+        while block.isValid():
+            texts.append(block.text())
+            block = block.next()
+            if len(texts) % 256 == 0 and time.perf_counter() > deadline:
+                break
+        self.structure.replace_lines(len(self.words), 0, texts)
+        self.words.replace_lines(len(self.words), 0, texts)
+        if block.isValid():
+            self._scan_timer.start()
+        else:
+            self._structure_timer.start()
+
+    def _line_text(self, line):
+        return self.document().findBlockByNumber(line).text()
+
+    # --- 折叠 ---
+    def regions(self):
+        """文档的区域树(见 outline.DocumentStructure)，还没有扫描完时只包括已扫描的部分"""
+        return self.structure.regions(self._line_text)
+
+    def fold(self, line=None):
+        """折叠包含第 line 行(默认为光标所在行)的最内层区域"""
+        region = innermost_region(self.regions(), self._cursor_line(line))
+        if region is not None:
+            self._set_lines_visible(region.line + 1, region.fold_end, False)
+            self._move_cursor_out_of_fold()
+
+    def unfold(self, line=None):
+        """展开从第 line 行(默认为光标所在行)开始的折叠"""
+        line = self._cursor_line(line)
+        block = self.document().findBlockByNumber(line + 1)
+        if block.isValid() and not block.isVisible():
+            self._reveal_block(block)
+
+    def fold_all(self):
+        """折叠所有顶层区域"""
+        for region in self.regions():
+            if region.foldable():
+                self._set_lines_visible(region.line + 1, region.fold_end, False)
+        self._move_cursor_out_of_fold()
+
+    def unfold_all(self):
+        self._set_lines_visible(0, self.document().blockCount() - 1, True)
+
+    def _cursor_line(self, line):
+        return self.textCursor().blockNumber() if line is None else line
+
+    def _set_lines_visible(self, first, last, visible):
+        """
+        设置第 first 到 last 行的可见性；隐藏的块不参与排版，折叠后的排版开销只和可见行数有关
+        只通知文档布局重新排版这几行，不会触发 contentsChange
+        """
+        document = self.document()
+        start = document.findBlockByNumber(first)
+        if not start.isValid() or last < first:
+            return
+        block = start
+        end = start
+        for _ in range(last - first + 1):
+            if not block.isValid():
+                break
+            block.setVisible(visible)
+            end = block
+            block = block.next()
+        document.markContentsDirty(start.position(), end.position() + end.length() - start.position())
+        self.viewport().update()
+
+    def _move_cursor_out_of_fold(self):
+        """光标所在行被折叠时移到折叠起始行"""
+        cursor = self.textCursor()
+        block = cursor.block()
+        while block.previous().isValid() and not block.isVisible():
+            block = block.previous()
+        if block != cursor.block():
+            cursor.setPosition(block.position())
+            self.setTextCursor(cursor)
+
+    def _reveal_block(self, block):
+        """展开 block 所在的一段连续隐藏的行"""
+        first = block
+        while first.previous().isValid() and not first.previous().isVisible():
+            first = first.previous()
+        last = block
+        while last.next().isValid() and not last.next().isVisible():
+            last = last.next()
+        self._set_lines_visible(first.blockNumber(), last.blockNumber(), True)
+
+    def _reveal_cursor(self):
+        """跳转、查找或撤销把光标移到折叠的行中时自动展开"""
+        block = self.textCursor().block()
+        if not block.isVisible():
+            self._reveal_block(block)
+            self.ensureCursorVisible()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # 折叠起来的行末尾画一个省略标记
+        painter = None
+        offset = self.contentOffset()
+        for block in self.visible_blocks():
+            following = block.next()
+            if not following.isValid() or following.isVisible():
+                continue
+            if painter is None:
+                painter = QPainter(self.viewport())
+                painter.setPen(self.palette().placeholderText().color())
+            layout = block.layout()
+            line = layout.lineAt(layout.lineCount() - 1)
+            geometry = self.blockBoundingGeometry(block).translated(offset)
+            x = geometry.left() + line.naturalTextWidth() + self.fontMetrics().horizontalAdvance(' ')
+            rect = QRectF(x, geometry.top() + line.y(), self.fontMetrics().horizontalAdvance(' ... '), line.height())
+            painter.drawRect(rect)
+            painter.drawText(rect, Qt.AlignCenter, "...")
+        if painter is not None:
+            painter.end()
+
+    def visible_blocks(self):
+        """
+        依次返回当前视口中可见的文本块
+        """
+        block = self.firstVisibleBlock()
+        offset = self.contentOffset()
+        bottom = self.viewport().rect().bottom()
+        while block.isValid():
+            top = self.blockBoundingGeometry(block).translated(offset).top()
+            if top > bottom:
+                break
+            if block.isVisible():
+                yield block
+            block = block.next()
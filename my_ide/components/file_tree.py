@@ -1,6 +1,7 @@
-from PySide6.QtWidgets import QTreeView, QVBoxLayout, QWidget, QLabel, QFileSystemModel,QHBoxLayout, QPushButton
+from PySide6.QtWidgets import QTreeView, QVBoxLayout, QWidget, QLabel,QHBoxLayout, QPushButton
 from PySide6.QtCore import QDir, Qt,Signal,QSize
 from PySide6.QtGui import QIcon
+from my_ide.components.file_tree_model import LazyFileTreeModel
 import os
 
 class FileTreeWidget(QWidget):
@@ -58,15 +59,8 @@ class FileTreeWidget(QWidget):
         self.new_folder_button.clicked.connect(self.new_folder_clicked.emit)
         self.delete_button.clicked.connect(self.delete_button_clicked.emit)
 
-        # 创建文件系统模型
-        self.model = QFileSystemModel()
-        # 设置过滤器，只显示目录和文件
-        self.model.setFilter(QDir.AllDirs | QDir.Files | QDir.NoDotAndDotDot)
-        # 设置名称过滤器模式为通配符
-        self.model.setNameFilterDisables(False)
-        
-        # 设置根路径为用户主目录
-        self.model.setRootPath(QDir.homePath())
+        # 创建文件系统模型，根目录由 set_root_path 设置，目录展开时才读取
+        self.model = LazyFileTreeModel(self)
         
         # 创建树视图
         self.tree_view = QTreeView()
@@ -75,14 +69,13 @@ class FileTreeWidget(QWidget):
         self.tree_view.clicked.connect(self._on_item_clicked)
         self.tree_view.setItemsExpandable(True)
         self.tree_view.setAnimated(True)
+        # 所有行高度相同，大目录滚动时不用逐行计算
+        self.tree_view.setUniformRowHeights(True)
         # 设置树视图属性
         self.tree_view.setHeaderHidden(True)  # 隐藏标题行
-        # 只显示名称列，隐藏其他列（大小、类型、修改日期等）
-        for column in range(1, self.model.columnCount()):
-            self.tree_view.hideColumn(column)
-        
-        # 设置根索引为模型的根路径
-        self.tree_view.setRootIndex(self.model.index(QDir.homePath()))
+        # 只监视展开的目录
+        self.tree_view.expanded.connect(self._on_expanded)
+        self.tree_view.collapsed.connect(self._on_collapsed)
         
         # 允许选择多个项目
         self.tree_view.setSelectionMode(QTreeView.SingleSelection)
@@ -96,10 +89,23 @@ class FileTreeWidget(QWidget):
     def set_root_path(self, path):
         """设置文件树的根路径"""
         if QDir(path).exists():
-            self.model.setRootPath(path)
-            self.tree_view.setRootIndex(self.model.index(path))
+            self.model.set_root_path(path)
             return True
         return False
+
+    def set_inventory(self, inventory):
+        """从工作区清单中取目录内容"""
+        self.model.set_inventory(inventory)
+
+    def root_path(self):
+        return self.model.root_path()
+
+    def refresh(self, path=None):
+        """重新读取一个已展开的目录，默认为根目录"""
+        self.model.refresh(path)
+
+    def shutdown(self):
+        self.model.shutdown()
     
     def get_selected_file_path(self):
         """获取当前选中的文件路径"""
@@ -109,15 +115,24 @@ class FileTreeWidget(QWidget):
         return None
     
     def expand_to_path(self, path):
-        """展开到指定的路径"""
+        """展开到指定的路径(路径需要已经加载)"""
         if QDir(path).exists():
-            index = self.model.index(path)
+            index = self.model.index_for_path(path)
             if index.isValid():
                 self.tree_view.expand(index)
                 self.tree_view.setCurrentIndex(index)
                 return True
         return False
 
+    def _on_expanded(self, index):
+        path = self.model.filePath(index)
+        self.model.watch_directory(path)
+        # 折叠期间没有监视，重新展开时刷新一次
+        self.model.refresh(path)
+
+    def _on_collapsed(self, index):
+        self.model.unwatch_directory(self.model.filePath(index))
+
     def _on_item_clicked(self, index):
         if self.model.isDir(index):
             if self.tree_view.isExpanded(index):
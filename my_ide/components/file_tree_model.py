@@ -0,0 +1,305 @@
+import os
+
+from PySide6.QtCore import (QAbstractItemModel, QModelIndex, Qt, QObject, QThread, Signal,
+                            QFileSystemWatcher, QTimer)
+from PySide6.QtWidgets import QFileIconProvider
+
+from my_ide.core.fs_scan import scan_directory, sort_key
+from my_ide.config.settings import FILE_TREE_REFRESH_MS
+
+
+class _Node:
+    """文件树中的一个文件或目录，children 为 None 表示目录还没有列出"""
+    __slots__ = ("name", "path", "is_dir", "parent", "row", "children", "loading")
+
+    def __init__(self, name, path, is_dir, parent, row):
+        self.name = name
+        self.path = path
+        self.is_dir = is_dir
+        self.parent = parent
+        self.row = row
+        self.children = None
+        self.loading = False
+
+
+# 在后台线程中列目录、排序并创建子节点，避免大目录卡住界面
+class DirectoryLister(QObject):
+    listed = Signal(object, int, list)  # 目录节点, 根目录版本号, 排好序的子节点
+
+    def list_directory(self, node, generation, entries):
+        """entries 为工作区清单中已有的 [(名称, 是否为目录)]，为 None 时读取磁盘"""
+        path = node.path
+        entries = scan_directory(path) if entries is None else sorted(entries, key=sort_key)
+        children = [
+            _Node(name, os.path.join(path, name), is_dir, node, row)
+            for row, (name, is_dir) in enumerate(entries)
+        ]
+        self.listed.emit(node, generation, children)
+
+
+class LazyFileTreeModel(QAbstractItemModel):
+    """
+    按需加载的文件树模型
+    目录展开时才在后台列出内容，应用公共的忽略规则；只监视已展开的目录
+    设置了工作区清单后，目录内容从清单中取，目录变化也由清单通知
+    """
+    request_listing = Signal(object, int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._root = None
+        self._generation = 0
+        self._dirs = {}  # 目录路径 -> _Node，只包含已请求过内容的目录
+        self._inventory = None
+        self._icons = QFileIconProvider()
+        self._folder_icon = self._icons.icon(QFileIconProvider.Folder)
+        self._file_icon = self._icons.icon(QFileIconProvider.File)
+
+        self._thread = QThread(self)
+        self._lister = DirectoryLister()
+        self._lister.moveToThread(self._thread)
+        self.request_listing.connect(self._lister.list_directory)
+        self._lister.listed.connect(self._on_listed)
+        self._thread.finished.connect(self._lister.deleteLater)
+        self._thread.start()
+
+        # 目录变化后稍等再重新列出，避免批量操作时反复刷新
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._changed_dirs = set()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(FILE_TREE_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._refresh_changed)
+
+    # --- 公共方法 ---
+    def set_inventory(self, inventory):
+        """使用工作区清单(WorkspaceInventory)中的目录内容，不再自己监视目录"""
+        self._inventory = inventory
+        self._unwatch_all()
+        inventory.changed.connect(self._on_inventory_changed)
+
+    def set_root_path(self, path):
+        path = os.path.normpath(os.path.abspath(path))
+        self.beginResetModel()
+        self._generation += 1
+        self._unwatch_all()
+        self._root = _Node(os.path.basename(path) or path, path, True, None, 0)
+        self._dirs = {}
+        self.endResetModel()
+        self._request(self._root)
+        self.watch_directory(path)
+
+    def root_path(self):
+        return self._root.path if self._root else ""
+
+    def filePath(self, index):
+        node = self._node(index)
+        return node.path if node else ""
+
+    def isDir(self, index):
+        node = self._node(index)
+        return bool(node and node.is_dir)
+
+    def index_for_path(self, path):
+        """已加载的路径对应的索引，根目录或没有加载时返回无效索引"""
+        path = os.path.normpath(os.path.abspath(path))
+        node = self._dirs.get(path)
+        if node is None:
+            parent = self._dirs.get(os.path.dirname(path))
+            if parent is None or parent.children is None:
+                return QModelIndex()
+            name = os.path.basename(path)
+            node = next((child for child in parent.children if child.name == name), None)
+        if node is None or node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def refresh(self, path=None):
+        """重新读取一个已加载的目录，默认为根目录"""
+        node = self._dirs.get(os.path.normpath(path)) if path else self._root
+        if node is not None and node.children is not None:
+            # 清单要等目录监视通知后才更新，这里直接读取磁盘
+            self._request(node, from_inventory=False)
+
+    def watch_directory(self, path):
+        if self._inventory is not None:
+            self._inventory.watch_directory(path)
+            return
+        if os.path.isdir(path) and path not in self._watcher.directories():
+            self._watcher.addPath(path)
+
+    def unwatch_directory(self, path):
+        if path in self._watcher.directories():
+            self._watcher.removePath(path)
+
+    def shutdown(self):
+        self._thread.quit()
+        self._thread.wait()
+
+    # --- QAbstractItemModel ---
+    def index(self, row, column, parent=QModelIndex()):
+        parent_node = self._node(parent) if parent.isValid() else self._root
+        if parent_node is None or parent_node.children is None or not 0 <= row < len(parent_node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, parent_node.children[row])
+
+    def parent(self, index):
+        node = self._node(index)
+        if node is None or node.parent is None or node.parent is self._root:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        node = self._node(parent) if parent.isValid() else self._root
+        if node is None or node.children is None:
+            return 0
+        return len(node.children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent) if parent.isValid() else self._root
+        if node is None or not node.is_dir:
+            return False
+        # 还没列出的目录先显示展开箭头
+        return node.children is None or bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent) if parent.isValid() else self._root
+        return bool(node and node.is_dir and node.children is None and not node.loading)
+
+    def fetchMore(self, parent):
+        node = self._node(parent) if parent.isValid() else self._root
+        if node is not None:
+            self._request(node)
+
+    def data(self, index, role=Qt.DisplayRole):
+        node = self._node(index)
+        if node is None:
+            return None
+        if role == Qt.DisplayRole:
+            return node.name
+        if role == Qt.DecorationRole:
+            return self._folder_icon if node.is_dir else self._file_icon
+        if role == Qt.ToolTipRole:
+            return node.path
+        return None
+
+    # --- 内部实现 ---
+    def _node(self, index):
+        return index.internalPointer() if index.isValid() else None
+
+    def _index_of(self, node):
+        if node is self._root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _request(self, node, from_inventory=True):
+        if node.loading:
+            return
+        node.loading = True
+        self._dirs[node.path] = node
+        entries = None
+        if from_inventory and self._inventory is not None:
+            entries = self._inventory.listing(node.path)
+        self.request_listing.emit(node, self._generation, entries)
+
+    def _on_listed(self, node, generation, new_children):
+        # 根目录已切换，或者这个目录已经被删除
+        if generation != self._generation or self._dirs.get(node.path) is not node:
+            return
+        node.loading = False
+        parent_index = self._index_of(node)
+        if node.children is None:
+            # 第一次列出，一次性插入所有子项
+            node.children = []
+            if new_children:
+                self.beginInsertRows(parent_index, 0, len(new_children) - 1)
+                node.children = new_children
+                self.endInsertRows()
+            else:
+                # 空目录去掉展开箭头
+                self.dataChanged.emit(parent_index, parent_index)
+            return
+        self._merge_children(node, parent_index, new_children)
+
+    def _merge_children(self, node, parent_index, new_children):
+        """和已有子项比较，只删除消失的、插入新增的，已展开的子目录保持不变"""
+        entries = [(child.name, child.is_dir) for child in new_children]
+        wanted = set(entries)
+        children = node.children
+        # 从后往前删除，连续的行一次删除
+        row = len(children) - 1
+        while row >= 0:
+            if (children[row].name, children[row].is_dir) in wanted:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and (children[row].name, children[row].is_dir) not in wanted:
+                row -= 1
+            self.beginRemoveRows(parent_index, row + 1, end)
+            for removed in children[row + 1:end + 1]:
+                self._forget(removed)
+            del children[row + 1:end + 1]
+            self._renumber(children, row + 1)
+            self.endRemoveRows()
+
+        # 两个列表排序规则相同，按顺序合并插入，连续的新项一次插入
+        existing = {(child.name, child.is_dir) for child in children}
+        row = 0
+        i = 0
+        while i < len(entries):
+            if entries[i] in existing:
+                row += 1
+                i += 1
+                continue
+            start = i
+            while i < len(entries) and entries[i] not in existing:
+                i += 1
+            new_nodes = new_children[start:i]
+            self.beginInsertRows(parent_index, row, row + len(new_nodes) - 1)
+            children[row:row] = new_nodes
+            self._renumber(children, row)
+            self.endInsertRows()
+            row += len(new_nodes)
+        if not children:
+            self.dataChanged.emit(parent_index, parent_index)
+
+    @staticmethod
+    def _renumber(children, start):
+        for row in range(start, len(children)):
+            children[row].row = row
+
+    def _forget(self, node):
+        """删除节点时移除它和所有子目录的记录和监视"""
+        if not node.is_dir:
+            return
+        prefix = node.path + os.sep
+        for path in [p for p in self._dirs if p == node.path or p.startswith(prefix)]:
+            del self._dirs[path]
+            self.unwatch_directory(path)
+
+    def _unwatch_all(self):
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+
+    def _on_inventory_changed(self, delta):
+        """清单中目录内容变化时，重新列出已加载的目录"""
+        if delta.reset:
+            return
+        for rel_dir in delta.dirs:
+            node = self._dirs.get(os.path.normpath(os.path.join(self._inventory.root, rel_dir)))
+            if node is not None and node.children is not None:
+                self._request(node)
+
+    def _on_directory_changed(self, path):
+        self._changed_dirs.add(os.path.normpath(path))
+        self._refresh_timer.start()
+
+    def _refresh_changed(self):
+        changed, self._changed_dirs = self._changed_dirs, set()
+        for path in changed:
+            self.refresh(path)
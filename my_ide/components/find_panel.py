@@ -1,8 +1,12 @@
+import logging
+
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLineEdit, 
                                QCheckBox, QPushButton, QLabel, QSpacerItem, QSizePolicy)
 from PySide6.QtCore import Signal, Qt
 from PySide6.QtGui import QIcon
 
+logger = logging.getLogger(__name__)
+
 # 查找面板
 class FindPanel(QWidget):
     # signals
@@ -100,7 +104,7 @@ class FindPanel(QWidget):
         case_sensitive = self.case_checkbox.isChecked()
         whole_word = self.whole_word_checkbox.isChecked()
         self.find_triggered.emit(term, case_sensitive, whole_word)
-        print("搜索信号触发:", term, case_sensitive, whole_word)
+        logger.debug("搜索信号触发: %r 区分大小写=%s 全词=%s", term, case_sensitive, whole_word)
 
     def update_results_label(self, current, total):
         if total == 0:
@@ -0,0 +1,119 @@
+import time
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                               QHeaderView, QListWidget, QListWidgetItem, QPlainTextEdit, QSplitter,
+                               QAbstractItemView, QPushButton)
+from PySide6.QtCore import Qt, QTimer
+
+# 面板可见时刷新直方图的间隔(毫秒)
+REFRESH_MS = 1000
+
+
+def _format_percentile(histogram, p):
+    """分位数落在最后一个(没有上界的)桶中时显示为大于前一个桶的上界"""
+    bound = histogram.percentile(p)
+    if bound == float("inf"):
+        return f"> {histogram.bounds[-2]:g} ms"
+    return f"≤ {bound:g} ms"
+
+
+class LatencyPanel(QWidget):
+    """
+    显示 StallDetector 的事件循环延迟直方图和最近的卡顿记录
+    选中一条卡顿记录时显示当时主线程的调用栈
+    """
+    def __init__(self, detector, parent=None):
+        super().__init__(parent)
+        self.detector = detector
+        self._init_ui()
+        self.detector.stall_detected.connect(self._add_stall)
+        for record in self.detector.stalls:
+            self._add_stall(record)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        summary_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        self.clear_button = QPushButton("清空")
+        summary_layout.addWidget(self.summary_label, 1)
+        summary_layout.addWidget(self.clear_button)
+        layout.addLayout(summary_layout)
+
+        splitter = QSplitter(Qt.Horizontal)
+        # 直方图：每个桶一行，用文字条表示比例
+        self.histogram_table = QTableWidget(0, 3)
+        self.histogram_table.setHorizontalHeaderLabels(["延迟", "次数", ""])
+        self.histogram_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.histogram_table.verticalHeader().hide()
+        self.histogram_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        splitter.addWidget(self.histogram_table)
+
+        stall_widget = QSplitter(Qt.Vertical)
+        self.stall_list = QListWidget()
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.stack_view.setPlaceholderText("选择一次卡顿查看主线程调用栈")
+        stall_widget.addWidget(self.stall_list)
+        stall_widget.addWidget(self.stack_view)
+        splitter.addWidget(stall_widget)
+        layout.addWidget(splitter)
+
+        self.stall_list.currentItemChanged.connect(self._on_stall_selected)
+        self.clear_button.clicked.connect(self._on_clear)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    def refresh(self):
+        histogram = self.detector.histogram
+        counts = histogram.counts()
+        total = sum(counts)
+        if not self.detector.is_running():
+            self.summary_label.setText("卡顿监视已关闭(设置 STALL_DETECTOR_ENABLED)")
+        else:
+            self.summary_label.setText(
+                f"最近 {histogram.window_seconds * histogram.windows // 60} 分钟: {total} 次心跳，"
+                f"p50 {_format_percentile(histogram, 50)}，p99 {_format_percentile(histogram, 99)}，"
+                f"最大 {histogram.max():.0f} ms，卡顿 {len(self.detector.stalls)} 次")
+        self.histogram_table.setRowCount(len(counts))
+        peak = max(counts) or 1
+        lower = 0
+        for row, (bound, count) in enumerate(zip(histogram.bounds, counts)):
+            label = f"> {lower:g} ms" if bound == float("inf") else f"{lower:g}-{bound:g} ms"
+            bar = "█" * (round(count / peak * 40) if count else 0)
+            for column, text in enumerate((label, str(count), bar)):
+                self.histogram_table.setItem(row, column, QTableWidgetItem(text))
+            lower = bound
+
+    def _add_stall(self, record):
+        started = time.strftime("%H:%M:%S", time.localtime(record["started"]))
+        item = QListWidgetItem(f"{started}  卡顿 {record['duration_ms']:.0f} ms")
+        item.setData(Qt.UserRole, record)
+        self.stall_list.insertItem(0, item)
+
+    def _on_stall_selected(self, item, _previous):
+        if item is None:
+            self.stack_view.clear()
+            return
+        stacks = item.data(Qt.UserRole)["stacks"]
+        self.stack_view.setPlainText(
+            "\n".join(f"--- 采样 {i + 1} ---\n{stack}" for i, stack in enumerate(stacks)))
+
+    def _on_clear(self):
+        self.detector.histogram.clear()
+        self.detector.stalls.clear()
+        self.stall_list.clear()
+        self.refresh()
@@ -0,0 +1,104 @@
+import logging
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLineEdit, QCheckBox,
+                               QPlainTextEdit, QPushButton)
+from PySide6.QtCore import QTimer
+
+from my_ide.core import logging_config
+from my_ide.config.settings import LOG_LEVEL, LOG_VIEWER_MAX_RECORDS
+
+# 面板可见时拉取新日志的间隔(毫秒)
+REFRESH_MS = 200
+
+LEVELS = [("全部", logging.DEBUG), ("信息", logging.INFO), ("警告", logging.WARNING), ("错误", logging.ERROR)]
+
+
+class LogViewer(QWidget):
+    """
+    显示 logging_config 保存的最近日志，可以按级别和文本过滤
+    只在可见时定时拉取新增的记录，隐藏时不做任何事
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._serial = 0  # 已显示的最后一条记录的序号
+        self._cleared_serial = 0  # 清空时的序号，重新显示时从这里开始
+        self._init_ui()
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._append_new)
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        filter_layout = QHBoxLayout()
+        self.level_combo = QComboBox()
+        for name, level in LEVELS:
+            self.level_combo.addItem(name, level)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("过滤日志")
+        self.debug_checkbox = QCheckBox("记录调试信息")
+        self.debug_checkbox.setChecked(LOG_LEVEL <= logging.DEBUG)
+        self.clear_button = QPushButton("清空")
+        filter_layout.addWidget(self.level_combo)
+        filter_layout.addWidget(self.filter_edit, 1)
+        filter_layout.addWidget(self.debug_checkbox)
+        filter_layout.addWidget(self.clear_button)
+        layout.addLayout(filter_layout)
+
+        self.log_view = QPlainTextEdit()
+        self.log_view.setReadOnly(True)
+        self.log_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log_view.setMaximumBlockCount(LOG_VIEWER_MAX_RECORDS)
+        layout.addWidget(self.log_view)
+
+        self.level_combo.currentIndexChanged.connect(self.reload)
+        self.filter_edit.textChanged.connect(self.reload)
+        self.debug_checkbox.toggled.connect(self._on_debug_toggled)
+        self.clear_button.clicked.connect(self._on_clear)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._append_new()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    def _matches(self, levelno, text, min_level, needle):
+        return levelno >= min_level and (not needle or needle in text.lower())
+
+    def _append_new(self):
+        handler = logging_config.ring_handler()
+        if handler is None:
+            return
+        entries = handler.since(self._serial)
+        if not entries:
+            return
+        self._serial = entries[-1][0]
+        min_level = self.level_combo.currentData()
+        needle = self.filter_edit.text().lower()
+        lines = [text for _, levelno, text in entries if self._matches(levelno, text, min_level, needle)]
+        if lines:
+            scrollbar = self.log_view.verticalScrollBar()
+            at_bottom = scrollbar.value() == scrollbar.maximum()
+            self.log_view.appendPlainText("\n".join(lines))
+            if at_bottom:
+                scrollbar.setValue(scrollbar.maximum())
+
+    def reload(self):
+        """过滤条件变化时从头重新显示"""
+        self.log_view.clear()
+        self._serial = self._cleared_serial
+        self._append_new()
+
+    def _on_debug_toggled(self, checked):
+        logging_config.set_level(logging.DEBUG if checked else max(LOG_LEVEL, logging.INFO))
+
+    def _on_clear(self):
+        # 只清空显示，已保存的记录不受影响
+        handler = logging_config.ring_handler()
+        self._serial = self._cleared_serial = handler.count if handler is not None else 0
+        self.log_view.clear()
@@ -17,6 +17,7 @@ class MenuBar(QMenuBar):
         file_menu = self.addMenu("&File")
         self._add_action(file_menu,"&Open","file_open","Open a file","Ctrl+O")
         self._add_action(file_menu,"&Open Folder","file_open_folder","Open a folder","Ctrl+Shift+O")
+        self._add_action(file_menu,"&Go to File...","quick_open","Quickly open a file in the workspace by name","Ctrl+P")
         self._add_action(file_menu,"&New","file_new","Create a new file","Ctrl+N")
         self._add_action(file_menu,"&New Folder","file_new_folder","Create a new folder","Ctrl+Shift+N")
         self._add_action(file_menu,"&Save","file_save","Save the current file","Ctrl+S")
@@ -82,7 +83,7 @@ class MenuBar(QMenuBar):
 
 
         # 主题切换    
-        self._add_action(appearance_menu,"Dark &Theme","toggle_dark_theme","Toggle Dark Theme","F12",is_checkable=True)
+        self._add_action(appearance_menu,"Dark &Theme","toggle_dark_theme","Toggle Dark Theme","Ctrl+K, Ctrl+T",is_checkable=True)
         
         view_menu.addMenu(appearance_menu)
         view_menu.addSeparator() 
@@ -92,9 +93,27 @@ class MenuBar(QMenuBar):
         
         # 4. 自动换行 (Word Wrap)
         self._add_action(view_menu,"Word &Wrap","toggle_word_wrap","Toggle Word Wrap","Alt+Z",is_checkable=True)
-
-
-        # go_menu = self.addMenu("&Go")
+        view_menu.addSeparator()
+
+        # 5. 代码折叠 (Folding)
+        self._add_action(view_menu,"&Fold","fold","Fold the innermost region at the cursor","Ctrl+Shift+[")
+        self._add_action(view_menu,"&Unfold","unfold","Unfold the region starting at the cursor line","Ctrl+Shift+]")
+        self._add_action(view_menu,"Fold &All","fold_all","Fold all top-level regions","Ctrl+K, Ctrl+0")
+        self._add_action(view_menu,"Unfold A&ll","unfold_all","Unfold all regions","Ctrl+K, Ctrl+J")
+        view_menu.addSeparator()
+
+        # 6. 性能跟踪 (Chrome trace_event JSON，可用 Perfetto 打开)
+        self.trace_action = self._add_action(view_menu,"Record Performance &Trace","toggle_trace","Start or stop recording a performance trace",is_checkable=True)
+        self._add_action(view_menu,"UI &Latency","show_latency_panel","Show event loop latency and recorded UI stalls")
+        self._add_action(view_menu,"&Log","show_log_viewer","Show recent IDE log messages")
+
+
+        go_menu = self.addMenu("&Go")
+        # 转到定义和工作区符号，来自符号索引
+        self._add_action(go_menu,"Go to &Definition","go_to_definition","Go to the definition of the symbol under the cursor","F12")
+        self._add_action(go_menu,"Go to &Symbol in Workspace...","go_to_workspace_symbol","Search functions, globals and types in the workspace","Ctrl+T")
+        self._add_action(go_menu,"Find All &References","find_references","Find all references to the symbol under the cursor","Shift+F12")
+        go_menu.addSeparator()
         # # 1. 返回
         # self._add_action(go_menu,"&Back","go_back","Go back to the previous location","Alt+Left")
         # # 2. 前进
@@ -113,6 +132,13 @@ class MenuBar(QMenuBar):
         run_menu = self.addMenu("&Run")
         self._add_action(run_menu,"Run Without Terminal","run_without_terminal","Run Without Terminal, Only Output","Ctrl+F5")
         self._add_action(run_menu, "Run With Terminal","run_with_terminal","Run With Terminal, Only Terminal","Ctrl+F6")
+        self._add_action(run_menu, "Build","build","Build the current file or workspace project, skipping unchanged sources","F7")
+        self._add_action(run_menu, "Build and Run","build_and_run","Build if needed, then run the executable","F5")
+        self._add_action(run_menu, "Cancel Task...","cancel_task","Cancel a running or queued task")
+        self._add_action(run_menu, "Cancel All Tasks","cancel_all_tasks","Cancel all running and queued tasks")
+        run_menu.addSeparator()
+        self._add_action(run_menu, "Check Workspace","check_workspace","Check all MiniC sources in the workspace","Ctrl+Shift+B")
+        self._add_action(run_menu, "Cancel Workspace Check","cancel_workspace_check","Cancel the running workspace check")
     
     def _add_action(self,menu:QMenu, text:str, action_name:str, status_tip:str="", shortcut:str="",is_checkable = False,is_checked = False):
         """辅助方法：创建并添加动作到指定菜单"""
@@ -0,0 +1,69 @@
+from PySide6.QtCore import Signal, Qt
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem
+
+from my_ide.core.outline import outline_items
+
+# 种类在大纲中的显示
+_KIND_LABELS = {"function": "函数", "struct": "结构体", "enum": "枚举", "region": "区域"}
+
+
+class OutlinePanel(QWidget):
+    """
+    大纲视图：当前文件中的函数、结构体、枚举和 region，点击跳转到所在行
+    编辑器的区域树变化(编辑停止一段时间)后整体刷新，展开状态按名称保留
+    """
+    line_selected = Signal(int)  # 行号(从0开始)
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+        self._stale = True  # 隐藏时不刷新，显示时再刷新
+        layout = QVBoxLayout(self)
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderHidden(True)
+        self.tree.setIndentation(12)
+        layout.addWidget(self.tree)
+
+        self.tree.itemClicked.connect(self._on_item_clicked)
+        editor.structure_changed.connect(self.refresh)
+
+    def refresh(self):
+        if not self.isVisible():
+            self._stale = True
+            return
+        self._stale = False
+        collapsed = set()
+        self._collect_collapsed(self.tree.invisibleRootItem(), (), collapsed)
+        self.tree.setUpdatesEnabled(False)
+        self.tree.clear()
+        self._add_items(self.tree.invisibleRootItem(), outline_items(self.editor.regions()), (), collapsed)
+        self.tree.resizeColumnToContents(0)
+        self.tree.setUpdatesEnabled(True)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._stale:
+            self.refresh()
+
+    def _add_items(self, parent, regions, path, collapsed):
+        for region in regions:
+            name = region.name or _KIND_LABELS[region.kind]
+            item = QTreeWidgetItem(parent, [name, _KIND_LABELS[region.kind]])
+            item.setData(0, Qt.UserRole, region.line)
+            item.setToolTip(0, f"{name}  第 {region.line + 1} 行")
+            key = path + (name,)
+            if region.kind == "region":
+                self._add_items(item, outline_items(region.children), key, collapsed)
+            item.setExpanded(key not in collapsed)
+
+    def _collect_collapsed(self, parent, path, collapsed):
+        for i in range(parent.childCount()):
+            item = parent.child(i)
+            key = path + (item.text(0),)
+            if item.childCount() and not item.isExpanded():
+                collapsed.add(key)
+            self._collect_collapsed(item, key, collapsed)
+
+    def _on_item_clicked(self, item, _column):
+        self.line_selected.emit(item.data(0, Qt.UserRole))
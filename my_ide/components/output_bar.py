@@ -1,8 +1,11 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout,QHBoxLayout, QTabWidget, QPlainTextEdit,QScrollBar,
-                               QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtWidgets import (QWidget, QVBoxLayout,QHBoxLayout, QTabWidget,QScrollBar,QComboBox,QStackedWidget)
 from PySide6.QtCore import Qt,QCoreApplication,Signal
 from PySide6.QtGui import QIcon
-from termqt import Terminal
+from my_ide.components.questions_panel import ProblemsPanel, Problem
+from my_ide.components.output_panel import OutputPanel
+from my_ide.components.terminal_buffer import TerminalRenderBuffer
+from my_ide.core.pty_io import PosixPtyIO, default_shell
+from my_ide.config.settings import TERMINAL_LOG_LEVEL
 import sys
 import logging
 
@@ -11,6 +14,7 @@ class OutputBar(QWidget):
 
     terminal = None
     terminal_io = None
+    DEFAULT_CHANNEL = "输出"
     def __init__(self, parent=None):
         super().__init__(parent)
         self.init_ui()
@@ -22,105 +26,146 @@ class OutputBar(QWidget):
         self.tabs = QTabWidget()
         layout.addWidget(self.tabs)
 
-        # 终端面板
-        logger = logging.getLogger()
-        logger.setLevel(logging.DEBUG)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(
-            "[%(asctime)s] > "
-            "[%(filename)s:%(lineno)d] %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        # 终端面板，第一次显示时才创建终端并启动 shell
         self.terminal_widget = QWidget()
-        terminal_layout = QHBoxLayout()
+        self.terminal_layout = QHBoxLayout(self.terminal_widget)
+        self.terminal_layout.setContentsMargins(0, 0, 0, 0)
+        self.terminal_layout.setSpacing(0)
+
+        # 问题面板
+        self.problems_panel = ProblemsPanel()
+        # 问题面板点击事件
+        self.problems_panel.problem_clicked.connect(self.problem_clicked)
+
+        # 输出面板，每个任务一个输出通道，用下拉框切换
+        self.output_widget = QWidget()
+        output_layout = QVBoxLayout(self.output_widget)
+        output_layout.setContentsMargins(0, 0, 0, 0)
+        output_layout.setSpacing(2)
+        self.channel_combo = QComboBox()
+        self.channel_stack = QStackedWidget()
+        output_layout.addWidget(self.channel_combo)
+        output_layout.addWidget(self.channel_stack)
+        self.channels = {}  # 通道名 -> OutputPanel
+        self.channel_combo.currentIndexChanged.connect(self.channel_stack.setCurrentIndex)
+
+        self.output_panel = self.output_channel(self.DEFAULT_CHANNEL)
+        self.output_panel.setPlaceholderText("程序输出将显示在这里...")
+
+        self.tabs.addTab(self.terminal_widget, "终端")
+        self.tabs.addTab(self.problems_panel, "问题")
+        self.tabs.addTab(self.output_widget, "输出")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+
+    def ensure_terminal(self):
+        """创建终端控件并启动 shell，只在第一次需要终端时执行"""
+        if self.terminal is not None:
+            return
+        from termqt import Terminal
+        # 终端的日志也交给 my_ide 根日志器，由日志线程统一输出
+        logger = logging.getLogger("my_ide.terminal")
+        logger.setLevel(TERMINAL_LOG_LEVEL)
         self.terminal = Terminal(400, 300, logger=logger)
         self.terminal.set_font()
         self.terminal.maximum_line_history = 2000
         scroll = QScrollBar(Qt.Vertical, self.terminal)
         self.terminal.connect_scroll_bar(scroll)
-        print(self.terminal)
-
-        terminal_layout.addWidget(self.terminal)
-        terminal_layout.addWidget(scroll)
-        terminal_layout.setSpacing(0)
-        
-        auto_wrap_enabled = False
-        bin = "cmd"
-
-        from termqt import TerminalWinptyIO
-        self.terminal_io = TerminalWinptyIO(
-                self.terminal.row_len,
-                self.terminal.col_len,
-                bin,
-                logger=logger
-                )
 
+        self.terminal_layout.addWidget(self.terminal)
+        self.terminal_layout.addWidget(scroll)
+
+        if sys.platform == "win32":
+            # cmd 自己处理窗口大小变化
+            auto_wrap_enabled = False
+            from termqt import TerminalWinptyIO
+            self.terminal_io = TerminalWinptyIO(
+                    self.terminal.row_len,
+                    self.terminal.col_len,
+                    "cmd",
+                    logger=logger
+                    )
+        else:
+            auto_wrap_enabled = True
+            self.terminal_io = PosixPtyIO(
+                    self.terminal.row_len,
+                    self.terminal.col_len,
+                    default_shell(),
+                    logger=logger
+                    )
+
+        # 输出先合并，每帧最多重绘一次
+        self.terminal_buffer = TerminalRenderBuffer(self.terminal.stdout, self)
         self.terminal.enable_auto_wrap(auto_wrap_enabled)
-        self.terminal_io.stdout_callback = self.terminal.stdout
+        self.terminal_io.stdout_callback = self.terminal_buffer.write
         self.terminal.stdin_callback = self.terminal_io.write
         self.terminal.resize_callback = self.terminal_io.resize
         self.terminal_io.spawn()
-        self.terminal_widget.setLayout(terminal_layout)
 
-        # 问题面板
-        self.problems_panel = QTableWidget()
-        self.problems_panel.setColumnCount(4)
-        self.problems_panel.setHorizontalHeaderLabels(["描述", "文件", "行", "严重性"])
-        self.problems_panel.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.problems_panel.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.problems_panel.setSelectionBehavior(QTableWidget.SelectRows)
-        # 问题面板点击事件
-        self.problems_panel.cellClicked.connect(self._on_problem_row_clicked)
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.tabs.currentWidget() is self.terminal_widget:
+            self.ensure_terminal()
 
-        # 输出面板
-        self.output_panel = QPlainTextEdit()
-        self.output_panel.setReadOnly(True)
-        self.output_panel.setPlaceholderText("程序输出将显示在这里...")
+    def _on_tab_changed(self, index):
+        if self.isVisible() and self.tabs.widget(index) is self.terminal_widget:
+            self.ensure_terminal()
 
-        self.tabs.addTab(self.terminal_widget, "终端")
-        self.tabs.addTab(self.problems_panel, "问题")
-        self.tabs.addTab(self.output_panel, "输出")
+    # --- 公共方法 ---
+    def add_problem(self, description, file, line, severity):
+        self.problems_panel.model.append_problem(Problem(description, file, line, severity))
 
-    def _on_problem_row_clicked(self, row, column):
+    def set_problems(self, problems):
         """
-        当用户点击表格的某一行时，获取该行的文件名和行号，并发射信号
+        一次性替换全部问题，参数为 Problem 列表
+        只有发生变化的行会被更新
         """
-        # 获取第1列(文件)和第2列(行)的数据
-        file_item = self.problems_panel.item(row, 1)
-        line_item = self.problems_panel.item(row, 2)
-        
-        if file_item and line_item:
-            file_path = file_item.text()
-            try:
-                line_number = int(line_item.text())
-                # 发射信号给 MainWindow
-                self.problem_clicked.emit(file_path, line_number)
-            except ValueError:
-                pass
-
-    # --- 公共方法 ---
-    def add_problem(self, description, file, line, severity):
-        row_position = self.problems_panel.rowCount()
-        self.problems_panel.insertRow(row_position)
-        self.problems_panel.setItem(row_position, 0, QTableWidgetItem(description))
-        self.problems_panel.setItem(row_position, 1, QTableWidgetItem(file))
-        self.problems_panel.setItem(row_position, 2, QTableWidgetItem(str(line)))
-        self.problems_panel.setItem(row_position, 3, QTableWidgetItem(severity))
+        self.problems_panel.model.set_problems(problems)
 
     def clear_problems(self):
-        print("清理问题面板")
-        self.problems_panel.setRowCount(0)
-
-    def append_output(self, text):
-        self.output_panel.appendPlainText(text)
+        self.problems_panel.model.set_problems([])
+
+    def output_channel(self, name):
+        """返回指定名字的输出通道，不存在时新建"""
+        panel = self.channels.get(name)
+        if panel is None:
+            panel = OutputPanel()
+            self.channels[name] = panel
+            self.channel_stack.addWidget(panel)
+            self.channel_combo.addItem(name)
+        return panel
+
+    def show_output_channel(self, name=None):
+        """切换到输出标签页并显示指定通道"""
+        name = name or self.DEFAULT_CHANNEL
+        self.output_channel(name)
+        self.channel_combo.setCurrentIndex(self.channel_combo.findText(name))
+        self.tabs.setCurrentWidget(self.output_widget)
+
+    def append_output(self, text, channel=None):
+        """追加一行输出"""
+        self.output_channel(channel or self.DEFAULT_CHANNEL).append_line(text)
+
+    def write_output(self, text, channel=None):
+        """追加一段流式输出(子进程的原始输出块)"""
+        self.output_channel(channel or self.DEFAULT_CHANNEL).write(text)
 
     def clear_all(self):
-        self.problems_panel.setRowCount(0)
-        self.output_panel.clear()
+        self.clear_problems()
+        for panel in self.channels.values():
+            panel.clear()
     
-    def clear_output(self):
-        self.output_panel.clear()
+    def clear_output(self, channel=None):
+        self.output_channel(channel or self.DEFAULT_CHANNEL).clear()
+
+    def shutdown_terminal(self):
+        """窗口关闭时结束终端中的 shell"""
+        if self.terminal_io is None:
+            return
+        self.terminal_buffer.close()
+        terminate = getattr(self.terminal_io, "terminate", None)
+        if terminate:
+            terminate()
 
     def run_with_terminal(self):
+        self.ensure_terminal()
         self.terminal_io.write(b"echo Hello from terminal!\r\n")
\ No newline at end of file
@@ -0,0 +1,62 @@
+from PySide6.QtWidgets import QPlainTextEdit
+from PySide6.QtCore import QTimer
+from PySide6.QtGui import QTextCursor
+
+from my_ide.core.output_buffer import OutputRingBuffer
+from my_ide.config.settings import OUTPUT_MAX_LINES, OUTPUT_FLUSH_MS
+from my_ide.core import tracing
+
+
+class OutputPanel(QPlainTextEdit):
+    """
+    程序输出面板
+    写入的内容先放进环形缓冲区，每隔 OUTPUT_FLUSH_MS 一次性插入文档；
+    文档最多保留 max_lines 行，超过时丢弃最早的行
+    """
+    def __init__(self, parent=None, max_lines=OUTPUT_MAX_LINES):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self._pending = OutputRingBuffer(max_lines)
+        self.set_max_lines(max_lines)
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(OUTPUT_FLUSH_MS)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def set_max_lines(self, max_lines):
+        self.max_lines = max_lines
+        self._pending.set_max_lines(max_lines)
+        self.setMaximumBlockCount(max_lines)
+
+    def write(self, text):
+        """写入一段流式输出，不自动换行"""
+        self._pending.write(text)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def append_line(self, text):
+        """写入一整行"""
+        self.write(text + '\n')
+
+    def flush(self):
+        """把缓冲区中的内容一次性插入文档"""
+        self._flush_timer.stop()
+        text, _ = self._pending.take()
+        if not text:
+            return
+        with tracing.span("output.flush", "process", chars=len(text)):
+            scroll_bar = self.verticalScrollBar()
+            at_bottom = scroll_bar.value() >= scroll_bar.maximum()
+            cursor = QTextCursor(self.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+            # 用户向上翻看时不强制滚动到底部
+            if at_bottom:
+                scroll_bar.setValue(scroll_bar.maximum())
+
+    def clear(self):
+        self._flush_timer.stop()
+        self._pending.clear()
+        super().clear()
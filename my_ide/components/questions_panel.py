@@ -0,0 +1,190 @@
+import os
+from collections import namedtuple
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox,
+                               QTableView, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+
+# 问题面板中的一条诊断，file 为完整路径
+Problem = namedtuple("Problem", ["description", "file", "line", "severity"])
+
+# 排序时使用的原始值(行号按数字排序)
+SORT_ROLE = Qt.UserRole
+
+
+class ProblemsModel(QAbstractTableModel):
+    """
+    问题面板的数据模型
+    set_problems 一次接收整个诊断列表，和当前列表比较后只对变化的行发出信号
+    """
+    HEADERS = ["描述", "文件", "行", "严重性"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._problems = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._problems)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        problem = self._problems[index.row()]
+        value = problem[index.column()]
+        if role == Qt.DisplayRole:
+            # 文件列只显示文件名，完整路径放在提示里
+            if index.column() == 1:
+                return os.path.basename(value)
+            return str(value)
+        if role == SORT_ROLE:
+            return value
+        if role == Qt.ToolTipRole:
+            if index.column() == 0:
+                return problem.description
+            if index.column() == 1:
+                return problem.file
+        return None
+
+    def problem_at(self, row):
+        return self._problems[row]
+
+    def problems(self):
+        return list(self._problems)
+
+    def set_problems(self, problems):
+        """
+        用新的诊断列表替换当前列表
+        去掉首尾相同的部分，中间重叠的行原地替换，多出或缺少的行一次性插入或删除
+        """
+        old = self._problems
+        new = list(problems)
+        old_len, new_len = len(old), len(new)
+
+        prefix = 0
+        limit = min(old_len, new_len)
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        limit -= prefix
+        while suffix < limit and old[old_len - 1 - suffix] == new[new_len - 1 - suffix]:
+            suffix += 1
+
+        old_mid = old_len - prefix - suffix
+        new_mid = new_len - prefix - suffix
+        common = min(old_mid, new_mid)
+
+        if common:
+            old[prefix:prefix + common] = new[prefix:prefix + common]
+            self.dataChanged.emit(self.index(prefix, 0),
+                                  self.index(prefix + common - 1, len(self.HEADERS) - 1))
+        start = prefix + common
+        if old_mid > new_mid:
+            self.beginRemoveRows(QModelIndex(), start, prefix + old_mid - 1)
+            del old[start:prefix + old_mid]
+            self.endRemoveRows()
+        elif new_mid > old_mid:
+            self.beginInsertRows(QModelIndex(), start, prefix + new_mid - 1)
+            old[start:start] = new[start:prefix + new_mid]
+            self.endInsertRows()
+
+    def append_problem(self, problem):
+        row = len(self._problems)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._problems.append(problem)
+        self.endInsertRows()
+
+    def append_problems(self, problems):
+        """批量追加，只发出一次插入信号"""
+        problems = list(problems)
+        if not problems:
+            return
+        row = len(self._problems)
+        self.beginInsertRows(QModelIndex(), row, row + len(problems) - 1)
+        self._problems.extend(problems)
+        self.endInsertRows()
+
+
+class ProblemsFilterProxy(QSortFilterProxyModel):
+    """按严重性和关键字过滤问题"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.severity = None  # None 表示显示全部
+        self.setSortRole(SORT_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+
+    def set_severity(self, severity):
+        self.severity = severity
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.severity is not None:
+            if self.sourceModel().problem_at(source_row).severity != self.severity:
+                return False
+        return super().filterAcceptsRow(source_row, source_parent)
+
+
+class ProblemsPanel(QWidget):
+    problem_clicked = Signal(str, int)  # 文件路径，行号
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._init_ui()
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        # 过滤栏
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(2, 2, 2, 0)
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("筛选问题...")
+        self.severity_combo = QComboBox()
+        self.severity_combo.addItem("全部", None)
+        for severity in ("Error", "Warning", "Info"):
+            self.severity_combo.addItem(severity, severity)
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(self.severity_combo)
+        layout.addLayout(filter_layout)
+
+        self.model = ProblemsModel(self)
+        self.proxy = ProblemsFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.proxy)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.sortByColumn(-1, Qt.AscendingOrder)  # 默认保持诊断原有顺序
+        self.table_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table_view.verticalHeader().hide()
+        self.table_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table_view)
+
+        # 问题面板点击事件
+        self.table_view.clicked.connect(self._on_row_clicked)
+        self.filter_input.textChanged.connect(self.proxy.setFilterFixedString)
+        self.severity_combo.currentIndexChanged.connect(
+            lambda _: self.proxy.set_severity(self.severity_combo.currentData()))
+
+    def _on_row_clicked(self, proxy_index):
+        """
+        当用户点击表格的某一行时，获取该行的文件名和行号，并发射信号
+        """
+        source_index = self.proxy.mapToSource(proxy_index)
+        if not source_index.isValid():
+            return
+        problem = self.model.problem_at(source_index.row())
+        try:
+            self.problem_clicked.emit(problem.file, int(problem.line))
+        except (TypeError, ValueError):
+            pass
@@ -0,0 +1,159 @@
+import os
+from PySide6.QtCore import QObject, Signal, QThread, Qt, QEvent
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+
+from my_ide.core.fuzzy import FuzzyFileMatcher
+from my_ide.config.settings import QUICK_OPEN_MAX_RESULTS, QUICK_OPEN_BUDGET_MS
+
+
+# 模糊匹配，非UI
+class QuickOpenWorker(QObject):
+    """
+    在后台线程中维护 FuzzyFileMatcher 并执行查询
+    只处理最新的一次查询，输入过程中过时的查询直接跳过
+    超过 QUICK_OPEN_BUDGET_MS 时先发出部分结果，扫描完后再发出完整结果
+    """
+    results_ready = Signal(int, list)  # 查询编号, 匹配的相对路径
+
+    def __init__(self):
+        super().__init__()
+        self.matcher = FuzzyFileMatcher([])
+        # 由UI线程写入的最新查询编号
+        self.latest_request = 0
+
+    def set_paths(self, paths):
+        self.matcher = FuzzyFileMatcher(paths)
+
+    def search(self, request_id, query):
+        if request_id != self.latest_request:
+            return
+        is_cancelled = lambda: request_id != self.latest_request
+        results = self.matcher.match(query, QUICK_OPEN_MAX_RESULTS, is_cancelled, QUICK_OPEN_BUDGET_MS)
+        if results is None:
+            return
+        self.results_ready.emit(request_id, [path for _, path in results])
+        if not self.matcher.is_complete():
+            results = self.matcher.finish(QUICK_OPEN_MAX_RESULTS, is_cancelled)
+            if results is None:
+                return
+            self.results_ready.emit(request_id, [path for _, path in results])
+        # 利用两次按键之间的空闲时间准备增量过滤，新的输入到来时放弃
+        self.matcher.prepare_next(is_cancelled)
+
+
+class QuickOpenPanel(QFrame):
+    """
+    Ctrl+P 快速打开：输入文件名的一部分，回车打开选中的文件
+    查询为空时显示最近打开的文件
+    """
+    file_selected = Signal(str)  # 完整路径
+    _search_requested = Signal(int, str)
+    _paths_changed = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = ""
+        self.recent_files = []
+        self._request_id = 0
+        self._init_ui()
+
+        self.worker = QuickOpenWorker()
+        self.thread = QThread(self)
+        self.worker.moveToThread(self.thread)
+        self._search_requested.connect(self.worker.search)
+        self._paths_changed.connect(self.worker.set_paths)
+        self.worker.results_ready.connect(self._on_results)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.start()
+        self.hide()
+
+    def _init_ui(self):
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setAutoFillBackground(True)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(2)
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("按名称搜索文件...")
+        self.list_widget = QListWidget()
+        self.list_widget.setUniformItemSizes(True)
+        layout.addWidget(self.input)
+        layout.addWidget(self.list_widget)
+
+        self.input.textChanged.connect(self._on_text_changed)
+        self.input.returnPressed.connect(self._open_current)
+        self.input.installEventFilter(self)
+        self.list_widget.itemActivated.connect(lambda _: self._open_current())
+
+    def set_workspace(self, root_path, rel_paths):
+        """工作区或其中的文件变化时更新候选列表"""
+        self.root_path = root_path
+        self._paths_changed.emit(list(rel_paths))
+        if self.isVisible():
+            self._on_text_changed(self.input.text())
+
+    def popup(self):
+        """显示在父窗口顶部居中"""
+        parent = self.parentWidget()
+        width = min(600, parent.width() - 40)
+        self.setGeometry((parent.width() - width) // 2, 40, width, 360)
+        self.input.clear()
+        self._on_text_changed("")
+        self.show()
+        self.raise_()
+        self.input.setFocus()
+
+    def shutdown(self):
+        self.worker.latest_request = -1
+        self.thread.quit()
+        self.thread.wait()
+
+    def eventFilter(self, watched, event):
+        # 输入框中用上下键选择结果，Esc 关闭
+        if watched is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                row = self.list_widget.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= row < self.list_widget.count():
+                    self.list_widget.setCurrentRow(row)
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(watched, event)
+
+    def _on_text_changed(self, text):
+        self._request_id += 1
+        if not text.strip():
+            # 不再需要正在进行的查询
+            self.worker.latest_request = self._request_id
+            recent = [os.path.relpath(path, self.root_path) if self.root_path else path
+                      for path in self.recent_files]
+            self._show_paths(recent)
+            return
+        self.worker.latest_request = self._request_id
+        self._search_requested.emit(self._request_id, text)
+
+    def _on_results(self, request_id, paths):
+        if request_id == self._request_id:
+            self._show_paths(paths)
+
+    def _show_paths(self, paths):
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.clear()
+        for rel_path in paths:
+            item = QListWidgetItem(f"{os.path.basename(rel_path)}    {os.path.dirname(rel_path)}")
+            item.setData(Qt.UserRole, rel_path)
+            item.setToolTip(rel_path)
+            self.list_widget.addItem(item)
+        if paths:
+            self.list_widget.setCurrentRow(0)
+        self.list_widget.setUpdatesEnabled(True)
+
+    def _open_current(self):
+        item = self.list_widget.currentItem()
+        if item is None:
+            return
+        rel_path = item.data(Qt.UserRole)
+        self.hide()
+        self.file_selected.emit(os.path.join(self.root_path, rel_path))
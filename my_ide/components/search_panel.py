@@ -1,6 +1,8 @@
+import logging
 import os
 import re
 import html
+import itertools
 from PySide6.QtGui import QFontMetrics,QColor
 from PySide6.QtCore import QObject,Signal,QThread,Qt
 from PySide6.QtWidgets import (
@@ -8,7 +10,10 @@ from PySide6.QtWidgets import (
     QPushButton,QCheckBox,QTreeWidget,QTreeWidgetItem,QHeaderView,QLabel,
     QAbstractItemView
 )
-from my_ide.config.settings import ignored_dirs, ignored_exts
+from my_ide.config.settings import ignored_dirs, ignored_exts, REFERENCES_BATCH_SIZE
+from my_ide.core import tracing
+
+logger = logging.getLogger(__name__)
 
 # 搜索功能实现，非UI
 class SearchWorker(QObject):
@@ -19,9 +24,10 @@ class SearchWorker(QObject):
     search_finished = Signal(int,int) # 信号：搜索完成，参数为总文件数和总匹配数
     error_occurred = Signal(str)  # 信号：发生错误，参数为错误信息
 
-    def __init__(self,root_path,search_term,is_case_sensitive,is_strict_match,use_regex):
+    def __init__(self,root_path,search_term,is_case_sensitive,is_strict_match,use_regex,files=None):
         super().__init__()
         self.root_path = root_path
+        self.files = files  # 工作区清单中的相对路径，为 None 时自己遍历目录
         self.search_term = search_term
         self.is_case_sensitive = is_case_sensitive
         self.is_strict_match = is_strict_match
@@ -32,6 +38,11 @@ class SearchWorker(QObject):
         """
         执行搜索任务
         """
+        with tracing.span("workspace_search", "search", term=self.search_term,
+                          from_inventory=self.files is not None):
+            self._run_search()
+
+    def _run_search(self):
         files_searched = 0
         matches_found = 0
         try:
@@ -46,29 +57,20 @@ class SearchWorker(QObject):
                 final_search_term = r'\b' + final_search_term + r'\b'
             flags = 0 if self.is_case_sensitive else re.IGNORECASE
             pattern = re.compile(final_search_term, flags)               
-            for dirpath, dirs, filenames in os.walk(self.root_path):
+            for file_path in self._iter_files():
                 if not self._is_running:
                     break
-                if dirpath.split(os.sep)[-1] in ignored_dirs:
+                try:
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        for line_num, line in enumerate(f, start=1):
+                            for match in pattern.finditer(line):
+                                self.match_found.emit(file_path, line_num, line.rstrip(), match.start(), match.end())
+                                matches_found += 1
+                    files_searched += 1
+                except Exception as e:
+                    # 忽略无法读取的文件
                     continue
-                dirs[:] = [d for d in dirs if d not in ignored_dirs]
-                for filename in filenames:
-                    if not self._is_running:
-                        break
-                    _, ext = os.path.splitext(filename)
-                    if ext in ignored_exts:
-                        continue # 跳过这个文件
-                    file_path = os.path.join(dirpath, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            for line_num, line in enumerate(f, start=1):
-                                for match in pattern.finditer(line):
-                                    self.match_found.emit(file_path, line_num, line.rstrip(), match.start(), match.end())
-                                    matches_found += 1
-                        files_searched += 1
-                    except Exception as e:
-                        # 忽略无法读取的文件
-                        continue
+            tracing.counter("workspace_search", "search", files=files_searched, matches=matches_found)
             self.search_finished.emit(files_searched, matches_found)
         except re.error as e:
             self.error_occurred.emit(f"正则表达式错误: {str(e)}")
@@ -76,12 +78,80 @@ class SearchWorker(QObject):
             if self._is_running:
                 self.error_occurred.emit(f"搜索过程中发生错误: {str(e)}")
 
+    def _iter_files(self):
+        """
+        需要搜索的文件的完整路径，优先使用工作区清单
+        """
+        if self.files is not None:
+            for rel_path in self.files:
+                yield os.path.join(self.root_path, rel_path)
+            return
+        for dirpath, dirs, filenames in os.walk(self.root_path):
+            if not self._is_running:
+                break
+            if dirpath.split(os.sep)[-1] in ignored_dirs:
+                continue
+            dirs[:] = [d for d in dirs if d not in ignored_dirs]
+            for filename in filenames:
+                _, ext = os.path.splitext(filename)
+                if ext in ignored_exts:
+                    continue # 跳过这个文件
+                yield os.path.join(dirpath, filename)
+
     def stop(self):
         """
         停止搜索任务
         """
         self._is_running = False
 
+# 查找引用的结果，非UI
+class ReferencesWorker(QObject):
+    """
+    引用位置来自符号索引，这里只按文件读取所在行的文本，每个文件只读一次
+    结果凑够 REFERENCES_BATCH_SIZE 条后以列表整批发出，其余信号和 SearchWorker 相同
+    """
+    matches_found = Signal(list)  # [(文件路径, 行号, 行内容, 匹配开始位置, 匹配结束位置)]
+    search_finished = Signal(int, int)
+    error_occurred = Signal(str)
+
+    def __init__(self, references):
+        super().__init__()
+        # [(文件路径, 行号, 开始位置, 结束位置, 行内容或 None)]，同一文件的引用相邻
+        self.references = references
+        self._is_running = True
+
+    def run_search(self):
+        with tracing.span("find_references", "search", count=len(self.references)):
+            files = 0
+            batch = []
+            for file_path, group in itertools.groupby(self.references, key=lambda reference: reference[0]):
+                if not self._is_running:
+                    break
+                files += 1
+                lines = None
+                for _, line_number, match_start, match_end, line_content in group:
+                    if line_content is None:
+                        if lines is None:
+                            lines = self._read_lines(file_path)
+                        line_content = lines[line_number - 1] if line_number <= len(lines) else ""
+                    batch.append((file_path, line_number, line_content.rstrip(), match_start, match_end))
+                if len(batch) >= REFERENCES_BATCH_SIZE:
+                    self.matches_found.emit(batch)
+                    batch = []
+            if batch and self._is_running:
+                self.matches_found.emit(batch)
+            self.search_finished.emit(files, len(self.references))
+
+    def _read_lines(self, file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read().splitlines()
+        except OSError:
+            return []
+
+    def stop(self):
+        self._is_running = False
+
 class SearchPanel(QWidget):
     # 用户点击信号
     result_clicked = Signal(str,int,int,int) # 参数为文件路径,行号,匹配开始位置,匹配结束位置
@@ -95,6 +165,7 @@ class SearchPanel(QWidget):
         self.root_path = root_path
         self.search_thread = None
         self.search_worker = None
+        self.inventory = None  # 工作区文件清单，由主窗口设置
 
         # 折叠字典
         self.file_items = {}
@@ -147,6 +218,27 @@ class SearchPanel(QWidget):
         search_term = self.search_input.text().strip()
         if not search_term:
             return  # 不搜索空内容
+        self._start_worker(SearchWorker(
+            self.root_path,
+            search_term,
+            self.case_sensitive_checkbox.isChecked(),
+            self.strict_checkbox.isChecked(),
+            self.regex_checkbox.isChecked(),
+            self._inventory_files()
+        ))
+
+    def show_references(self, name, references):
+        """
+        在结果树中显示查找引用的结果
+        references 为 [(文件路径, 行号, 开始位置, 结束位置, 行内容或 None)]，同一文件的引用相邻
+        """
+        self.search_input.setText(name)
+        self._start_worker(ReferencesWorker(references))
+
+    def _start_worker(self, worker):
+        """
+        在新线程中运行 SearchWorker 或 ReferencesWorker，搜索结果逐条、引用结果整批加入结果树
+        """
         if self.search_thread and self.search_thread.isRunning():
             # 终止上一次搜索任务
             self.search_worker.stop()
@@ -158,20 +250,16 @@ class SearchPanel(QWidget):
         self.results_tree.clear()
         self.search_button.setEnabled(False)
         self.search_button.setText("搜索中...")
-        # 创建新的搜索任务
-        self.search_worker = SearchWorker(
-            self.root_path,
-            search_term,
-            self.case_sensitive_checkbox.isChecked(),
-            self.strict_checkbox.isChecked(),
-            self.regex_checkbox.isChecked()
-        )
+        self.search_worker = worker
         self.search_thread = QThread()
         self.search_worker.moveToThread(self.search_thread)
 
         # 连接信号
         self.search_thread.started.connect(self.search_worker.run_search)
-        self.search_worker.match_found.connect(self.add_match)
+        if isinstance(worker, ReferencesWorker):
+            self.search_worker.matches_found.connect(self.add_matches)
+        else:
+            self.search_worker.match_found.connect(self.add_match)
         self.search_worker.error_occurred.connect(self.on_search_error)
         self.search_worker.search_finished.connect(self.on_search_finished)
         
@@ -185,6 +273,16 @@ class SearchPanel(QWidget):
 
         self.search_thread.start()
 
+    def add_matches(self, matches):
+        """
+        整批添加结果项，期间关闭结果树的刷新
+        matches 为 [(文件路径, 行号, 行内容, 匹配开始位置, 匹配结束位置)]
+        """
+        self.results_tree.setUpdatesEnabled(False)
+        for match in matches:
+            self.add_match(*match)
+        self.results_tree.setUpdatesEnabled(True)
+
     def add_match(self, file_path, line_number, line_content, match_start, match_end):
         """
         使用双列布局添加搜索结果项
@@ -245,7 +343,7 @@ class SearchPanel(QWidget):
         # 显示错误信息
         self.error_found.emit(error_message)
         # 调试信息
-        print(f"搜索错误: {error_message}")
+        logger.error("搜索错误: %s", error_message)
 
     def on_search_finished(self,files_searched,matches_found):
         """
@@ -255,7 +353,7 @@ class SearchPanel(QWidget):
         self.search_button.setText("搜索")
 
         self.search_completed.emit(files_searched, matches_found)
-        print(f"搜索完成: 搜索了 {files_searched} 个文件，找到 {matches_found} 个匹配项")
+        logger.info("搜索完成: 搜索了 %d 个文件，找到 %d 个匹配项", files_searched, matches_found)
 
     def on_result_clicked(self, item, column):
         """
@@ -279,11 +377,28 @@ class SearchPanel(QWidget):
         """
         self.search_thread = None
         self.search_worker = None
-        print("搜索线程已完全结束")
+        logger.debug("搜索线程已完全结束")
+
+    def set_inventory(self, inventory):
+        """
+        设置工作区文件清单，搜索根目录和清单一致时不再遍历目录
+        """
+        self.inventory = inventory
+
+    def _inventory_files(self):
+        """
+        清单已遍历完并且根目录相同时返回其中的文件列表，否则返回 None
+        """
+        inventory = self.inventory
+        if inventory is None or not inventory.is_ready():
+            return None
+        if os.path.normpath(os.path.abspath(self.root_path)) != inventory.root:
+            return None
+        return inventory.files()
 
     def set_search_root(self, folder_path):
         """
         设置搜索根目录
         """
         self.root_path = folder_path
-        print(f"搜索根目录已设置为: {folder_path}")
\ No newline at end of file
+        logger.info("搜索根目录已设置为: %s", folder_path)
\ No newline at end of file
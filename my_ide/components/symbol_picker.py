@@ -0,0 +1,149 @@
+import os
+import sqlite3
+from PySide6.QtCore import QObject, Signal, QThread, Qt, QEvent
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+
+from my_ide.core.symbol_index import SymbolIndex
+from my_ide.config.settings import SYMBOL_SEARCH_MAX_RESULTS
+
+
+# 符号查询，非UI
+class SymbolSearchWorker(QObject):
+    """
+    在后台线程中用只读连接查询符号索引，包含匹配需要扫描整张表，不放在界面线程
+    只处理最新的一次查询
+    """
+    results_ready = Signal(int, list)  # 查询编号, [(相对路径, Symbol)]
+
+    def __init__(self):
+        super().__init__()
+        self.index = None
+        self.db_path = None
+        # 由UI线程写入的最新查询编号
+        self.latest_request = 0
+
+    def search(self, request_id, db_path, query):
+        if request_id != self.latest_request:
+            return
+        try:
+            if db_path != self.db_path:
+                self.close()
+                self.index = SymbolIndex(db_path, create=False)
+                self.db_path = db_path
+            results = self.index.search(query, SYMBOL_SEARCH_MAX_RESULTS)
+        except sqlite3.Error:
+            self.close()
+            results = []
+        self.results_ready.emit(request_id, results)
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+        self.index = None
+        self.db_path = None
+
+
+class SymbolPicker(QFrame):
+    """
+    Ctrl+T 转到工作区中的符号：输入名称的一部分，回车跳转到选中的定义
+    """
+    symbol_selected = Signal(str, int, int, int)  # 完整路径, 行号, 起始列, 结束列
+    _search_requested = Signal(int, str, str)
+    _close_requested = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = ""
+        self.db_path = None
+        self._request_id = 0
+        self._init_ui()
+
+        self.worker = SymbolSearchWorker()
+        self.thread = QThread(self)
+        self.worker.moveToThread(self.thread)
+        self._search_requested.connect(self.worker.search)
+        self._close_requested.connect(self.worker.close)
+        self.worker.results_ready.connect(self._on_results)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.start()
+        self.hide()
+
+    def _init_ui(self):
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setAutoFillBackground(True)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(2)
+        self.input = QLineEdit()
+        self.input.setPlaceholderText("按名称搜索工作区中的符号...")
+        self.list_widget = QListWidget()
+        self.list_widget.setUniformItemSizes(True)
+        layout.addWidget(self.input)
+        layout.addWidget(self.list_widget)
+
+        self.input.textChanged.connect(self._on_text_changed)
+        self.input.returnPressed.connect(self._open_current)
+        self.input.installEventFilter(self)
+        self.list_widget.itemActivated.connect(lambda _: self._open_current())
+
+    def popup(self, root_path, db_path):
+        """显示在父窗口顶部居中"""
+        self.root_path = root_path
+        self.db_path = db_path
+        parent = self.parentWidget()
+        width = min(600, parent.width() - 40)
+        self.setGeometry((parent.width() - width) // 2, 40, width, 360)
+        self.input.clear()
+        self.list_widget.clear()
+        self.show()
+        self.raise_()
+        self.input.setFocus()
+
+    def shutdown(self):
+        self.worker.latest_request = -1
+        self._close_requested.emit()
+        self.thread.quit()
+        self.thread.wait()
+
+    def eventFilter(self, watched, event):
+        # 输入框中用上下键选择结果，Esc 关闭
+        if watched is self.input and event.type() == QEvent.KeyPress:
+            key = event.key()
+            if key in (Qt.Key_Down, Qt.Key_Up):
+                row = self.list_widget.currentRow() + (1 if key == Qt.Key_Down else -1)
+                if 0 <= row < self.list_widget.count():
+                    self.list_widget.setCurrentRow(row)
+                return True
+            if key == Qt.Key_Escape:
+                self.hide()
+                return True
+        return super().eventFilter(watched, event)
+
+    def _on_text_changed(self, text):
+        self._request_id += 1
+        self.worker.latest_request = self._request_id
+        if not text.strip() or not self.db_path or not os.path.exists(self.db_path):
+            self.list_widget.clear()
+            return
+        self._search_requested.emit(self._request_id, self.db_path, text.strip())
+
+    def _on_results(self, request_id, results):
+        if request_id != self._request_id:
+            return
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.clear()
+        for rel_path, symbol in results:
+            item = QListWidgetItem(f"{symbol.name}    {symbol.kind}    {rel_path}:{symbol.line}")
+            item.setData(Qt.UserRole, (rel_path, symbol.line, symbol.column, len(symbol.name)))
+            self.list_widget.addItem(item)
+        if results:
+            self.list_widget.setCurrentRow(0)
+        self.list_widget.setUpdatesEnabled(True)
+
+    def _open_current(self):
+        item = self.list_widget.currentItem()
+        if item is None:
+            return
+        rel_path, line, column, length = item.data(Qt.UserRole)
+        self.hide()
+        self.symbol_selected.emit(os.path.join(self.root_path, rel_path), line, column, column + length)
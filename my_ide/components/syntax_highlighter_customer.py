@@ -1,86 +1,190 @@
+import os
+import re
 import sys
-from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+import fnmatch
+from collections import namedtuple
+from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextBlockUserData
 from PySide6.QtCore import QObject
 
+from pygments import lexers
 from pygments.lexer import Lexer
 from pygments.styles import get_style_by_name
 from pygments.util import ClassNotFound
 from pygments.token import Token
 
 from my_ide.config.settings import DEFAULT_STYLE, DEFAULT_BACKGROUND_COLOR, DEFAULT_TEXT_COLOR
+from my_ide.core import tracing
+
+# 一套风格解析后的结果：格式表、背景色、默认文本颜色
+StyleFormats = namedtuple("StyleFormats", ["formats", "background_color", "text_color"])
+
+# 按后缀缓存的 lexer，避免每次打开文件都扫描 Pygments 的插件注册表
+# Pygments 的文件名匹配区分大小写(*.C 是 C++，*.c 是 C)，后缀保留原来的大小写
+_lexer_cache = {}
+# 按完整文件名匹配的文件(CMakeLists.txt、Makefile.* 等)单独按文件名缓存
+_name_lexer_cache = {}
+# 不是简单 "*.后缀" 形式的文件名模式合成的正则，第一次查找时生成
+_name_patterns = None
+# 按风格名缓存的格式表，切换主题时不再重新解析风格
+_style_cache = {}
+_EXT_PATTERN_RE = re.compile(r'\*\.[^.*?\[\]]+')
+
+
+def _matches_name_pattern(file_name):
+    global _name_patterns
+    if _name_patterns is None:
+        patterns = {pattern for _, _, filenames, _ in lexers.get_all_lexers() for pattern in filenames
+                    if not _EXT_PATTERN_RE.fullmatch(pattern)}
+        _name_patterns = re.compile('|'.join(fnmatch.translate(pattern) for pattern in sorted(patterns)))
+    return _name_patterns.match(file_name) is not None
+
+
+def get_lexer_for_file(file_path):
+    """
+    根据文件名获取 lexer，结果按后缀缓存，按完整文件名匹配的文件按文件名缓存
+    没有对应的 lexer 时返回 None
+    """
+    if not file_path:
+        return None
+    file_name = os.path.basename(file_path)
+    if _matches_name_pattern(file_name):
+        cache, key = _name_lexer_cache, file_name
+    else:
+        cache, key = _lexer_cache, os.path.splitext(file_name)[1]
+    if key not in cache:
+        try:
+            cache[key] = lexers.get_lexer_for_filename(file_name, stripall=True)
+        except ClassNotFound:
+            cache[key] = None
+    return cache[key]
+
+
+def get_style_formats(style_name):
+    """获取指定风格的格式表，第一次使用时解析并缓存"""
+    if style_name not in _style_cache:
+        _style_cache[style_name] = _build_style_formats(style_name)
+    return _style_cache[style_name]
+
+
+def _build_style_formats(style_name):
+    if style_name.lower() == 'default':
+        # 如果是我们的自定义默认风格
+        return _formats_from_dict(DEFAULT_STYLE)
+    try:
+        # 否则，从 Pygments 加载
+        style = get_style_by_name(style_name)
+    except ClassNotFound:
+        # 如果Pygments风格不存在，回退到我们的默认风格
+        return _formats_from_dict(DEFAULT_STYLE)
+    formats = {}
+    for token_type, style_def in style:
+        formats[token_type] = _create_format_from_token_style(style_def)
+    formats[Token] = formats.get(Token, QTextCharFormat())
+    # 计算默认文本颜色
+    text_style_def = style.style_for_token(Token.Text) or style.style_for_token(Token)
+    return StyleFormats(formats, QColor(style.background_color), QColor(f"#{text_style_def['color']}"))
+
+
+def _formats_from_dict(style_dict):
+    """从我们自定义的字典构建格式"""
+    formats = {}
+    for token_type, style_str in style_dict.items():
+        formats[token_type] = _parse_style_str(style_str)
+    formats[Token] = formats.get(Token, QTextCharFormat())
+    return StyleFormats(formats, QColor(DEFAULT_BACKGROUND_COLOR), QColor(DEFAULT_TEXT_COLOR))
+
+
+def _parse_style_str(style_str):
+    """解析 '#RRGGBB bold italic' 这样的字符串"""
+    parts = style_str.split()
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(parts[0]))
+    if 'bold' in parts:
+        fmt.setFontWeight(QFont.Bold)
+    if 'italic' in parts:
+        fmt.setFontItalic(True)
+    return fmt
+
+
+def _create_format_from_token_style(token_style):
+    """将Pygments的风格定义转换为QTextCharFormat"""
+    fmt = QTextCharFormat()
+    if token_style['color']:
+        fmt.setForeground(QColor(f"#{token_style['color']}"))
+    if token_style['bgcolor']:
+        fmt.setBackground(QColor(f"#{token_style['bgcolor']}"))
+    if token_style['bold']:
+        fmt.setFontWeight(QFont.Bold)
+    if token_style['italic']:
+        fmt.setFontItalic(True)
+    if token_style['underline']:
+        fmt.setFontUnderline(True)
+    return fmt
+
+
+class BlockStyleData(QTextBlockUserData):
+    """记录文本块最后一次高亮时使用的风格版本"""
+    def __init__(self, generation):
+        super().__init__()
+        self.generation = generation
+
 
 class CustomHighlighter(QSyntaxHighlighter):
     def __init__(self, parent: QObject, lexer: Lexer, style_name: str = 'default'):
         super().__init__(parent)
         self.lexer = lexer
-        self.formats = {}
+        # 风格版本号，每次切换风格加一，用来判断文本块是否还是旧风格
+        self.generation = 0
+        self._apply_style_formats(get_style_formats(style_name))
 
-        if style_name.lower() == 'default':
-            # 如果是我们的自定义默认风格
-            self.background_color = QColor(DEFAULT_BACKGROUND_COLOR)
-            self.text_color = QColor(DEFAULT_TEXT_COLOR)
-            self._create_formats_from_dict(DEFAULT_STYLE)
-        else:
-            # 否则，从 Pygments 加载
-            try:
-                style = get_style_by_name(style_name)
-                self.background_color = QColor(style.background_color)
-                # 计算默认文本颜色
-                text_style_def = style.style_for_token(Token.Text) or style.style_for_token(Token)
-                self.text_color = QColor(f"#{text_style_def['color']}")
-                self._create_formats_from_pygments_style(style)
-            except ClassNotFound:
-                # 如果Pygments风格不存在，回退到我们的默认风格
-                self.background_color = QColor(DEFAULT_BACKGROUND_COLOR)
-                self.text_color = QColor(DEFAULT_TEXT_COLOR)
-                self._create_formats_from_dict(DEFAULT_STYLE)
-
-    def _create_formats_from_dict(self, style_dict):
-        """从我们自定义的字典构建格式"""
-        for token_type, style_str in style_dict.items():
-            self.formats[token_type] = self._parse_style_str(style_str)
-        self.formats[Token] = self.formats.get(Token, QTextCharFormat())
-
-    def _parse_style_str(self, style_str):
-        """解析 '#RRGGBB bold italic' 这样的字符串"""
-        parts = style_str.split()
-        fmt = QTextCharFormat()
-        fmt.setForeground(QColor(parts[0]))
-        if 'bold' in parts:
-            fmt.setFontWeight(QFont.Bold)
-        if 'italic' in parts:
-            fmt.setFontItalic(True)
-        return fmt
+    def _apply_style_formats(self, style_formats):
+        self.formats = style_formats.formats
+        self.background_color = style_formats.background_color
+        self.text_color = style_formats.text_color
+        # token 类型到格式的查找结果，随格式表一起失效
+        self._token_format_cache = {}
 
-    def _create_formats_from_pygments_style(self, style):
-        """从Pygments的style对象构建格式"""
-        for token_type, style_def in style:
-            self.formats[token_type] = self._create_format_from_token_style(style_def)
-        self.formats[Token] = self.formats.get(Token, QTextCharFormat())
-
-    def _create_format_from_token_style(self, token_style):
-        """将Pygments的风格定义转换为QTextCharFormat"""
-        fmt = QTextCharFormat()
-        if token_style['color']:
-            fmt.setForeground(QColor(f"#{token_style['color']}"))
-        if token_style['bgcolor']:
-            fmt.setBackground(QColor(f"#{token_style['bgcolor']}"))
-        if token_style['bold']:
-            fmt.setFontWeight(QFont.Bold)
-        if token_style['italic']:
-            fmt.setFontItalic(True)
-        if token_style['underline']:
-            fmt.setFontUnderline(True)
-        return fmt
+    def set_style(self, style_name: str):
+        """
+        原地替换格式表，不重建高亮器
+        已高亮的文本块只被标记为过期，由 refresh_block 在可见时重新高亮
+        """
+        self._apply_style_formats(get_style_formats(style_name))
+        self.generation += 1
 
-    def highlightBlock(self, text: str):
-        if not text or not self.lexer: return
-        for start_index, token_type, token_value in self.lexer.get_tokens_unprocessed(text):
-            length = len(token_value)
+    def set_lexer(self, lexer: Lexer):
+        """替换 lexer，调用方随后设置文本时会自然触发高亮"""
+        if lexer is not self.lexer:
+            self.lexer = lexer
+            self.generation += 1
+
+    def refresh_block(self, block):
+        """如果文本块是用旧风格高亮的，则只重新高亮这一块"""
+        data = block.userData()
+        if not isinstance(data, BlockStyleData) or data.generation != self.generation:
+            self.rehighlightBlock(block)
+
+    def _format_for_token(self, token_type):
+        """沿着 token 的父类型查找格式，结果缓存"""
+        fmt = self._token_format_cache.get(token_type)
+        if fmt is None:
             current_token_type = token_type
             while current_token_type not in self.formats:
                 current_token_type = current_token_type.parent
                 if current_token_type is None: break
-            style = self.formats.get(current_token_type, self.formats.get(Token))
-            if style:
-                self.setFormat(start_index, length, style)
\ No newline at end of file
+            fmt = self.formats.get(current_token_type, self.formats.get(Token))
+            self._token_format_cache[token_type] = fmt
+        return fmt
+
+    def highlightBlock(self, text: str):
+        data = self.currentBlockUserData()
+        if isinstance(data, BlockStyleData):
+            data.generation = self.generation
+        else:
+            self.setCurrentBlockUserData(BlockStyleData(self.generation))
+        if not text or not self.lexer: return
+        with tracing.span("highlight.block", "highlight"):
+            for start_index, token_type, token_value in self.lexer.get_tokens_unprocessed(text):
+                style = self._format_for_token(token_type)
+                if style:
+                    self.setFormat(start_index, len(token_value), style)
@@ -0,0 +1,57 @@
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from my_ide.config.settings import TERMINAL_FRAME_MS, TERMINAL_MAX_PENDING_BYTES
+
+
+class TerminalRenderBuffer(QObject):
+    """
+    合并终端输出，每帧最多调用一次 terminal.stdout
+    write 可以在任意线程中调用；积压超过 TERMINAL_MAX_PENDING_BYTES 时阻塞写入方，
+    让子进程等待界面跟上，内存不会无限增长
+    """
+    _data_ready = Signal()
+
+    def __init__(self, sink, parent=None):
+        super().__init__(parent)
+        self.sink = sink  # 接收合并后字节的回调，一般为 terminal.stdout
+        self._pending = bytearray()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(TERMINAL_FRAME_MS)
+        self._frame_timer.timeout.connect(self.flush)
+        self._data_ready.connect(self._schedule)
+
+    def write(self, data):
+        with self._condition:
+            while len(self._pending) >= TERMINAL_MAX_PENDING_BYTES and not self._closed:
+                self._condition.wait()
+            was_empty = not self._pending
+            self._pending += data
+        # 只在缓冲区从空变为非空时通知主线程
+        if was_empty:
+            self._data_ready.emit()
+
+    def flush(self):
+        with self._condition:
+            data = bytes(self._pending)
+            self._pending.clear()
+            self._condition.notify_all()
+        if data:
+            self.sink(data)
+
+    def close(self):
+        """不再接收输出，唤醒被阻塞的写入方"""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+        self._frame_timer.stop()
+
+    def _schedule(self):
+        if not self._frame_timer.isActive():
+            self._frame_timer.start()
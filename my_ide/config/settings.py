@@ -1,10 +1,12 @@
+import sys
+import logging
 from pygments.token import (
     Token, Comment, Keyword, Name, String, Error, Number, Operator,
     Punctuation, Generic, Literal
 )
 
 # 过滤硬编码
-ignored_dirs = {'.git', 'node_modules', '__pycache__', 'venv', '.vscode'}
+ignored_dirs = {'.git', 'node_modules', '__pycache__', 'venv', '.vscode', '.seu_ide'}
 ignored_exts = {
     '.pyc', '.pyo', '.o', '.so', # 编译文件
     '.dll', '.exe',             # 可执行文件
@@ -53,4 +55,139 @@ DEFAULT_STYLE = {
 
 # 为你的默认主题定义背景色和默认文本颜色
 DEFAULT_BACKGROUND_COLOR = "#FFFFFF"
-DEFAULT_TEXT_COLOR = "#000000"
\ No newline at end of file
+DEFAULT_TEXT_COLOR = "#000000"
+
+# 停止输入多久(毫秒)后运行一次诊断
+DIAGNOSTICS_DEBOUNCE_MS = 500
+# 内置 MiniC 检查足够快，防抖时间可以更短
+MINIC_DEBOUNCE_MS = 50
+# 使用内置 MiniC 检查的文件后缀；MiniC 只是 C 的子集，普通 C 文件会报出错误的语法错误
+# 项目只用 MiniC 子集写 .c 文件时可以加上 '.c'
+MINIC_EXTS = {'.mc'}
+
+# 外部编译器命令，按文件后缀配置，参数中的 {file} 会被替换为文件路径
+# 编辑器中的源码通过标准输入传入，编译器按 JSON Lines 协议输出诊断(见 core/diagnostics_protocol.py)
+# 例: {'.mc': [sys.executable, '-m', 'my_ide.core.minic_check', '--stdin', '{file}']}
+COMPILER_COMMANDS = {}
+# 流式诊断合并刷新到问题面板的间隔(毫秒)
+DIAGNOSTICS_BATCH_MS = 50
+
+# 常驻的 MiniC 检查进程，设为 None 时在IDE进程内的后台线程中检查
+COMPILER_DAEMON_COMMAND = [sys.executable, '-m', 'my_ide.core.minic_check', '--daemon']
+# 检查进程连续崩溃多少次后放弃，改为进程内检查
+COMPILER_DAEMON_MAX_RESTARTS = 3
+
+# 工作区内保存IDE数据(诊断缓存等)的目录
+WORKSPACE_DATA_DIR = '.seu_ide'
+# 启动时的当前目录是否当作打开的工作区，在其中建立符号索引、保存诊断缓存和卡顿记录
+# 默认为 False，通过"打开文件夹"选择目录后才在该目录下创建 .seu_ide
+WORKSPACE_DATA_IN_STARTUP_DIR = False
+# 是否把诊断缓存保存到工作区
+PERSIST_DIAGNOSTICS_CACHE = True
+# 诊断缓存最多保存多少条 (文件, 内容哈希) 记录
+DIAGNOSTICS_CACHE_MAX_ENTRIES = 512
+
+# 工作区检查使用的进程数，None 表示和CPU核数相同
+WORKSPACE_CHECK_WORKERS = None
+
+# 输出面板最多保留的行数，超过时丢弃最早的输出
+OUTPUT_MAX_LINES = 10000
+# 输出面板合并刷新的间隔(毫秒)
+OUTPUT_FLUSH_MS = 30
+# 每次从子进程读取输出的最大字节数
+OUTPUT_READ_CHUNK = 64 * 1024
+# 读取输出的线程攒够这么多字符或距上次发出超过这么久(毫秒)才把输出发给界面线程
+# 逐行输出的程序不会每行触发一次跨线程信号
+OUTPUT_EMIT_CHARS = 64 * 1024
+OUTPUT_EMIT_MS = 16
+
+# 同时运行的任务(构建、运行、测试命令)数量上限，超过时排队
+TASK_MAX_CONCURRENT = 4
+
+# 构建中间文件和可执行文件放在工作区 .seu_ide 下的这个目录
+BUILD_DIR_NAME = 'build'
+# 按后缀选择的默认构建配置，{source} {object} {objects} {output} 会替换为加好引号的路径，{includes} 替换为 -I 参数
+# 工作区中的 .seu_ide/build.json 可以指定 sources/include_dirs/compile/link/run/output
+BUILD_CONFIGS = {
+    '.c': {
+        'compile': 'gcc {includes} -c {source} -o {object}',
+        'link': 'gcc {objects} -o {output}',
+    },
+    '.cpp': {
+        'compile': 'g++ {includes} -c {source} -o {object}',
+        'link': 'g++ {objects} -o {output}',
+    },
+}
+
+# 终端面板两次重绘之间的最小间隔(毫秒)，期间的输出合并后一次写入
+TERMINAL_FRAME_MS = 16
+# 终端积压的输出超过这个字节数时暂停读取，等界面处理完
+TERMINAL_MAX_PENDING_BYTES = 4 * 1024 * 1024
+# 终端组件的日志级别，DEBUG 会为每块输出写日志，大量输出时明显变慢
+TERMINAL_LOG_LEVEL = logging.WARNING
+
+# 文件树监视的目录发生变化后，等待多久再重新读取(毫秒)
+FILE_TREE_REFRESH_MS = 200
+
+# 快速打开(Ctrl+P)最多显示的结果数
+QUICK_OPEN_MAX_RESULTS = 50
+# 每次按键先在这么多毫秒内返回已经扫描部分的结果，剩下的部分扫描完后再更新列表
+QUICK_OPEN_BUDGET_MS = 10
+# 工作区文件列表最多监视的目录数，超过的目录不会自动更新
+WORKSPACE_WATCH_MAX_DIRS = 4096
+
+# 性能跟踪最多保留的事件数，超过时丢弃最早的事件(每个事件约 200~300 字节)
+TRACE_MAX_EVENTS = 200000
+# 从 View 菜单停止记录时，跟踪文件写到工作区 .seu_ide 下的这个目录
+TRACE_DIR_NAME = 'traces'
+
+# 是否监视事件循环延迟和界面卡顿；关闭后不再运行心跳定时器和采样线程，性能面板没有数据
+STALL_DETECTOR_ENABLED = True
+# 事件循环心跳间隔(毫秒)，实际间隔和预期之差记为事件循环延迟
+STALL_HEARTBEAT_MS = 50
+# 心跳超过这个时间(毫秒)没有到达时认为界面卡住，记录主线程的调用栈
+STALL_THRESHOLD_MS = 250
+# 卡顿持续期间每隔多久(毫秒)再采样一次调用栈
+STALL_RESAMPLE_MS = 1000
+# 最多保留的卡顿记录数
+STALL_MAX_RECORDS = 100
+# 卡顿记录追加到工作区 .seu_ide 下的这个文件(JSON Lines)，便于随问题报告一起提交
+STALL_LOG_FILE = 'stalls.jsonl'
+
+# 日志级别，调试时改为 logging.DEBUG，也可以在日志面板中切换
+LOG_LEVEL = logging.INFO
+LOG_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+# 同一处日志在这段时间(秒)内最多输出 LOG_RATE_LIMIT_BURST 条，超过的只计数
+LOG_RATE_LIMIT_WINDOW_S = 5
+LOG_RATE_LIMIT_BURST = 10
+# 日志面板最多保留的条数
+LOG_VIEWER_MAX_RECORDS = 5000
+
+# 符号索引：保存在工作区 .seu_ide 目录下的 SQLite 数据库
+SYMBOL_INDEX_FILE = "symbols.db"
+# 建立索引的语言(见 workspace_records.LANGUAGES)
+SYMBOL_INDEX_LANGUAGES = ("minic", "c", "header")
+# 需要重新解析的文件达到这个数目时使用进程池
+SYMBOL_INDEX_PARALLEL_MIN = 64
+# 每解析这么多文件提交一次，中途退出时已提交的部分下次不用重新解析
+SYMBOL_INDEX_COMMIT_FILES = 500
+# 工作区符号搜索最多显示的结果数
+SYMBOL_SEARCH_MAX_RESULTS = 50
+# 查找引用最多显示的位置数
+REFERENCES_MAX_RESULTS = 5000
+# 查找引用的结果每凑够这么多条才发给界面线程，一次加入结果树
+REFERENCES_BATCH_SIZE = 200
+
+# 代码补全：输入的标识符达到这个长度时自动弹出，Ctrl+Space 随时弹出
+COMPLETION_MIN_PREFIX = 2
+# 补全列表最多显示的候选数
+COMPLETION_MAX_RESULTS = 50
+# 一次补全查询的时间预算(毫秒)，超过时用已经找到的候选
+COMPLETION_BUDGET_MS = 5
+
+# 编辑器按块统计补全用的标识符和折叠用的花括号，一次编辑改变的行数超过这个值时(如打开文件)改为在空闲时分批扫描
+EDITOR_SYNC_SCAN_LINES = 2000
+# 分批扫描时每批占用的时间(毫秒)
+EDITOR_SCAN_SLICE_MS = 8
+# 编辑停止这么久(毫秒)后刷新大纲
+OUTLINE_UPDATE_MS = 300
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# 构建/运行：只重新编译输入有变化的源文件，产物都是最新时直接运行
+import os
+
+from PySide6.QtCore import QObject, Signal
+
+from my_ide.core.build_cache import (BuildStamps, BuildConfigError, load_build_config, plan_build,
+                                     build_command, record_build, run_command)
+
+
+class BuildController(QObject):
+    """
+    根据构建配置计划构建步骤，通过 TaskRunner 执行
+    构建成功后记录戳记并保存到工作区，下次构建时跳过没有变化的部分
+    """
+    status_message = Signal(str)
+
+    def __init__(self, task_runner, run_task, parent=None):
+        super().__init__(parent)
+        self.task_runner = task_runner
+        self.run_task = run_task  # (名称, 命令, 工作目录) -> 任务编号，负责输出通道
+        self.workspace_root = None
+        self.stamps = BuildStamps()
+        self._builds = {}  # 任务编号 -> (构建配置, 构建步骤, 成功后是否运行)
+        self.task_runner.task_finished.connect(self._on_task_finished)
+
+    def set_workspace(self, workspace_root):
+        if self.workspace_root:
+            self.stamps.save(self.workspace_root)
+        self.workspace_root = workspace_root
+        self.stamps.load(workspace_root)
+
+    def build(self, file_path, run=False):
+        """构建当前文件或工作区配置的项目，run 为 True 时构建成功后运行"""
+        try:
+            config = load_build_config(self.workspace_root, file_path)
+        except BuildConfigError as e:
+            self.status_message.emit(f"构建配置错误: {e}")
+            return
+        if config is None or not config["sources"]:
+            self.status_message.emit("没有可用的构建配置")
+            return
+        name = os.path.basename(config["output"])
+        steps = plan_build(config, self.stamps)
+        if not steps:
+            self.status_message.emit(f"{name} 已是最新，跳过编译")
+            if run:
+                self._run(config)
+            return
+        task_id = self.run_task(f"构建 {name}", build_command(steps), config["root"])
+        self._builds[task_id] = (config, steps, run)
+
+    def shutdown(self):
+        if self.workspace_root:
+            self.stamps.save(self.workspace_root)
+
+    def _run(self, config):
+        name = os.path.basename(config["output"])
+        self.run_task(f"运行 {name}", run_command(config), os.path.dirname(config["sources"][0]))
+
+    def _on_task_finished(self, task_id, exit_code, elapsed, cancelled):
+        entry = self._builds.pop(task_id, None)
+        if entry is None:
+            return
+        config, steps, run = entry
+        if cancelled or exit_code != 0:
+            self.status_message.emit("构建失败" if not cancelled else "构建已取消")
+            return
+        record_build(self.stamps, steps)
+        self.stamps.save(self.workspace_root)
+        if run:
+            self._run(config)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# 常驻检查进程的管理：启动、按行收发请求、崩溃后自动重启
+# 协议见 my_ide/core/minic_check.py 的 --daemon 模式
+import logging
+import os
+import json
+
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+
+from my_ide.config.settings import COMPILER_DAEMON_MAX_RESTARTS
+
+logger = logging.getLogger(__name__)
+
+# 项目根目录，检查进程以 python -m my_ide.xxx 的方式启动，需要在这里运行
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class CompilerDaemon(QObject):
+    """
+    通过标准输入/输出和常驻的检查进程通信，不用每次都启动新进程
+    进程意外退出时自动重启，并重新发送还没有收到响应的请求
+    """
+    response_received = Signal(dict)  # 检查进程返回的响应
+    unavailable = Signal()            # 连续崩溃超过次数，放弃使用
+
+    def __init__(self, command, parent=None):
+        super().__init__(parent)
+        self.command = command
+        self._process = None
+        self._buffer = b""
+        self._pending = {}   # 请求编号 -> 请求数据，崩溃重启后需要重发
+        self._next_id = 0
+        self._restarts = 0
+        self._stopping = False
+        self._given_up = False
+
+    def start(self):
+        """启动检查进程"""
+        self._buffer = b""
+        self._process = QProcess(self)
+        self._process.setProgram(self.command[0])
+        self._process.setArguments(self.command[1:])
+        self._process.setWorkingDirectory(PROJECT_ROOT)
+        self._process.started.connect(self._resend_pending)
+        self._process.readyReadStandardOutput.connect(self._on_ready_read)
+        self._process.finished.connect(self._on_finished)
+        self._process.errorOccurred.connect(self._on_error)
+        self._process.start()
+
+    def is_available(self):
+        return self._process is not None and not self._given_up and not self._stopping
+
+    def request(self, file_path, content_hash, text):
+        """
+        发送一次检查请求，返回请求编号
+        同一个文件还没返回的旧请求会被丢弃，进程只需处理最新的内容
+        """
+        self._next_id += 1
+        for request_id, (pending_file, _) in list(self._pending.items()):
+            if pending_file == file_path:
+                del self._pending[request_id]
+        data = json.dumps({
+            "id": self._next_id,
+            "file": file_path,
+            "content_hash": content_hash,
+            "text": text,
+        }, ensure_ascii=False).encode('utf-8') + b"\n"
+        self._pending[self._next_id] = (file_path, data)
+        if self._process.state() == QProcess.Running:
+            self._process.write(data)
+        # 还在启动或重启中的话，started 之后统一重发
+        return self._next_id
+
+    def shutdown(self):
+        """通知检查进程退出，超时则强制结束"""
+        self._stopping = True
+        if not self._process or self._process.state() == QProcess.NotRunning:
+            return
+        self._process.write(b'{"command": "shutdown"}\n')
+        self._process.closeWriteChannel()
+        if not self._process.waitForFinished(1000):
+            self._process.kill()
+            self._process.waitForFinished(1000)
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self._process.readAllStandardOutput())
+        lines = self._buffer.split(b"\n")
+        self._buffer = lines.pop()
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            if self._pending.pop(response.get("id"), None) is None:
+                # 已被更新的请求替代，不再需要
+                continue
+            # 进程正常工作，清零崩溃计数
+            self._restarts = 0
+            self.response_received.emit(response)
+
+    def _on_error(self, error):
+        # 启动失败时不会有 finished 信号
+        if error == QProcess.FailedToStart:
+            self._on_finished(-1, QProcess.CrashExit)
+
+    def _on_finished(self, exit_code, exit_status):
+        if self._stopping or self._given_up:
+            return
+        self._restarts += 1
+        if self._restarts > COMPILER_DAEMON_MAX_RESTARTS:
+            logger.warning("检查进程多次崩溃，改为在IDE内检查")
+            self._given_up = True
+            self._pending.clear()
+            self.unavailable.emit()
+            return
+        logger.warning("检查进程已退出(代码 %s)，正在重启", exit_code)
+        # 稍等再重启，避免启动即崩溃时空转
+        QTimer.singleShot(200 * self._restarts, self._restart)
+
+    def _restart(self):
+        if self._stopping:
+            return
+        old_process = self._process
+        self.start()
+        old_process.deleteLater()
+
+    def _resend_pending(self):
+        """进程启动后发送在启动期间积累的请求"""
+        for _, data in self._pending.values():
+            self._process.write(data)
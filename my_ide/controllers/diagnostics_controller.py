@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+# 诊断(问题面板)的调度逻辑：编辑防抖、保存触发、监听编译器输出文件
+import logging
+import os
+import sys
+import time
+import threading
+import subprocess
+
+from PySide6.QtCore import QObject, QThread, QTimer, QFileSystemWatcher, Signal
+
+from my_ide.config.settings import (DIAGNOSTICS_DEBOUNCE_MS, MINIC_DEBOUNCE_MS,
+                                    COMPILER_COMMANDS, DIAGNOSTICS_BATCH_MS,
+                                    PERSIST_DIAGNOSTICS_CACHE)
+from my_ide.core.minic_parser import MiniCChecker, is_minic_file
+from my_ide.core.diagnostics_protocol import JsonLinesDecoder, parse_error_document, normalize_error
+from my_ide.core.diagnostics_cache import DiagnosticsCache, content_hash
+from my_ide.core import tracing
+
+logger = logging.getLogger(__name__)
+
+
+# 在后台线程中检查 MiniC 源码
+class MiniCCheckWorker(QObject):
+    """
+    常驻后台线程，保存上次的解析结果以便增量复用
+    有更新的请求到来时，旧的请求直接丢弃或中途放弃
+    """
+    check_finished = Signal(int, str, list)  # 请求编号, 文件路径, 错误列表
+
+    def __init__(self):
+        super().__init__()
+        self.checker = MiniCChecker()
+        # 由UI线程写入的最新请求编号
+        self.latest_request = 0
+
+    def check(self, request_id, file_path, text):
+        if request_id != self.latest_request:
+            return
+        errors = self.checker.check(text, lambda: request_id != self.latest_request)
+        if errors is not None:
+            self.check_finished.emit(request_id, file_path, errors)
+
+
+# 在后台线程中运行外部编译器，边读输出边解析诊断
+class CompilerStreamWorker(QObject):
+    diagnostics_received = Signal(int, list)  # 请求编号, 新到达的一批错误
+    finished = Signal(int, int)  # 请求编号, 退出代码
+
+    def __init__(self, request_id, command, text, parent=None):
+        super().__init__(parent)
+        self.request_id = request_id
+        self.command = command
+        self.text = text
+        self._process = None
+        self._stopped = False
+
+    def run(self):
+        """执行编译器，按批发送解析出的诊断"""
+        return_code = -1
+        try:
+            creationflags = 0
+            if sys.platform == "win32":
+                creationflags = subprocess.CREATE_NO_WINDOW
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=creationflags
+            )
+            if self._stopped:
+                self._process.kill()
+            # 单独的线程写入源码，避免编译器输出过多时双方互相等待
+            threading.Thread(target=self._write_input, daemon=True).start()
+
+            decoder = JsonLinesDecoder()
+            batch = []
+            last_emit = 0.0
+            interval = DIAGNOSTICS_BATCH_MS / 1000
+            while True:
+                data = self._process.stdout.read1(65536)
+                if not data or self._stopped:
+                    break
+                batch.extend(decoder.feed(data))
+                now = time.monotonic()
+                if batch and now - last_emit >= interval:
+                    self.diagnostics_received.emit(self.request_id, batch)
+                    batch = []
+                    last_emit = now
+            if not self._stopped:
+                batch.extend(decoder.finish())
+                if batch:
+                    self.diagnostics_received.emit(self.request_id, batch)
+            self._process.stdout.close()
+            return_code = self._process.wait()
+        except Exception as e:
+            logger.error("编译器运行失败: %s", e)
+        self.finished.emit(self.request_id, return_code)
+
+    def _write_input(self):
+        try:
+            self._process.stdin.write(self.text.encode('utf-8'))
+            self._process.stdin.close()
+        except (OSError, ValueError):
+            pass
+
+    def stop(self):
+        """放弃这次编译，结束编译器进程"""
+        self._stopped = True
+        if self._process and self._process.poll() is None:
+            self._process.kill()
+
+
+class DiagnosticsController(QObject):
+    """
+    代替原来每10秒轮询一次的定时器
+    编辑停止一段时间后、保存时、编译器输出文件变化时才运行一次检查，
+    缓冲区和输出文件的内容哈希都没变时直接跳过
+    """
+    problems_updated = Signal(str, list)  # 文件路径, 错误列表(与JSON中errors的格式相同)
+    _check_requested = Signal(int, str, str)  # 发往后台线程的检查请求
+
+    def __init__(self, editor, error_json_path, parent=None, daemon=None):
+        super().__init__(parent)
+        self.editor = editor
+        self.error_json_path = error_json_path
+        self.file_path = None
+        # 常驻检查进程，可用时 MiniC 文件优先交给它检查
+        self.daemon = daemon
+        self._daemon_request = None
+        if self.daemon:
+            self.daemon.response_received.connect(self._on_daemon_response)
+            self.daemon.unavailable.connect(self._on_daemon_unavailable)
+
+        self._buffer_hash = None  # 上次检查时缓冲区的哈希
+        self._request_hash = None  # 当前请求对应的缓冲区哈希，结果到达后写入缓存
+        # 诊断缓存，切回未修改的文件时直接显示
+        self.cache = DiagnosticsCache()
+        self.workspace_root = None
+        self._output_hash = None  # 上次解析时输出文件的哈希
+        self._paused = False      # 窗口最小化时暂停
+        self._pending = False     # 暂停期间是否有被推迟的检查
+
+        # 防抖：每次编辑都重新计时，停止输入后才运行
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(DIAGNOSTICS_DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self.run_cycle)
+        self.editor.textChanged.connect(self.schedule)
+
+        # MiniC 文件由后台线程中的内置解析器检查
+        self._request_id = 0
+        self._check_thread = QThread(self)
+        self._check_worker = MiniCCheckWorker()
+        self._check_worker.moveToThread(self._check_thread)
+        self._check_requested.connect(self._check_worker.check)
+        self._check_worker.check_finished.connect(self._on_check_finished)
+        self._check_thread.finished.connect(self._check_worker.deleteLater)
+        self._check_thread.start()
+
+        # 外部编译器，请求编号 -> (线程, worker)，只有最新的一次结果有效
+        self._compilers = {}
+        self._streamed = None  # 本次编译已收到的诊断，None 表示还没收到
+
+        # 监听编译器输出文件，文件不存在时监听它所在的目录
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_output_changed)
+        self._watcher.directoryChanged.connect(self._on_output_changed)
+        self._watch_output()
+
+    def set_workspace(self, workspace_root):
+        """切换工作区时保存旧工作区的缓存并读取新工作区的缓存"""
+        if PERSIST_DIAGNOSTICS_CACHE:
+            if self.workspace_root:
+                self.cache.save(self.workspace_root)
+            self.cache.load(workspace_root)
+        self.workspace_root = workspace_root
+
+    def set_file(self, file_path):
+        """切换当前文件，立即检查一次"""
+        self.file_path = file_path
+        self._buffer_hash = None
+        self._output_hash = None
+        self._debounce_timer.setInterval(MINIC_DEBOUNCE_MS if is_minic_file(file_path) else DIAGNOSTICS_DEBOUNCE_MS)
+        self.run_now()
+
+    def schedule(self):
+        """缓冲区被编辑时调用，重新开始防抖计时"""
+        if not self.file_path:
+            return
+        if self._paused:
+            self._pending = True
+            return
+        self._debounce_timer.start()
+
+    def notify_saved(self):
+        """文件保存后立即检查"""
+        self.run_now()
+
+    def run_now(self):
+        self._debounce_timer.stop()
+        if self._paused:
+            self._pending = True
+            return
+        self.run_cycle()
+
+    def set_paused(self, paused):
+        """窗口最小化时暂停，恢复时补做被推迟的检查"""
+        self._paused = paused
+        if paused:
+            if self._debounce_timer.isActive():
+                self._debounce_timer.stop()
+                self._pending = True
+        elif self._pending:
+            self._pending = False
+            self.run_cycle()
+
+    def run_cycle(self):
+        """
+        运行一次检查，缓冲区没有变化时不重新编译
+        """
+        with tracing.span("diagnostics.run_cycle", "compile"):
+            self._run_cycle()
+
+    def _run_cycle(self):
+        self._pending = False
+        # 如果当前没有打开任何文件，就不应该显示错误
+        if not self.file_path:
+            self.problems_updated.emit("", [])
+            return
+
+        text = self.editor.toPlainText()
+        buffer_hash = content_hash(text)
+        if buffer_hash == self._buffer_hash:
+            return
+        self._buffer_hash = buffer_hash
+        command = self._compiler_command(self.file_path)
+        if not command and not is_minic_file(self.file_path):
+            # 没有配置编译器时读取外部工具写出的 JSON 文件
+            self._load_output()
+            return
+
+        # 同样的内容检查过就直接使用缓存，同时作废还在进行的检查
+        cached = self.cache.get(self.file_path, buffer_hash)
+        if cached is not None:
+            self._request_id += 1
+            self._daemon_request = None
+            self.problems_updated.emit(self.file_path, cached)
+            return
+        self._request_hash = buffer_hash
+        if command:
+            self._start_compiler(command, text)
+        else:
+            self._request_check(text, buffer_hash)
+
+    def _compiler_command(self, file_path):
+        template = COMPILER_COMMANDS.get(os.path.splitext(file_path)[1])
+        if not template:
+            return None
+        return [arg.replace('{file}', file_path) for arg in template]
+
+    def _start_compiler(self, command, text):
+        """启动外部编译器，诊断随输出流式到达问题面板"""
+        self._stop_compiler()
+        self._request_id += 1
+        self._streamed = None
+        tracing.begin_async("compile.compiler", self._request_id, "compile", file=self.file_path)
+
+        thread = QThread(self)
+        worker = CompilerStreamWorker(self._request_id, command, text)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.diagnostics_received.connect(self._on_stream_diagnostics)
+        worker.finished.connect(self._on_compiler_finished)
+        # 线程结束前一直持有引用，防止被提前回收
+        self._compilers[self._request_id] = (thread, worker)
+        thread.start()
+
+    def _stop_compiler(self):
+        """结束所有还在运行的编译器进程"""
+        for thread, worker in self._compilers.values():
+            worker.stop()
+
+    def _on_stream_diagnostics(self, request_id, errors):
+        if request_id != self._request_id:
+            return
+        # 第一批到达时才替换旧的诊断，避免面板先被清空再填充
+        if self._streamed is None:
+            self._streamed = []
+        self._streamed.extend(errors)
+        self.problems_updated.emit(self.file_path, list(self._streamed))
+
+    def _on_compiler_finished(self, request_id, return_code):
+        thread, worker = self._compilers.pop(request_id, (None, None))
+        if thread:
+            # worker.run 已经返回，线程可以立即结束
+            thread.quit()
+            thread.wait()
+            thread.deleteLater()
+        tracing.end_async("compile.compiler", request_id, "compile", return_code=return_code)
+        if request_id != self._request_id:
+            return
+        # 被中途结束的编译结果不完整，不写入缓存
+        if return_code >= 0:
+            self.cache.put(self.file_path, self._request_hash, self._streamed or [])
+        if self._streamed is None:
+            self.problems_updated.emit(self.file_path, [])
+
+    def _request_check(self, text, buffer_hash):
+        """
+        把检查请求交给常驻检查进程或后台线程，同时作废之前还没完成的请求
+        """
+        self._request_id += 1
+        if self.daemon and self.daemon.is_available():
+            self._daemon_request = self.daemon.request(self.file_path, buffer_hash, text)
+            tracing.begin_async("compile.daemon", self._daemon_request, "compile", file=self.file_path)
+            return
+        self._daemon_request = None
+        self._check_worker.latest_request = self._request_id
+        tracing.begin_async("compile.thread", self._request_id, "compile", file=self.file_path)
+        self._check_requested.emit(self._request_id, self.file_path, text)
+
+    def _on_daemon_response(self, response):
+        if response.get("id") != self._daemon_request or response.get("file") != self.file_path:
+            return
+        tracing.end_async("compile.daemon", self._daemon_request, "compile")
+        self._daemon_request = None
+        errors = [normalize_error(e) for e in response.get("errors", [])]
+        if "error" not in response:
+            self.cache.put(self.file_path, response.get("content_hash"), errors)
+        self.problems_updated.emit(self.file_path, errors)
+
+    def _on_daemon_unavailable(self):
+        """检查进程不可用，用进程内检查重新运行一次"""
+        self._daemon_request = None
+        self._buffer_hash = None
+        self.run_now()
+
+    def _on_check_finished(self, request_id, file_path, errors):
+        tracing.end_async("compile.thread", request_id, "compile")
+        if request_id != self._request_id or file_path != self.file_path:
+            return
+        self.cache.put(file_path, self._request_hash, errors)
+        self.problems_updated.emit(file_path, errors)
+
+    def shutdown(self):
+        """窗口关闭时停止后台线程"""
+        self._check_worker.latest_request = -1
+        self._stop_compiler()
+        for thread, worker in self._compilers.values():
+            thread.quit()
+            thread.wait()
+        self._compilers.clear()
+        self._check_thread.quit()
+        self._check_thread.wait()
+        if PERSIST_DIAGNOSTICS_CACHE and self.workspace_root:
+            self.cache.save(self.workspace_root)
+
+    def _load_output(self):
+        """读取编译器输出的JSON，内容没有变化时跳过解析"""
+        if not self.file_path or self._compiler_command(self.file_path) or is_minic_file(self.file_path):
+            return
+        if not os.path.exists(self.error_json_path):
+            return
+        try:
+            with open(self.error_json_path, 'rb') as f:
+                raw = f.read()
+            output_hash = content_hash(raw)
+            if output_hash == self._output_hash:
+                return
+            errors = parse_error_document(raw)
+            self._output_hash = output_hash
+            self.problems_updated.emit(self.file_path, errors)
+        except Exception as e:
+            logger.exception("更新问题列表出错: %s", e)
+
+    def _watch_output(self):
+        """文件被编辑器整体替换后监听会失效，需要重新添加"""
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        if os.path.exists(self.error_json_path):
+            if self.error_json_path not in watched:
+                self._watcher.addPath(self.error_json_path)
+        output_dir = os.path.dirname(self.error_json_path)
+        if os.path.isdir(output_dir) and output_dir not in watched:
+            self._watcher.addPath(output_dir)
+
+    def _on_output_changed(self, path):
+        self._watch_output()
+        if self._paused:
+            self._pending = True
+            return
+        self._load_output()
@@ -1,9 +1,13 @@
 # -*- coding: utf-8 -*-
 # 耦合是必要的，因为他是管理类，和main_window强绑定，是main_window的一部分。
 # 负责各个功能的内部实现,让main_window更简洁
+import logging
+
 from PySide6.QtGui import QTextDocument,QTextOption,QTextCharFormat,QColor
 from PySide6.QtWidgets import QTextEdit
 
+logger = logging.getLogger(__name__)
+
 class EditorController:
     def __init__(self, editor_widget):
         self.editor = editor_widget
@@ -22,6 +26,28 @@ class EditorController:
         self.current_match_format = QTextCharFormat()
         self.current_match_format.setBackground(QColor("orange"))
 
+        # 滚动时补刷新还是旧风格的可见文本块
+        self.editor.updateRequest.connect(self._on_editor_update_request)
+
+    def set_highlight_style(self, style_name):
+        """切换高亮风格，只重新高亮可见的文本块"""
+        if not self.highlighter:
+            return
+        self.highlighter.set_style(style_name)
+        self.rehighlight_visible()
+
+    def rehighlight_visible(self):
+        """重新高亮视口内风格过期的文本块"""
+        if not self.highlighter:
+            return
+        for block in self.editor.visible_blocks():
+            self.highlighter.refresh_block(block)
+
+    def _on_editor_update_request(self, rect, dy):
+        # 光标闪烁只会请求一小块区域，跳过；滚动或整体重绘时才检查
+        if self.highlighter and (dy or rect.contains(self.editor.viewport().rect())):
+            self.rehighlight_visible()
+
     def undo(self):
         """撤销上一步操作"""
         self.editor.undo()
@@ -63,16 +89,32 @@ class EditorController:
         current_state = self.editor.wordWrapMode()
         if current_state == QTextOption.WrapAtWordBoundaryOrAnywhere:
             self.editor.setWordWrapMode(QTextOption.NoWrap)
-            print("Console: 自动换行已关闭")
+            logger.info("自动换行已关闭")
         else:
             self.editor.setWordWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
-            print("Console: 自动换行已开启")
+            logger.info("自动换行已开启")
+
+    def fold(self):
+        """折叠光标所在的最内层区域"""
+        self.editor.fold()
+
+    def unfold(self):
+        """展开从光标所在行开始的折叠"""
+        self.editor.unfold()
+
+    def fold_all(self):
+        """折叠所有顶层区域"""
+        self.editor.fold_all()
+
+    def unfold_all(self):
+        """展开所有折叠"""
+        self.editor.unfold_all()
 
     def edit_find(self, term, case_sensitive=False, whole_word=False):
         """查找功能的实现"""
         if not term:
             return -1,0
-        print("执行查找:", term, case_sensitive, whole_word)
+        logger.debug("执行查找: %r 区分大小写=%s 全词=%s", term, case_sensitive, whole_word)
         # 1, 设置查找标志
         flags = QTextDocument.FindFlags(0)
         if case_sensitive:
@@ -106,7 +148,7 @@ class EditorController:
 
     def find_next(self):
         if not self.last_search_results:
-            print("next没有查找结果")
+            logger.debug("查找下一个: 没有结果")
             return -1, 0
         self.current_search_index = (self.current_search_index + 1) % len(self.last_search_results)
         self._highlight_all_matches()
@@ -114,7 +156,7 @@ class EditorController:
 
     def find_previous(self):
         if not self.last_search_results:
-            print("previous没有查找结果")
+            logger.debug("查找上一个: 没有结果")
             return -1, 0
         self.current_search_index = (self.current_search_index - 1) % len(self.last_search_results)
         self._highlight_all_matches()
@@ -148,7 +190,7 @@ class EditorController:
     def replace_all(self,replace_term):
         """替换功能的实现"""
         if not self.last_search_results:
-            print("replace_all没有查找结果")
+            logger.debug("全部替换: 没有查找结果")
             return 0
         replace_count = len(self.last_search_results)
 
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# 在后台线程中运行子进程，按块读取输出
+import logging
+import os
+import sys
+import time
+import codecs
+import select
+import signal
+import subprocess
+
+from PySide6.QtCore import QObject, Signal
+
+from my_ide.config.settings import OUTPUT_READ_CHUNK, OUTPUT_EMIT_CHARS, OUTPUT_EMIT_MS
+from my_ide.core import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def _wait_readable(stream, timeout):
+    """等待管道可读，最多 timeout 秒；Windows 上 select 不支持管道，返回 False，每次读到的输出直接发出"""
+    if sys.platform == "win32":
+        return False
+    return bool(select.select([stream], [], [], timeout)[0])
+
+
+# 用于在后台线程中运行子进程，避免UI冻结
+class ProcessWorker(QObject):
+    new_output = Signal(str)  # 一段输出文本，不一定按行对齐；最多每 OUTPUT_EMIT_MS 发出一次
+    diagnostics_found = Signal(list)  # line_parser 从输出中识别出的诊断
+    finished = Signal(int)
+
+    def __init__(self, command, parent=None, cwd=None, line_parser=None):
+        super().__init__(parent)
+        self.command = command
+        self.cwd = cwd
+        self.line_parser = line_parser  # 可选，在后台线程中逐行解析输出
+        self.process = None
+        self._cancelled = False
+
+    def run(self):
+        """执行命令，按块读取输出并实时发送"""
+        try:
+            # 子进程放在单独的进程组中，取消时连同它启动的子进程一起结束
+            # 在Windows上使用 CREATE_NO_WINDOW 防止弹出控制台窗口
+            popen_kwargs = {}
+            if sys.platform == "win32":
+                popen_kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP
+            else:
+                popen_kwargs["start_new_session"] = True
+
+            # shell=True 允许我们运行更复杂的命令，但要注意安全风险
+            # bufsize=0 时每次 read 只做一次系统调用，有多少数据就返回多少
+            self.process = subprocess.Popen(
+                self.command,
+                shell=True,
+                cwd=self.cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=0,
+                **popen_kwargs
+            )
+            # 进程启动前就被取消了
+            if self._cancelled:
+                self._kill_process_group()
+
+            # 增量解码，多字节字符被截断在两块之间时也能正确拼接
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stdout = self.process.stdout
+            total_bytes = 0
+            pending = []  # 已读取还没有发出的文本
+            pending_chars = 0
+            last_emit = time.monotonic()
+            interval = OUTPUT_EMIT_MS / 1000
+            while True:
+                if pending:
+                    # 有没发出的输出时最多等到下次发出的时间，子进程暂时没有输出也能及时显示
+                    timeout = last_emit + interval - time.monotonic()
+                    if timeout <= 0 or not _wait_readable(stdout, timeout):
+                        self._emit_output(pending)
+                        pending, pending_chars, last_emit = [], 0, time.monotonic()
+                        continue
+                data = stdout.read(OUTPUT_READ_CHUNK)
+                if not data:
+                    break
+                total_bytes += len(data)
+                tracing.counter("process_output", "process", bytes=total_bytes)
+                text = decoder.decode(data).replace('\r\n', '\n')
+                if text:
+                    pending.append(text)
+                    pending_chars += len(text)
+                    if pending_chars >= OUTPUT_EMIT_CHARS:
+                        self._emit_output(pending)
+                        pending, pending_chars, last_emit = [], 0, time.monotonic()
+            pending.append(decoder.decode(b'', final=True))
+            self._emit_output(pending)
+            if self.line_parser:
+                diagnostics = self.line_parser.finish()
+                if diagnostics:
+                    self.diagnostics_found.emit(diagnostics)
+
+            self.process.stdout.close()
+            return_code = self.process.wait()
+            self.finished.emit(return_code)
+
+        except Exception as e:
+            self.new_output.emit(f"执行时发生错误: {e}\n")
+            self.finished.emit(-1)
+
+    def _emit_output(self, pending):
+        text = ''.join(pending)
+        if text:
+            self.new_output.emit(text)
+            self._parse_output(text)
+
+    def _parse_output(self, text):
+        if self.line_parser:
+            diagnostics = self.line_parser.feed(text)
+            if diagnostics:
+                self.diagnostics_found.emit(diagnostics)
+
+    def stop(self):
+        """结束子进程及其进程组，可以在其他线程中调用"""
+        self._cancelled = True
+        self._kill_process_group()
+
+    def _kill_process_group(self):
+        process = self.process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=subprocess.CREATE_NO_WINDOW)
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error("结束进程失败: %s", e)
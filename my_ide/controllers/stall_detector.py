@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+# 界面卡顿检测：主线程定时心跳，采样线程发现心跳停止时抓取主线程的调用栈
+import logging
+import os
+import sys
+import json
+import time
+import threading
+import traceback
+from collections import deque
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from my_ide.core import tracing
+from my_ide.core.latency_histogram import LatencyHistogram
+from my_ide.config.settings import (STALL_DETECTOR_ENABLED, STALL_HEARTBEAT_MS, STALL_THRESHOLD_MS,
+                                    STALL_RESAMPLE_MS, STALL_MAX_RECORDS, STALL_LOG_FILE, WORKSPACE_DATA_DIR)
+
+logger = logging.getLogger(__name__)
+
+
+class StallDetector(QObject):
+    """
+    事件循环延迟和卡顿监视
+    主线程的 QTimer 每 STALL_HEARTBEAT_MS 心跳一次，实际间隔超出预期的部分记入延迟直方图；
+    采样线程发现心跳超过 STALL_THRESHOLD_MS 没有到达时抓取主线程的调用栈，
+    心跳恢复后记录卡顿时长，输出日志并追加到工作区的 stalls.jsonl
+    """
+    stall_detected = Signal(dict)  # {"started": 时间戳, "duration_ms": 时长, "stacks": [调用栈文本]}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.histogram = LatencyHistogram()
+        self.stalls = deque(maxlen=STALL_MAX_RECORDS)
+        self.log_path = None
+        self._main_thread_id = None
+        self._last_beat = time.monotonic()
+        self._expected = None
+        self._stop = threading.Event()
+        self._sampler = None
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(STALL_HEARTBEAT_MS)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+        # 采样线程发出的信号排队到主线程处理
+        self.stall_detected.connect(self._on_stall_detected)
+
+    def set_workspace(self, workspace_root):
+        self.log_path = os.path.join(workspace_root, WORKSPACE_DATA_DIR, STALL_LOG_FILE)
+
+    def start(self):
+        """在主线程中调用，STALL_DETECTOR_ENABLED 为 False 时什么也不做"""
+        if self._sampler is not None or not STALL_DETECTOR_ENABLED:
+            return
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._expected = self._last_beat + STALL_HEARTBEAT_MS / 1000
+        self._heartbeat.start()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="StallSampler", daemon=True)
+        self._sampler.start()
+
+    def is_running(self):
+        return self._sampler is not None
+
+    def shutdown(self):
+        self._heartbeat.stop()
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(1)
+            self._sampler = None
+
+    def _on_heartbeat(self):
+        now = time.monotonic()
+        latency_ms = max(0.0, (now - self._expected) * 1000)
+        self.histogram.add(latency_ms, now)
+        tracing.counter("event_loop_latency", "ui", ms=round(latency_ms, 2))
+        self._last_beat = now
+        self._expected = now + STALL_HEARTBEAT_MS / 1000
+
+    def _on_stall_detected(self, record):
+        self.stalls.append(record)
+
+    # --- 采样线程 ---
+    def _sample_loop(self):
+        threshold = STALL_THRESHOLD_MS / 1000
+        interval = min(STALL_HEARTBEAT_MS, STALL_THRESHOLD_MS) / 1000 / 2
+        stall_beat = None  # 卡顿开始前的最后一次心跳，None 表示没有卡顿
+        stacks = []
+        next_sample = 0.0
+        while not self._stop.wait(interval):
+            last_beat = self._last_beat
+            now = time.monotonic()
+            if stall_beat is not None and last_beat != stall_beat:
+                # 心跳恢复，卡顿结束
+                self._finish_stall(stall_beat, last_beat, stacks)
+                stall_beat = None
+            elif now - last_beat > threshold + STALL_HEARTBEAT_MS / 1000:
+                if stall_beat is None:
+                    stall_beat = last_beat
+                    stacks = [self._main_stack()]
+                    next_sample = now + STALL_RESAMPLE_MS / 1000
+                elif now >= next_sample:
+                    stacks.append(self._main_stack())
+                    next_sample = now + STALL_RESAMPLE_MS / 1000
+
+    def _main_stack(self):
+        frame = sys._current_frames().get(self._main_thread_id)
+        if frame is None:
+            return ""
+        return "".join(traceback.format_stack(frame))
+
+    def _finish_stall(self, last_beat, resumed, stacks):
+        duration_ms = (resumed - last_beat) * 1000 - STALL_HEARTBEAT_MS
+        record = {
+            "started": time.time() - (time.monotonic() - last_beat),
+            "duration_ms": round(duration_ms, 1),
+            "stacks": stacks,
+        }
+        innermost = stacks[0].rstrip().splitlines()[-2:] if stacks[0] else []
+        logger.warning("界面卡顿 %.0f ms，卡在:\n%s", duration_ms, "\n".join(innermost))
+        self._append_log(record)
+        self.stall_detected.emit(record)
+
+    def _append_log(self, record):
+        if not self.log_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.error("写入卡顿记录失败: %s", e)
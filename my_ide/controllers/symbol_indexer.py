@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+# 符号索引的维护：后台线程按工作区清单增量更新 SQLite 索引，界面线程只读查询
+import os
+import time
+import logging
+import sqlite3
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from my_ide.core import tracing
+from my_ide.core.process_pool import create_process_pool
+from my_ide.core.symbol_index import SymbolIndex, index_source_file, index_source_text
+from my_ide.config.settings import (WORKSPACE_DATA_DIR, SYMBOL_INDEX_FILE, SYMBOL_INDEX_LANGUAGES,
+                                    SYMBOL_INDEX_PARALLEL_MIN, SYMBOL_INDEX_COMMIT_FILES,
+                                    WORKSPACE_CHECK_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+
+class SymbolIndexWorker(QObject):
+    """
+    在后台线程中写入符号索引，数据库连接在这个线程中创建
+    每个请求带工作区版本号，工作区切换后旧的请求直接放弃
+    """
+    progress = Signal(int, int)  # 已完成数, 总数
+    updated = Signal()           # 有新的内容提交
+    names_ready = Signal(int, list)  # 工作区版本号, 更新结束后的全部符号名称(供补全使用)
+
+    def __init__(self):
+        super().__init__()
+        self.index = None
+        self.root = None
+        # 由界面线程写入的最新工作区版本号
+        self.generation = 0
+
+    def open(self, generation, root, db_path):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+        if generation != self.generation:
+            return
+        self.root = root
+        try:
+            self.index = SymbolIndex(db_path)
+        except sqlite3.Error as e:
+            logger.error("打开符号索引失败: %s", e)
+
+    def close(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def index_files(self, generation, entries, removed, full):
+        """
+        entries 为 [(相对路径, 大小, 修改时间)]，大小或修改时间和索引中不同的文件重新解析
+        full 为 True 时 entries 是全部文件，索引中多出来的文件一起删除
+        """
+        if generation != self.generation or self.index is None:
+            return
+        with tracing.span("symbols.index_files", "symbols", files=len(entries), full=full):
+            try:
+                changed = self._index_files(generation, entries, removed, full)
+            except Exception as e:
+                # 数据库错误或解析进程崩溃，下次同步时重新解析没有提交的文件
+                logger.exception("更新符号索引失败: %s", e)
+                return
+        if changed or full:
+            self._emit_names(generation)
+
+    def _emit_names(self, generation):
+        try:
+            self.names_ready.emit(generation, self.index.global_names())
+        except sqlite3.Error as e:
+            logger.error("读取符号名称失败: %s", e)
+
+    def _index_files(self, generation, entries, removed, full):
+        """返回索引是否有变化"""
+        states = self.index.file_states()
+        stale = [(rel_path, size, mtime) for rel_path, size, mtime in entries
+                 if states.get(rel_path) != (size, mtime)]
+        removed = set(removed)
+        if full:
+            present = {rel_path for rel_path, _, _ in entries}
+            removed.update(path for path in states if path not in present)
+        for rel_path in removed:
+            if rel_path in states:
+                self.index.remove_file(rel_path)
+        self.index.commit()
+        if removed:
+            self.updated.emit()
+        if not stale:
+            return bool(removed)
+
+        started = time.perf_counter()
+        total = len(stale)
+        done = 0
+        self.progress.emit(0, total)
+        stats = {os.path.join(self.root, rel_path): (rel_path, size, mtime) for rel_path, size, mtime in stale}
+        paths = list(stats)
+        executor = None
+        if total >= SYMBOL_INDEX_PARALLEL_MIN:
+            executor = create_process_pool(WORKSPACE_CHECK_WORKERS)
+            results = executor.map(index_source_file, paths, chunksize=32)
+        else:
+            results = map(index_source_file, paths)
+        try:
+            for file_path, symbols, occurrences in results:
+                if generation != self.generation:
+                    break
+                rel_path, size, mtime = stats[file_path]
+                if symbols is None:
+                    self.index.remove_file(rel_path)
+                else:
+                    self.index.replace_file(rel_path, size, mtime, symbols, occurrences)
+                done += 1
+                if done % SYMBOL_INDEX_COMMIT_FILES == 0:
+                    self.index.commit()
+                    self.progress.emit(done, total)
+                    self.updated.emit()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=generation == self.generation, cancel_futures=True)
+            self.index.commit()
+        self.progress.emit(done, total)
+        self.updated.emit()
+        logger.info("符号索引已更新 %d 个文件，用时 %.0f ms", done, (time.perf_counter() - started) * 1000)
+        return True
+
+    def index_text(self, generation, rel_path, text):
+        """保存后直接用编辑器中的文本更新，不用再读文件"""
+        if generation != self.generation or self.index is None:
+            return
+        try:
+            stat = os.stat(os.path.join(self.root, rel_path))
+            self.index.replace_file(rel_path, stat.st_size, stat.st_mtime, *index_source_text(text))
+            self.index.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.error("更新符号索引失败: %s", e)
+            return
+        self.updated.emit()
+        self._emit_names(generation)
+
+
+class SymbolIndexer(QObject):
+    """
+    工作区符号索引，跟随工作区清单更新
+    第一次遍历完成后和索引中保存的状态比较，只重新解析变化过的文件；之后按清单的增量更新
+    查询在界面线程中用另一个只读连接进行
+    """
+    progress = Signal(int, int)
+    updated = Signal()
+    names_ready = Signal(list)
+    _open_requested = Signal(int, str, str)
+    _index_requested = Signal(int, list, list, bool)
+    _text_requested = Signal(int, str, str)
+    _close_requested = Signal()
+
+    def __init__(self, inventory, parent=None):
+        super().__init__(parent)
+        self.inventory = inventory
+        self.root = None
+        self.db_path = None
+        self._generation = 0
+        self._reader = None
+        self._needs_full_sync = False
+        self.enabled = False  # 打开文件夹后才建立索引，见 set_enabled
+
+        self.worker = SymbolIndexWorker()
+        self.thread = QThread(self)
+        self.worker.moveToThread(self.thread)
+        self._open_requested.connect(self.worker.open)
+        self._index_requested.connect(self.worker.index_files)
+        self._text_requested.connect(self.worker.index_text)
+        self._close_requested.connect(self.worker.close)
+        self.worker.progress.connect(self.progress)
+        self.worker.updated.connect(self.updated)
+        self.worker.names_ready.connect(self._on_names_ready)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.start()
+
+        inventory.changed.connect(self._on_inventory_changed)
+
+    def set_enabled(self, enabled):
+        """为 False 时忽略清单的变化，不在工作区中创建索引数据库；在清单切换根目录之前调用"""
+        self.enabled = enabled
+
+    def shutdown(self):
+        self.worker.generation = -1
+        self._close_requested.emit()
+        self.thread.quit()
+        self.thread.wait()
+        self._close_reader()
+
+    def _close_reader(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _on_inventory_changed(self, delta):
+        if not self.enabled:
+            return
+        if delta.reset:
+            self._generation += 1
+            self.worker.generation = self._generation
+            self._close_reader()
+            self.root = self.inventory.root
+            self.db_path = os.path.join(self.root, WORKSPACE_DATA_DIR, SYMBOL_INDEX_FILE)
+            self._open_requested.emit(self._generation, self.root, self.db_path)
+            self.names_ready.emit([])
+            self._needs_full_sync = True
+            return
+        if not self.inventory.is_ready():
+            return  # 第一次遍历完成后统一比较
+        if self._needs_full_sync:
+            self._needs_full_sync = False
+            entries = [self.inventory.record(path)[:3] for language in SYMBOL_INDEX_LANGUAGES
+                       for path in self.inventory.files(language)]
+            self._index_requested.emit(self._generation, entries, [], True)
+            return
+        entries = []
+        for path in delta.added + delta.modified:
+            record = self.inventory.record(path)
+            if record is not None and record[3] in SYMBOL_INDEX_LANGUAGES:
+                entries.append(record[:3])
+        if entries or delta.removed:
+            self._index_requested.emit(self._generation, entries, list(delta.removed), False)
+
+    def _on_names_ready(self, generation, names):
+        if generation == self._generation:
+            self.names_ready.emit(names)
+
+    def file_saved(self, file_path, text):
+        """编辑器保存了工作区中的文件"""
+        rel_path = self._relative(file_path)
+        if rel_path is not None:
+            self._text_requested.emit(self._generation, rel_path, text)
+
+    def _relative(self, file_path):
+        if self.root is None:
+            return None
+        rel_path = os.path.relpath(os.path.abspath(file_path), self.root)
+        if rel_path.startswith(os.pardir):
+            return None
+        return rel_path
+
+    # --- 查询 ---
+    def _query(self, method, *args):
+        """在只读连接上调用 SymbolIndex 的查询方法，结果中的第一项(相对路径)换成完整路径"""
+        if self.db_path is None or not os.path.exists(self.db_path):
+            return []
+        try:
+            if self._reader is None:
+                self._reader = SymbolIndex(self.db_path, create=False)
+            return [(os.path.join(self.root, row[0]),) + row[1:] for row in method(self._reader, *args)]
+        except sqlite3.Error as e:
+            # 索引线程还没有建好表
+            logger.debug("查询符号索引失败: %s", e)
+            return []
+
+    def definitions(self, name):
+        """[(完整路径, Symbol)]，定义在前"""
+        return self._query(SymbolIndex.definitions, name)
+
+    def search(self, query, limit):
+        return self._query(SymbolIndex.search, query, limit)
+
+    def references(self, name):
+        """[(完整路径, 行, 列)]"""
+        return self._query(SymbolIndex.references, name)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# 任务运行器：同时运行多个命令(构建、运行、测试)，超过并发上限时排队
+import time
+from collections import deque
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from my_ide.config.settings import TASK_MAX_CONCURRENT
+from my_ide.controllers.process_worker import ProcessWorker
+
+
+class Task:
+    """一个任务及其运行状态"""
+    QUEUED, RUNNING, FINISHED = "queued", "running", "finished"
+
+    def __init__(self, task_id, name, command, cwd=None, line_parser=None):
+        self.id = task_id
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.line_parser = line_parser
+        self.state = Task.QUEUED
+        self.thread = None
+        self.worker = None
+        self.started_at = None
+        self.exit_code = None
+        self.elapsed = 0.0
+        self.cancelled = False
+
+
+class TaskRunner(QObject):
+    """
+    每个任务在自己的线程中用 ProcessWorker 运行，输出按任务编号发出
+    同时运行的任务数不超过 max_concurrent，其余按提交顺序排队
+    """
+    task_queued = Signal(int)                       # 任务编号
+    task_started = Signal(int)
+    task_output = Signal(int, str)                  # 任务编号, 输出块
+    task_diagnostics = Signal(int, list)            # 任务编号, 从输出中识别出的诊断
+    task_finished = Signal(int, int, float, bool)   # 任务编号, 退出代码, 耗时(秒), 是否被取消
+
+    def __init__(self, parent=None, max_concurrent=TASK_MAX_CONCURRENT):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self._tasks = {}       # 任务编号 -> Task，排队中和运行中的任务
+        self._queue = deque()  # 排队中的任务编号
+        self._next_id = 0
+
+    def submit(self, name, command, cwd=None, line_parser=None):
+        """提交一个任务，返回任务编号，line_parser 见 core/output_parsers.py"""
+        self._next_id += 1
+        task = Task(self._next_id, name, command, cwd, line_parser)
+        self._tasks[task.id] = task
+        self._queue.append(task.id)
+        self.task_queued.emit(task.id)
+        self._start_queued()
+        return task.id
+
+    def task(self, task_id):
+        return self._tasks.get(task_id)
+
+    def tasks(self):
+        """排队中和运行中的任务，按提交顺序"""
+        return [self._tasks[task_id] for task_id in sorted(self._tasks)]
+
+    def running_count(self):
+        return sum(1 for task in self._tasks.values() if task.state == Task.RUNNING)
+
+    def cancel(self, task_id):
+        task = self._tasks.get(task_id)
+        if task is None:
+            return
+        task.cancelled = True
+        if task.state == Task.QUEUED:
+            self._queue.remove(task_id)
+            self._finish(task, -1)
+        elif task.worker:
+            task.worker.stop()
+
+    def cancel_all(self):
+        for task_id in list(self._tasks):
+            self.cancel(task_id)
+
+    def shutdown(self):
+        """窗口关闭时结束所有任务并等待线程退出"""
+        self._queue.clear()
+        for task in list(self._tasks.values()):
+            task.cancelled = True
+            if task.state == Task.RUNNING:
+                task.worker.stop()
+                task.thread.quit()
+                task.thread.wait()
+
+    def _start_queued(self):
+        while self._queue and self.running_count() < self.max_concurrent:
+            task = self._tasks[self._queue.popleft()]
+            self._start(task)
+
+    def _start(self, task):
+        task.state = Task.RUNNING
+        task.started_at = time.monotonic()
+        task.thread = QThread()
+        task.worker = ProcessWorker(task.command, cwd=task.cwd, line_parser=task.line_parser)
+        task.worker.task_id = task.id
+        task.worker.moveToThread(task.thread)
+
+        # 连接到自身的方法上，保证槽函数在主线程中执行，用 sender() 区分任务
+        task.thread.started.connect(task.worker.run)
+        task.worker.new_output.connect(self._on_worker_output)
+        task.worker.diagnostics_found.connect(self._on_worker_diagnostics)
+        task.worker.finished.connect(self._on_worker_finished)
+
+        # 线程清理
+        task.thread.finished.connect(task.worker.deleteLater)
+        task.thread.finished.connect(task.thread.deleteLater)
+
+        task.thread.start()
+        self.task_started.emit(task.id)
+
+    def _on_worker_output(self, text):
+        self.task_output.emit(self.sender().task_id, text)
+
+    def _on_worker_diagnostics(self, diagnostics):
+        self.task_diagnostics.emit(self.sender().task_id, diagnostics)
+
+    def _on_worker_finished(self, exit_code):
+        task = self._tasks.get(self.sender().task_id)
+        if task is None:
+            return
+        # 等线程真正退出后再释放引用
+        task.thread.quit()
+        task.thread.wait()
+        self._finish(task, exit_code)
+        self._start_queued()
+
+    def _finish(self, task, exit_code):
+        if task.started_at is not None:
+            task.elapsed = time.monotonic() - task.started_at
+        task.state = Task.FINISHED
+        task.exit_code = exit_code
+        task.thread = None
+        task.worker = None
+        self.task_finished.emit(task.id, exit_code, task.elapsed, task.cancelled)
+        del self._tasks[task.id]
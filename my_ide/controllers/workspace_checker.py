@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+# 工作区检查：用进程池并行检查工作区中所有的 MiniC 源文件
+import logging
+import os
+import time
+from concurrent.futures import as_completed
+
+from PySide6.QtCore import QObject, QThread, Signal
+
+from my_ide.config.settings import ignored_dirs, WORKSPACE_CHECK_WORKERS, DIAGNOSTICS_BATCH_MS
+from my_ide.core.minic_parser import is_minic_file
+from my_ide.core.minic_check import check_file
+from my_ide.core.process_pool import create_process_pool
+
+logger = logging.getLogger(__name__)
+
+
+def collect_source_files(root_path, priority_files=(), source_files=None):
+    """
+    收集工作区中需要检查的文件
+    source_files 为工作区清单中的 MiniC 文件(相对路径)，为 None 时遍历目录
+    priority_files 中的文件(打开的、最近编辑的)排在最前面，其余按遍历顺序
+    """
+    if source_files is not None:
+        files = [os.path.normpath(os.path.join(root_path, path)) for path in source_files]
+    else:
+        files = []
+        for dirpath, dirs, filenames in os.walk(root_path):
+            dirs[:] = [d for d in dirs if d not in ignored_dirs]
+            for filename in filenames:
+                if is_minic_file(filename):
+                    files.append(os.path.normpath(os.path.join(dirpath, filename)))
+    present = set(files)
+    first = []
+    for path in priority_files:
+        path = os.path.normpath(path)
+        if path in present and path not in first:
+            first.append(path)
+    first_set = set(first)
+    return first + [path for path in files if path not in first_set]
+
+
+# 在后台线程中调度进程池，避免阻塞UI
+class WorkspaceCheckWorker(QObject):
+    files_checked = Signal(list)  # [(文件路径, 内容哈希, 错误列表)]
+    progress = Signal(int, int)   # 已完成数, 总数
+    finished = Signal(bool)       # 是否被取消
+
+    def __init__(self, root_path, priority_files=(), source_files=None, parent=None):
+        super().__init__(parent)
+        self.root_path = root_path
+        self.priority_files = list(priority_files)
+        self.source_files = source_files
+        self._is_running = True
+
+    def run(self):
+        files = collect_source_files(self.root_path, self.priority_files, self.source_files)
+        total = len(files)
+        done = 0
+        self.progress.emit(0, total)
+        batch = []
+        last_emit = time.monotonic()
+        interval = DIAGNOSTICS_BATCH_MS / 1000
+        executor = create_process_pool(WORKSPACE_CHECK_WORKERS)
+        try:
+            # 按优先级顺序提交，进程池会先处理排在前面的任务
+            futures = [executor.submit(check_file, path) for path in files]
+            for future in as_completed(futures):
+                if not self._is_running:
+                    break
+                try:
+                    file_path, file_hash, errors = future.result()
+                except Exception as e:
+                    logger.error("工作区检查出错: %s", e)
+                    errors = None
+                done += 1
+                if errors is not None:
+                    batch.append((file_path, file_hash, errors))
+                now = time.monotonic()
+                if now - last_emit >= interval:
+                    if batch:
+                        self.files_checked.emit(batch)
+                        batch = []
+                    self.progress.emit(done, total)
+                    last_emit = now
+        finally:
+            # 取消时丢弃还在排队的任务，不等待它们
+            executor.shutdown(wait=self._is_running, cancel_futures=True)
+        if batch:
+            self.files_checked.emit(batch)
+        self.progress.emit(done, total)
+        self.finished.emit(not self._is_running)
+
+    def stop(self):
+        self._is_running = False
+
+
+class WorkspaceChecker(QObject):
+    """
+    管理工作区检查任务，同一时间只运行一个
+    结果按完整路径逐批发出，可以随时取消
+    """
+    files_checked = Signal(list)
+    progress = Signal(int, int)
+    finished = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.worker = None
+
+    def is_running(self):
+        return self.thread is not None and self.thread.isRunning()
+
+    def start(self, root_path, priority_files=(), source_files=None):
+        """source_files 为工作区清单中的 MiniC 文件，没有时由后台线程遍历目录"""
+        if self.is_running():
+            return False
+        self.thread = QThread()
+        self.worker = WorkspaceCheckWorker(root_path, priority_files, source_files)
+        self.worker.moveToThread(self.thread)
+
+        self.thread.started.connect(self.worker.run)
+        self.worker.files_checked.connect(self.files_checked)
+        self.worker.progress.connect(self.progress)
+        self.worker.finished.connect(self.finished)
+
+        # 线程清理
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self.worker.deleteLater)
+        self.thread.finished.connect(self.thread.deleteLater)
+        self.thread.finished.connect(self._on_thread_finished)
+
+        self.thread.start()
+        return True
+
+    def cancel(self):
+        if self.worker:
+            self.worker.stop()
+
+    def shutdown(self):
+        """窗口关闭时取消并等待线程结束"""
+        if self.is_running():
+            self.worker.stop()
+            self.thread.quit()
+            self.thread.wait()
+
+    def _on_thread_finished(self):
+        self.thread = None
+        self.worker = None
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+# 工作区文件清单：后台遍历一次，之后通过目录监视增量更新
+# 文件树、搜索、快速打开和工作区检查都从这里取文件列表，不再各自遍历目录
+import os
+from collections import namedtuple
+
+from PySide6.QtCore import QObject, QThread, Signal, QFileSystemWatcher, QTimer
+
+from my_ide.core.fs_scan import scan_directory_stat
+from my_ide.core.workspace_records import FileRecords
+from my_ide.config.settings import WORKSPACE_WATCH_MAX_DIRS, FILE_TREE_REFRESH_MS
+
+# 一次变化通知，路径都是相对工作区根目录的
+# reset 为 True 表示根目录已切换，之前的记录全部作废
+# dirs 为列表内容(文件或子目录)发生变化的目录
+InventoryDelta = namedtuple("InventoryDelta", ["reset", "added", "removed", "modified", "dirs"])
+
+
+def walk_tree(root, start=""):
+    """
+    从 root 下的相对目录 start 开始遍历，应用公共忽略规则
+    返回 {相对目录: ([(文件名, 大小, 修改时间)], [子目录名])}
+    """
+    result = {}
+    pending = [start]
+    while pending:
+        rel_dir = pending.pop()
+        files, subdirs = scan_directory_stat(os.path.join(root, rel_dir))
+        result[rel_dir] = (files, subdirs)
+        pending.extend(os.path.join(rel_dir, name) for name in subdirs)
+    return result
+
+
+# 在后台线程中遍历目录
+class WorkspaceWalker(QObject):
+    walked = Signal(int, str, dict)  # 版本号, 起始相对目录, walk_tree 的结果
+
+    def walk(self, generation, root, start):
+        self.walked.emit(generation, start, walk_tree(root, start))
+
+
+class WorkspaceInventory(QObject):
+    """
+    工作区中所有文件的清单，由 MainWindow 持有，打开文件夹时重建
+    文件记录保存在 FileRecords 中；目录变化时只重新读取这个目录，新出现的子目录在后台遍历
+    变化合并后以 InventoryDelta 通知订阅者
+    """
+    changed = Signal(object)  # InventoryDelta
+    _walk_requested = Signal(int, str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.records = FileRecords()
+        self._generation = 0
+        self._pending_walks = 0
+        self._dirs = {}  # 相对目录 -> (文件名集合, 子目录名集合)
+        self._files = None  # files() 的缓存
+        self._reset_delta()
+
+        self._thread = QThread(self)
+        self._walker = WorkspaceWalker()
+        self._walker.moveToThread(self._thread)
+        self._walk_requested.connect(self._walker.walk)
+        self._walker.walked.connect(self._on_walked)
+        self._thread.finished.connect(self._walker.deleteLater)
+        self._thread.start()
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._changed_dirs = set()
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(FILE_TREE_REFRESH_MS)
+        self._refresh_timer.timeout.connect(self._refresh_changed)
+
+        # 多处变化合并为一次通知
+        self._notify_timer = QTimer(self)
+        self._notify_timer.setSingleShot(True)
+        self._notify_timer.setInterval(FILE_TREE_REFRESH_MS)
+        self._notify_timer.timeout.connect(self._emit_delta)
+
+    # --- 公共方法 ---
+    def set_root(self, root):
+        """切换根目录，丢弃所有记录并在后台重新遍历"""
+        self.root = os.path.normpath(os.path.abspath(root))
+        self._generation += 1
+        self._pending_walks = 0
+        self._dirs = {}
+        self.records.clear()
+        self._files = None
+        self._changed_dirs = set()
+        self._notify_timer.stop()
+        self._reset_delta()
+        directories = self._watcher.directories()
+        if directories:
+            self._watcher.removePaths(directories)
+        self.changed.emit(InventoryDelta(True, [], [], [], []))
+        self._walk("")
+
+    def is_ready(self):
+        """第一次遍历是否已经完成"""
+        return self.root is not None and self._pending_walks == 0
+
+    def files(self, language=None):
+        """所有文件的相对路径，可以只取某种语言的文件(见 workspace_records.LANGUAGES)"""
+        if language is not None:
+            paths = self.records.paths
+            return [paths[file_id] for file_id in self.records.ids(language)]
+        if self._files is None:
+            self._files = [path for path in self.records.paths if path is not None]
+        return self._files
+
+    def absolute_path(self, rel_path):
+        return os.path.join(self.root, rel_path)
+
+    def record(self, rel_path):
+        """(相对路径, 大小, 修改时间, 语言)，不在清单中时返回 None"""
+        file_id = self.records.id_of(rel_path)
+        return None if file_id is None else self.records.record(file_id)
+
+    def listing(self, path):
+        """
+        目录的直接子项 [(名称, 是否为目录)]，不排序
+        目录不在工作区中或还没有遍历到时返回 None
+        """
+        entry = self._dirs.get(self._relative(path))
+        if entry is None:
+            return None
+        files, subdirs = entry
+        return [(name, False) for name in files] + [(name, True) for name in subdirs]
+
+    def watch_directory(self, path):
+        """确保监视这个目录，超过监视数量上限的目录在文件树展开时补上"""
+        if self._relative(path) in self._dirs and path not in self._watcher.directories():
+            self._watcher.addPath(path)
+
+    def shutdown(self):
+        self._thread.quit()
+        self._thread.wait()
+
+    # --- 内部实现 ---
+    def _relative(self, path):
+        if self.root is None:
+            return None
+        rel_dir = os.path.relpath(os.path.normpath(os.path.abspath(path)), self.root)
+        if rel_dir == os.curdir:
+            return ""
+        if rel_dir == os.pardir or rel_dir.startswith(os.pardir + os.sep):
+            return None
+        return rel_dir
+
+    def _walk(self, start):
+        self._pending_walks += 1
+        self._walk_requested.emit(self._generation, self.root, start)
+
+    def _on_walked(self, generation, start, tree):
+        if generation != self._generation:
+            return
+        self._pending_walks -= 1
+        watch = []
+        for rel_dir, (files, subdirs) in tree.items():
+            self._dirs[rel_dir] = ({name for name, _, _ in files}, set(subdirs))
+            for name, size, mtime in files:
+                self._set_file(os.path.join(rel_dir, name) if rel_dir else name, size, mtime)
+            self._dirty_dirs.add(rel_dir)
+            watch.append(os.path.join(self.root, rel_dir))
+        # 浅层目录先监视
+        watch.sort(key=lambda path: path.count(os.sep))
+        room = WORKSPACE_WATCH_MAX_DIRS - len(self._watcher.directories())
+        if room > 0:
+            self._watcher.addPaths(watch[:room])
+        self._changed()
+
+    def _on_directory_changed(self, path):
+        self._changed_dirs.add(path)
+        self._refresh_timer.start()
+
+    def _refresh_changed(self):
+        changed, self._changed_dirs = self._changed_dirs, set()
+        for path in changed:
+            rel_dir = self._relative(path)
+            if rel_dir not in self._dirs:
+                continue
+            if not os.path.isdir(path):
+                self._remove_tree(rel_dir)
+                continue
+            files, subdirs = scan_directory_stat(path)
+            names = {name for name, _, _ in files}
+            subdirs = set(subdirs)
+            old_files, old_subdirs = self._dirs[rel_dir]
+            self._dirs[rel_dir] = (names, subdirs)
+            for name in old_files - names:
+                self._remove_file(os.path.join(rel_dir, name) if rel_dir else name)
+            for name, size, mtime in files:
+                self._set_file(os.path.join(rel_dir, name) if rel_dir else name, size, mtime)
+            for name in old_subdirs - subdirs:
+                self._remove_tree(os.path.join(rel_dir, name))
+            for name in subdirs - old_subdirs:
+                self._walk(os.path.join(rel_dir, name))
+            if names != old_files or subdirs != old_subdirs:
+                self._dirty_dirs.add(rel_dir)
+            self._changed()
+
+    def _remove_tree(self, rel_dir):
+        prefix = rel_dir + os.sep
+        for key in [key for key in self._dirs if key == rel_dir or key.startswith(prefix)]:
+            names, _ = self._dirs.pop(key)
+            for name in names:
+                self._remove_file(os.path.join(key, name))
+            self._dirty_dirs.add(key)
+        self._changed()
+
+    def _set_file(self, rel_path, size, mtime):
+        _, state = self.records.set(rel_path, size, mtime)
+        if state == "added":
+            if rel_path in self._removed:
+                # 删除后又出现，对订阅者来说是修改
+                self._removed.discard(rel_path)
+                self._modified.add(rel_path)
+            else:
+                self._added.add(rel_path)
+        elif state == "modified" and rel_path not in self._added:
+            self._modified.add(rel_path)
+
+    def _remove_file(self, rel_path):
+        if self.records.remove(rel_path) is None:
+            return
+        self._modified.discard(rel_path)
+        if rel_path in self._added:
+            self._added.discard(rel_path)
+        else:
+            self._removed.add(rel_path)
+
+    def _reset_delta(self):
+        self._added = set()
+        self._removed = set()
+        self._modified = set()
+        self._dirty_dirs = set()
+
+    def _changed(self):
+        self._files = None
+        self._notify_timer.start()
+
+    def _emit_delta(self):
+        delta = InventoryDelta(False, list(self._added), list(self._removed),
+                               list(self._modified), list(self._dirty_dirs))
+        self._reset_delta()
+        if delta.added or delta.removed or delta.modified or delta.dirs:
+            self.changed.emit(delta)
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# 增量构建：记录每个构建产物的输入文件内容哈希和命令，输入没有变化时跳过编译
+# 构建配置默认按文件后缀选择(见 settings.BUILD_CONFIGS)，也可以在工作区的 .seu_ide/build.json 中指定
+import logging
+import os
+import re
+import sys
+import json
+import shlex
+import subprocess
+
+from my_ide.config.settings import WORKSPACE_DATA_DIR, BUILD_CONFIGS, BUILD_DIR_NAME
+from my_ide.core.diagnostics_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+STAMPS_FILE_NAME = "build_stamps.json"
+BUILD_CONFIG_FILE_NAME = "build.json"
+STAMPS_VERSION = 1
+
+# 只跟踪用引号包含的头文件，系统头文件(<...>)认为不会变化
+INCLUDE_PATTERN = re.compile(rb'^\s*#\s*include\s*"([^"]+)"', re.MULTILINE)
+
+
+def quote_path(path):
+    """按当前平台的 shell 规则给路径加引号"""
+    if sys.platform == "win32":
+        return subprocess.list2cmdline([path])
+    return shlex.quote(path)
+
+
+def find_includes(source_path, include_dirs=()):
+    """
+    递归查找源文件引用的本地头文件，返回头文件路径集合
+    先在源文件所在目录查找，再按 include_dirs 的顺序查找，找不到的忽略
+    """
+    found = set()
+    pending = [os.path.normpath(source_path)]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            continue
+        for match in INCLUDE_PATTERN.finditer(data):
+            name = match.group(1).decode('utf-8', errors='replace')
+            for directory in (os.path.dirname(path), *include_dirs):
+                candidate = os.path.normpath(os.path.join(directory, name))
+                if os.path.isfile(candidate):
+                    if candidate not in found:
+                        found.add(candidate)
+                        pending.append(candidate)
+                    break
+    return found
+
+
+class BuildStamps:
+    """
+    构建产物的戳记数据库：产物路径 -> 生成它的命令和各输入文件的内容哈希
+    文件哈希按 (修改时间, 大小) 缓存，没有变化的文件不重复读取
+    """
+    def __init__(self):
+        self._targets = {}      # 产物路径 -> {"command": str, "inputs": {路径: 哈希}}
+        self._file_hashes = {}  # 文件路径 -> [修改时间(ns), 大小, 哈希]
+        self._dirty = False
+
+    def file_hash(self, path):
+        """文件内容哈希，文件不存在时返回 None"""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        cached = self._file_hashes.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        try:
+            with open(path, 'rb') as f:
+                digest = content_hash(f.read())
+        except OSError:
+            return None
+        self._file_hashes[path] = [st.st_mtime_ns, st.st_size, digest]
+        self._dirty = True
+        return digest
+
+    def make_stamp(self, command, inputs):
+        return {"command": command, "inputs": {path: self.file_hash(path) for path in sorted(inputs)}}
+
+    def is_up_to_date(self, target, stamp):
+        """产物存在，且命令和所有输入都和上次构建时相同"""
+        if not os.path.isfile(target):
+            return False
+        return self._targets.get(target) == stamp
+
+    def record(self, target, stamp):
+        self._targets[target] = stamp
+        self._dirty = True
+
+    def forget(self, target):
+        if self._targets.pop(target, None) is not None:
+            self._dirty = True
+
+    @staticmethod
+    def stamps_path(workspace_root):
+        return os.path.join(workspace_root, WORKSPACE_DATA_DIR, STAMPS_FILE_NAME)
+
+    def load(self, workspace_root):
+        """读取工作区中保存的戳记，文件不存在或格式不对时全部重新构建"""
+        self._targets = {}
+        self._file_hashes = {}
+        self._dirty = False
+        try:
+            with open(self.stamps_path(workspace_root), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != STAMPS_VERSION:
+            return
+        self._targets = data.get("targets", {})
+        self._file_hashes = data.get("files", {})
+
+    def save(self, workspace_root):
+        """有变化时写回工作区"""
+        if not self._dirty:
+            return
+        path = self.stamps_path(workspace_root)
+        data = {"version": STAMPS_VERSION, "targets": self._targets, "files": self._file_hashes}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logger.error("保存构建戳记失败: %s", e)
+
+
+class BuildConfigError(ValueError):
+    """build.json 的内容不能用来构建"""
+
+
+def load_build_config(workspace_root, file_path):
+    """
+    读取构建配置，返回字典:
+        sources       需要编译的源文件(完整路径)
+        include_dirs  头文件查找目录
+        compile       编译单个源文件的命令模板，可用 {source} {object} {includes}
+        link          链接命令模板，可用 {objects} {output}
+        run           运行命令模板，可用 {output}
+        output        最终可执行文件路径
+        build_dir     中间文件目录
+        root          工作区根目录
+    工作区有 .seu_ide/build.json 时用其中的设置覆盖默认配置(按当前文件或第一个源文件的后缀选择)，
+    没有写 sources 时构建当前文件；没有 build.json 时按当前文件的后缀选择默认配置
+    不支持的文件返回 None；build.json 不是对象或缺少编译/链接命令时抛出 BuildConfigError
+    """
+    config_path = os.path.join(workspace_root, WORKSPACE_DATA_DIR, BUILD_CONFIG_FILE_NAME)
+    config = None
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except OSError:
+        pass
+    except ValueError as e:
+        logger.warning("构建配置格式错误: %s", e)
+
+    if config is None:
+        if not file_path:
+            return None
+        defaults = BUILD_CONFIGS.get(os.path.splitext(file_path)[1].lower())
+        if defaults is None:
+            return None
+        config = dict(defaults, sources=[file_path])
+        name = os.path.splitext(os.path.basename(file_path))[0]
+    else:
+        if not isinstance(config, dict):
+            raise BuildConfigError(f"{BUILD_CONFIG_FILE_NAME} 应为 JSON 对象")
+        # 没有写 sources 时构建当前文件
+        sources = config.get("sources") or ([file_path] if file_path else [])
+        ext = os.path.splitext(file_path or (sources[0] if sources else ""))[1].lower()
+        config = dict(BUILD_CONFIGS.get(ext, {}), **config)
+        config["sources"] = sources
+        missing = [key for key in ("compile", "link") if not config.get(key)]
+        if missing:
+            raise BuildConfigError(f"{BUILD_CONFIG_FILE_NAME} 缺少 {', '.join(missing)}")
+        name = config.get("name") or os.path.basename(os.path.normpath(workspace_root))
+
+    build_dir = os.path.join(workspace_root, WORKSPACE_DATA_DIR, BUILD_DIR_NAME)
+    output = config.get("output") or os.path.join(build_dir, name + (".exe" if sys.platform == "win32" else ""))
+    return {
+        "sources": [os.path.normpath(os.path.join(workspace_root, s)) for s in config.get("sources", [])],
+        "include_dirs": [os.path.normpath(os.path.join(workspace_root, d)) for d in config.get("include_dirs", [])],
+        "compile": config["compile"],
+        "link": config["link"],
+        "run": config.get("run", "{output}"),
+        "output": os.path.normpath(os.path.join(workspace_root, output)),
+        "build_dir": build_dir,
+        "root": os.path.normpath(workspace_root),
+    }
+
+
+def object_path(config, source):
+    """源文件对应的中间文件路径，保留相对目录避免同名文件冲突"""
+    relative = os.path.relpath(source, config["root"])
+    if relative.startswith(os.pardir):
+        # 工作区外的源文件按绝对路径存放
+        relative = os.path.splitdrive(os.path.abspath(source))[1].lstrip("\\/")
+    return os.path.join(config["build_dir"], "obj", relative + ".o")
+
+
+def plan_build(config, stamps):
+    """
+    计算需要执行的构建步骤，返回步骤列表，每一步为字典:
+        command  要执行的命令
+        target   生成的文件
+        inputs   输入文件
+        stamp    计划时的戳记；链接步骤为 None，构建完成后按新的中间文件重新计算
+    所有产物都是最新的时返回空列表
+    """
+    steps = []
+    objects = []
+    includes = " ".join("-I" + quote_path(d) for d in config["include_dirs"])
+    for source in config["sources"]:
+        obj = object_path(config, source)
+        objects.append(obj)
+        command = config["compile"].format(source=quote_path(source), object=quote_path(obj), includes=includes)
+        inputs = {source} | find_includes(source, config["include_dirs"])
+        stamp = stamps.make_stamp(command, inputs)
+        if not stamps.is_up_to_date(obj, stamp):
+            steps.append({"command": command, "target": obj, "inputs": inputs, "stamp": stamp})
+
+    output = config["output"]
+    link_command = config["link"].format(objects=" ".join(quote_path(obj) for obj in objects),
+                                         output=quote_path(output))
+    if steps or not stamps.is_up_to_date(output, stamps.make_stamp(link_command, objects)):
+        steps.append({"command": link_command, "target": output, "inputs": set(objects), "stamp": None})
+    return steps
+
+
+def build_command(steps):
+    """把构建步骤合并成一条 shell 命令，任何一步失败就停止"""
+    directories = sorted({os.path.dirname(step["target"]) for step in steps})
+    for directory in directories:
+        os.makedirs(directory, exist_ok=True)
+    return " && ".join(step["command"] for step in steps)
+
+
+def record_build(stamps, steps):
+    """构建成功后记录各产物的戳记"""
+    for step in steps:
+        stamp = step["stamp"] or stamps.make_stamp(step["command"], step["inputs"])
+        stamps.record(step["target"], stamp)
+
+
+def run_command(config):
+    return config["run"].format(output=quote_path(config["output"]))
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+# 代码补全的候选词：当前文档中的标识符(按行统计，编辑时只重新统计变化的行)、工作区符号和 MiniC 关键字
+# 前缀查找用有序数组加二分，排序时考虑出现次数和离光标的距离
+import re
+import time
+import heapq
+from bisect import bisect_left, insort
+
+from my_ide.core.minic_parser import KEYWORDS
+
+IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+# 排序用的加分
+_NEARBY_BONUS = 15      # 出现在光标附近的行中
+_FREQUENCY_CAP = 20     # 出现次数最多计这么多分
+_WORKSPACE_BONUS = 3    # 工作区中定义的符号
+_KEYWORD_BONUS = 2
+
+
+class PrefixIndex:
+    """带计数的有序词表，同一个词可以加入多次，计数减到 0 时删除"""
+    def __init__(self):
+        self.words = []
+        self.counts = {}
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word):
+        count = self.counts.get(word)
+        if count is None:
+            insort(self.words, word)
+            count = 0
+        self.counts[word] = count + 1
+
+    def remove(self, word):
+        count = self.counts.get(word)
+        if count is None:
+            return
+        if count > 1:
+            self.counts[word] = count - 1
+            return
+        del self.counts[word]
+        index = bisect_left(self.words, word)
+        if index < len(self.words) and self.words[index] == word:
+            del self.words[index]
+
+    def with_prefix(self, prefix, limit=None):
+        return words_with_prefix(self.words, prefix, limit)
+
+
+def words_with_prefix(sorted_words, prefix, limit=None):
+    """有序列表中以 prefix 开头的词，按顺序最多取 limit 个"""
+    start = bisect_left(sorted_words, prefix)
+    end = bisect_left(sorted_words, prefix + '\U0010ffff', start)
+    if limit is not None:
+        end = min(end, start + limit)
+    return sorted_words[start:end]
+
+
+class DocumentWords:
+    """
+    文档中每一行的标识符和全部标识符的计数
+    编辑后用 replace_lines 替换变化的行，只需要重新统计这几行
+    """
+    def __init__(self):
+        self.lines = []  # 每行的标识符元组
+        self.index = PrefixIndex()
+
+    def __len__(self):
+        return len(self.lines)
+
+    def replace_lines(self, first, old_count, texts):
+        """把从 first 开始的 old_count 行换成 texts 中的行"""
+        index = self.index
+        for words in self.lines[first:first + old_count]:
+            for word in words:
+                index.remove(word)
+        new_lines = [tuple(IDENTIFIER_RE.findall(text)) for text in texts]
+        for words in new_lines:
+            for word in words:
+                index.add(word)
+        self.lines[first:first + old_count] = new_lines
+
+    def nearby(self, line, radius):
+        """第 line 行(从0开始)前后 radius 行中的标识符"""
+        words = set()
+        for line_words in self.lines[max(0, line - radius):line + radius + 1]:
+            words.update(line_words)
+        return words
+
+
+class CompletionEngine:
+    """
+    合并文档标识符、工作区符号和关键字，返回排好序的补全候选
+    工作区符号为有序的名称列表，由符号索引在后台查询后整体替换
+    """
+    def __init__(self, document_words):
+        self.document = document_words
+        self.workspace_names = []
+        self.keywords = sorted(KEYWORDS)
+
+    def set_workspace_names(self, names):
+        self.workspace_names = names
+
+    def complete(self, prefix, line, limit, budget_ms, nearby_lines=30, workspace_scan=500):
+        """
+        以 prefix 开头的候选词(不含 prefix 本身)，最多 limit 个
+        工作区符号只取前 workspace_scan 个；超过 budget_ms 时停止收集，用已经找到的候选排序返回
+        """
+        deadline = time.perf_counter() + budget_ms / 1000
+        counts = self.document.index.counts
+        nearby = self.document.nearby(line, nearby_lines)
+        scores = {}
+        for i, word in enumerate(self.document.index.with_prefix(prefix)):
+            if i & 255 == 255 and time.perf_counter() > deadline:
+                break
+            scores[word] = min(counts[word], _FREQUENCY_CAP) + (_NEARBY_BONUS if word in nearby else 0)
+        if time.perf_counter() < deadline:
+            for word in words_with_prefix(self.workspace_names, prefix, workspace_scan):
+                scores[word] = scores.get(word, 0) + _WORKSPACE_BONUS
+        for word in words_with_prefix(self.keywords, prefix):
+            scores[word] = scores.get(word, 0) + _KEYWORD_BONUS
+        scores.pop(prefix, None)
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], len(item[0]), item[0]))
+        return [word for word, _ in ranked]
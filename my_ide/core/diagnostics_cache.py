@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+# 诊断结果缓存：按 (文件路径, 内容哈希) 保存，切回没有改动过的文件时直接使用
+# 可以保存到工作区的 .seu_ide 目录，下次打开工作区时继续使用
+import logging
+import os
+import json
+import hashlib
+from collections import OrderedDict
+
+from my_ide.config.settings import WORKSPACE_DATA_DIR, DIAGNOSTICS_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = "diagnostics_cache.json"
+CACHE_VERSION = 1
+
+
+def content_hash(data):
+    """计算文本或字节内容的哈希(十六进制字符串)，用来判断内容是否变化"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def normalize_path(file_path):
+    return os.path.normcase(os.path.abspath(file_path))
+
+
+class DiagnosticsCache:
+    """最近使用的诊断结果，超过上限时丢弃最久没用过的"""
+    def __init__(self, max_entries=DIAGNOSTICS_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (文件路径, 内容哈希) -> 错误列表
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, file_path, content_hash):
+        """命中时返回错误列表的副本，否则返回 None"""
+        key = (normalize_path(file_path), content_hash)
+        errors = self._entries.get(key)
+        if errors is None:
+            return None
+        self._entries.move_to_end(key)
+        return list(errors)
+
+    def put(self, file_path, content_hash, errors):
+        key = (normalize_path(file_path), content_hash)
+        self._entries[key] = list(errors)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._dirty = True
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = False
+
+    @staticmethod
+    def cache_path(workspace_root):
+        return os.path.join(workspace_root, WORKSPACE_DATA_DIR, CACHE_FILE_NAME)
+
+    def load(self, workspace_root):
+        """读取工作区中保存的缓存，文件不存在或格式不对时从空缓存开始"""
+        self.clear()
+        try:
+            with open(self.cache_path(workspace_root), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CACHE_VERSION:
+            return
+        for entry in data.get("entries", []):
+            try:
+                self._entries[(entry["file"], entry["hash"])] = list(entry["errors"])
+            except (KeyError, TypeError):
+                continue
+
+    def save(self, workspace_root):
+        """有变化时写回工作区"""
+        if not self._dirty:
+            return
+        path = self.cache_path(workspace_root)
+        data = {
+            "version": CACHE_VERSION,
+            "entries": [
+                {"file": file_path, "hash": content_hash, "errors": errors}
+                for (file_path, content_hash), errors in self._entries.items()
+            ],
+        }
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 先写临时文件再替换，避免写到一半时留下损坏的缓存
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logger.error("保存诊断缓存失败: %s", e)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# 编译器与IDE之间的诊断协议
+# 流式格式(JSON Lines)：编译器每发现一个错误就输出一行 JSON 对象，最后可选输出 {"errorCount": n}
+#   {"line": 3, "message": "syntax error, unexpected RC", "actual": "}", "expected": ["SEMI"]}
+# 旧格式：整个输出是一个 JSON 文档 {"errors": [...], "errorCount": n}，作为兜底继续支持
+import json
+
+
+def normalize_error(obj):
+    """把编译器给出的错误对象整理成问题面板使用的格式"""
+    try:
+        line = int(obj.get("line", 1))
+    except (TypeError, ValueError):
+        line = 1
+    error = {
+        "line": line,
+        "message": str(obj.get("message", "Unknown Error")),
+        "actual": obj.get("actual", ""),
+        "expected": list(obj.get("expected", []) or []),
+    }
+    # 可选字段
+    for key in ("file", "column", "severity"):
+        if key in obj:
+            error[key] = obj[key]
+    return error
+
+
+def parse_diagnostic_line(line):
+    """解析一行 JSON Lines 输出，不是诊断(空行、结束标记、普通文本)时返回 None"""
+    line = line.strip()
+    if not line.startswith('{'):
+        return None
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(obj, dict) or "message" not in obj:
+        return None
+    return normalize_error(obj)
+
+
+def parse_error_document(raw):
+    """解析旧格式的整体 JSON 文档，返回错误列表"""
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    data = json.loads(raw)
+    return [normalize_error(error) for error in data.get("errors", [])]
+
+
+def encode_diagnostic(error):
+    """编译器端使用：把一个错误编码为一行"""
+    return json.dumps(error, ensure_ascii=False)
+
+
+class JsonLinesDecoder:
+    """
+    增量解码编译器的标准输出
+    feed 传入任意切分的字节块，返回其中已经完整的诊断
+    输出里没有任何 JSON Lines 诊断时，finish 会尝试按旧的整体文档格式解析
+    """
+    def __init__(self):
+        self._pending = b""
+        self._other_lines = []   # 不是诊断的行，留给旧格式兜底
+        self.diagnostic_count = 0
+
+    def feed(self, data):
+        self._pending += data
+        lines = self._pending.split(b"\n")
+        self._pending = lines.pop()
+        return self._decode_lines(lines)
+
+    def finish(self):
+        diagnostics = []
+        if self._pending:
+            diagnostics = self._decode_lines([self._pending])
+            self._pending = b""
+        if self.diagnostic_count == 0 and self._other_lines:
+            try:
+                diagnostics = parse_error_document(b"\n".join(self._other_lines))
+            except (ValueError, AttributeError):
+                diagnostics = []
+            self.diagnostic_count = len(diagnostics)
+        self._other_lines = []
+        return diagnostics
+
+    def _decode_lines(self, lines):
+        diagnostics = []
+        for raw_line in lines:
+            line = raw_line.decode('utf-8', errors='replace')
+            error = parse_diagnostic_line(line)
+            if error is None:
+                if self.diagnostic_count == 0:
+                    self._other_lines.append(raw_line)
+                continue
+            diagnostics.append(error)
+        self.diagnostic_count += len(diagnostics)
+        return diagnostics
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# 目录遍历的公共部分：统一的忽略规则和排序，文件树和工作区文件清单共用
+import os
+
+from my_ide.config.settings import ignored_dirs, ignored_exts
+
+
+def is_ignored_dir(name):
+    return name in ignored_dirs
+
+
+def is_ignored_file(name):
+    return os.path.splitext(name)[1] in ignored_exts
+
+
+def sort_key(entry):
+    """文件夹在前，按名称排序(不区分大小写)"""
+    name, is_dir = entry
+    return (not is_dir, name.casefold(), name)
+
+
+def scan_directory(path):
+    """
+    列出一个目录的直接子项，跳过忽略的目录和文件
+    返回排好序的 [(名称, 是否为目录)]，目录无法读取时返回空列表
+    """
+    entries = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if is_ignored_dir(entry.name):
+                        continue
+                elif is_ignored_file(entry.name):
+                    continue
+                entries.append((entry.name, is_dir))
+    except OSError:
+        return []
+    entries.sort(key=sort_key)
+    return entries
+
+
+def scan_directory_stat(path):
+    """
+    列出一个目录的直接子项并读取文件的大小和修改时间，跳过忽略的目录和文件
+    返回 ([(文件名, 大小, 修改时间)], [子目录名])，不排序；目录无法读取时返回两个空列表
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not is_ignored_dir(entry.name):
+                            subdirs.append(entry.name)
+                        continue
+                    if is_ignored_file(entry.name):
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                files.append((entry.name, st.st_size, st.st_mtime))
+    except OSError:
+        return [], []
+    return files, subdirs
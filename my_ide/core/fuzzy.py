@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+# 快速打开使用的模糊匹配：查询中的字符按顺序出现在路径中即为匹配
+# 文件名中的连续匹配排在前面，其次是文件名中的子序列，最后是只在目录部分匹配的路径
+import re
+import time
+
+# 子序列检查交给 re 在 C 中完成，每个字符用否定字符类跳过，不会回溯
+def _subsequence_regex(query, line_prefix=""):
+    parts = []
+    for ch in query:
+        escaped = re.escape(ch)
+        parts.append(f"[^{escaped}\\n]*{escaped}")
+    return re.compile(line_prefix + "".join(parts))
+
+
+def fuzzy_score(query, path):
+    """
+    计算一个路径的得分(越大越好)，不匹配时返回 None
+    查询字符优先贪心匹配文件名，连续匹配、单词开头的匹配加分
+    """
+    query = query.lower()
+    lower = path.lower()
+    base_start = max(lower.rfind('/'), lower.rfind('\\')) + 1
+    score = 0
+    position = len(lower)
+    previous = None
+    # 从后往前匹配，尽量让字符落在文件名里
+    for ch in reversed(query):
+        position = lower.rfind(ch, 0, position)
+        if position < 0:
+            return None
+        if position >= base_start:
+            score += 2
+        if position == 0 or lower[position - 1] in "/\\_-. ":
+            score += 3
+        if previous is not None and previous == position + 1:
+            score += 4
+        previous = position
+    return score * 100 - len(path)
+
+
+class _Scan:
+    """一次查询的扫描进度，超出时间预算时保存下来，之后继续"""
+    __slots__ = ("query", "indices", "position", "tiers", "matches", "stopped")
+
+    def __init__(self, query, indices):
+        self.query = query
+        self.indices = indices  # 要扫描的路径编号，None 表示全部
+        self.position = 0       # 下一个要扫描的分块
+        self.tiers = ([], [], [], [])
+        self.matches = []
+        self.stopped = False    # 第 0 级结果已经足够，后面的分块不用再扫描
+
+
+class FuzzyFileMatcher:
+    """
+    在大量相对路径中做模糊匹配，返回得分最高的若干个
+    路径按长度排序后分块匹配，已经找到足够多文件名以查询开头的结果时提前结束；
+    给出时间预算时超时后先返回已扫描部分的结果，之后用 finish 扫描剩下的分块；
+    完整匹配过一次后，延续上一次查询的输入只在上一次的结果中继续过滤
+    """
+    def __init__(self, paths, chunk_size=2048):
+        # 短路径排在前面，同一级别中先出现的就是更好的结果
+        self.paths = sorted(paths, key=lambda path: (len(path), path))
+        lower = [path.lower() for path in self.paths]
+        self._base = [path[max(path.rfind('/'), path.rfind('\\')) + 1:] for path in lower]
+        # 每行为 "\n编号\t小写路径"，用一次正则扫描找出匹配的行
+        # 模式以字面量 \n 开头时 re 可以快速跳到下一行，比 MULTILINE 的 ^ 快
+        self._lines = [f"\n{i}\t{path}" for i, path in enumerate(lower)]
+        self._chunk_size = chunk_size
+        # 全部路径按分块拼接好的文本，每块扫描一次约 1 ms，每块结束时检查时间预算
+        self._chunks = ["".join(self._lines[start:start + chunk_size])
+                        for start in range(0, len(self._lines), chunk_size)]
+        self._last_query = None
+        self._last_matches = None  # 上一次查询的全部匹配编号，没有扫描完时为 None
+        self._scan = None
+
+    def __len__(self):
+        return len(self.paths)
+
+    def match(self, query, limit=50, is_cancelled=None, budget_ms=None):
+        """
+        返回 [(得分, 路径)]，按得分从高到低；被取消时返回 None
+        超过 budget_ms 时返回已扫描部分的结果，is_complete() 为 False，之后调用 finish 得到完整结果
+        """
+        query = "".join(query.lower().split())
+        if not query:
+            self._scan = None
+            return []
+        if self._last_matches is not None and query.startswith(self._last_query):
+            # 增量过滤：新结果一定是上一次结果的子集
+            scan = _Scan(query, self._last_matches)
+        else:
+            scan = _Scan(query, None)
+        self._last_query = query
+        self._last_matches = None
+        self._scan = scan
+        deadline = None if budget_ms is None else time.perf_counter() + budget_ms / 1000
+        if not self._run(scan, limit, is_cancelled, deadline):
+            return None
+        return self._rank(scan, limit)
+
+    def is_complete(self):
+        """上一次查询是否已经扫描完(或者提前结束)，结果不会再变化"""
+        scan = self._scan
+        return scan is None or scan.stopped or scan.position >= self._chunk_count(scan)
+
+    def finish(self, limit=50, is_cancelled=None):
+        """扫描上一次查询剩下的分块，返回完整结果；被取消时返回 None"""
+        scan = self._scan
+        if scan is None:
+            return []
+        if not self._run(scan, limit, is_cancelled, None):
+            return None
+        return self._rank(scan, limit)
+
+    def _chunk_count(self, scan):
+        if scan.indices is None:
+            return len(self._chunks)
+        return (len(scan.indices) + self._chunk_size - 1) // self._chunk_size
+
+    def _chunk_text(self, scan, position):
+        if scan.indices is None:
+            return self._chunks[position]
+        start = position * self._chunk_size
+        lines = self._lines
+        return "".join([lines[i] for i in scan.indices[start:start + self._chunk_size]])
+
+    def _run(self, scan, limit, is_cancelled, deadline):
+        """从 scan.position 开始逐块扫描，超过 deadline 时停下；被取消时返回 False"""
+        query = scan.query
+        # 分级：0 文件名以查询开头，1 文件名包含查询，2 文件名为子序列，3 只在完整路径中为子序列
+        line_regex = _subsequence_regex(query, r"\n(\d+)\t")
+        base_regex = _subsequence_regex(query)
+        base = self._base
+        tiers = scan.tiers
+        matches = scan.matches
+        count = self._chunk_count(scan)
+        while not scan.stopped and scan.position < count:
+            if is_cancelled and is_cancelled():
+                return False
+            text = self._chunk_text(scan, scan.position)
+            scan.position += 1
+            for found in line_regex.finditer(text):
+                i = int(found.group(1))
+                matches.append(i)
+                name = base[i]
+                if query in name:
+                    tiers[0 if name.startswith(query) else 1].append(i)
+                elif base_regex.match(name):
+                    tiers[2].append(i)
+                else:
+                    tiers[3].append(i)
+                # 后面的路径更长，不可能再超过已经找到的第 0 级结果
+                if len(tiers[0]) >= limit:
+                    scan.stopped = True
+                    break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        if scan.position >= count and not scan.stopped and scan is self._scan:
+            self._last_matches = matches
+        return True
+
+    def _rank(self, scan, limit):
+        # 精排：只对每一级最靠前的候选计算完整得分
+        scored = []
+        for tier, indices in enumerate(scan.tiers):
+            for i in indices[:limit]:
+                score = fuzzy_score(scan.query, self.paths[i])
+                if score is not None:
+                    scored.append(((3 - tier) * 1000000 + score, self.paths[i]))
+            if len(scored) >= limit:
+                break
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored[:limit]
+
+    def prepare_next(self, is_cancelled=None):
+        """
+        上一次查询提前结束时，补全它的全部匹配，下一次按键就可以只在其中过滤
+        在两次按键之间的空闲时间调用；被取消时返回 False
+        """
+        scan = self._scan
+        if self._last_matches is not None or scan is None:
+            return True
+        if not self.is_complete():
+            # 超过时间预算没有扫描完的查询由 finish 继续
+            return True
+        query = scan.query
+        line_regex = _subsequence_regex(query, r"\n(\d+)\t")
+        matches = []
+        for position in range(self._chunk_count(scan)):
+            if is_cancelled and is_cancelled():
+                return False
+            matches.extend(map(int, line_regex.findall(self._chunk_text(scan, position))))
+        if self._scan is scan:
+            self._last_matches = matches
+        return True
+
+    def reset(self):
+        """清空增量过滤的状态，下一次查询重新全量匹配"""
+        self._last_query = None
+        self._last_matches = None
+        self._scan = None
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# 滚动的延迟直方图：按固定的桶统计最近一段时间内的事件循环延迟
+import time
+from bisect import bisect_left
+
+# 桶的上界(毫秒)，最后一个桶收集超过 5 秒的延迟
+DEFAULT_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+
+class LatencyHistogram:
+    """
+    把时间分成 window_seconds 长的窗口，保留最近 windows 个窗口的计数
+    旧窗口过期后整体清零，不需要逐条删除样本
+    """
+    def __init__(self, bounds=DEFAULT_BOUNDS_MS, window_seconds=10, windows=60, clock=time.monotonic):
+        self.bounds = tuple(bounds)
+        self.window_seconds = window_seconds
+        self.windows = windows
+        self._clock = clock
+        self._counts = [[0] * len(self.bounds) for _ in range(windows)]
+        self._max = [0.0] * windows
+        self._window_ids = [None] * windows  # 每个槽位当前对应的窗口编号
+
+    def _slot(self, now):
+        window_id = int(now // self.window_seconds)
+        slot = window_id % self.windows
+        if self._window_ids[slot] != window_id:
+            self._counts[slot] = [0] * len(self.bounds)
+            self._max[slot] = 0.0
+            self._window_ids[slot] = window_id
+        return slot
+
+    def add(self, latency_ms, now=None):
+        now = self._clock() if now is None else now
+        slot = self._slot(now)
+        self._counts[slot][bisect_left(self.bounds, latency_ms)] += 1
+        if latency_ms > self._max[slot]:
+            self._max[slot] = latency_ms
+
+    def _live_slots(self, now):
+        oldest = int(now // self.window_seconds) - self.windows + 1
+        return [slot for slot, window_id in enumerate(self._window_ids)
+                if window_id is not None and window_id >= oldest]
+
+    def counts(self, now=None):
+        """最近一段时间内每个桶的样本数"""
+        now = self._clock() if now is None else now
+        totals = [0] * len(self.bounds)
+        for slot in self._live_slots(now):
+            for i, count in enumerate(self._counts[slot]):
+                totals[i] += count
+        return totals
+
+    def max(self, now=None):
+        now = self._clock() if now is None else now
+        return max((self._max[slot] for slot in self._live_slots(now)), default=0.0)
+
+    def percentile(self, p, now=None):
+        """p 分位数所在桶的上界(毫秒)，没有样本时返回 0"""
+        counts = self.counts(now)
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = p / 100 * total
+        seen = 0
+        for bound, count in zip(self.bounds, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def clear(self):
+        self.__init__(self.bounds, self.window_seconds, self.windows, self._clock)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# 日志配置：各模块使用 logging.getLogger(__name__)，记录统一交给 my_ide 这个根日志器
+# 调用线程只做级别判断、限流和入队，格式化和写出都在 QueueListener 的后台线程中进行
+import sys
+import queue
+import logging
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener
+
+from my_ide.config.settings import (LOG_LEVEL, LOG_FORMAT, LOG_RATE_LIMIT_WINDOW_S,
+                                    LOG_RATE_LIMIT_BURST, LOG_VIEWER_MAX_RECORDS)
+
+ROOT_LOGGER = "my_ide"
+
+_listener = None
+_ring_handler = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    同一处日志(文件、行号、级别)在 window 秒内最多放行 burst 条，之后的只计数
+    下一个窗口第一条放行的记录带上 suppressed 属性，输出时附上省略的条数
+    """
+    MAX_KEYS = 10000
+
+    def __init__(self, burst=LOG_RATE_LIMIT_BURST, window=LOG_RATE_LIMIT_WINDOW_S):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._state = {}  # 位置 -> [窗口开始时间, 已放行条数, 已省略条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        key = (record.pathname, record.lineno, record.levelno)
+        now = record.created
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                if state is not None and state[2]:
+                    record.suppressed = state[2]
+                if len(self._state) >= self.MAX_KEYS:
+                    self._state.clear()
+                self._state[key] = [now, 1, 0]
+                return True
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+class LogFormatter(logging.Formatter):
+    """在消息后面附上被限流省略的条数"""
+    def format(self, record):
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            text += f" (之前省略了 {suppressed} 条相同位置的日志)"
+        return text
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """不在调用线程中格式化，原样把记录交给后台线程"""
+    def prepare(self, record):
+        return record
+
+
+class LogRingHandler(logging.Handler):
+    """
+    保存最近的日志供日志面板显示，在后台线程中调用
+    每条记录为 (序号, 级别, 格式化后的文本)，序号递增，面板据此只取新增的记录
+    """
+    def __init__(self, capacity=LOG_VIEWER_MAX_RECORDS):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+        self.count = 0
+
+    def emit(self, record):
+        try:
+            text = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            self.count += 1
+            self.records.append((self.count, record.levelno, text))
+
+    def since(self, serial=0):
+        """序号大于 serial 的记录"""
+        with self.lock:
+            if self.count <= serial:
+                return []
+            return [entry for entry in self.records if entry[0] > serial]
+
+
+def setup_logging(level=LOG_LEVEL):
+    """配置根日志器并启动后台线程，重复调用时直接返回"""
+    global _listener, _ring_handler
+    if _listener is not None:
+        return _ring_handler
+    formatter = LogFormatter(LOG_FORMAT)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+    _ring_handler = LogRingHandler()
+    _ring_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    root.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, _ring_handler, respect_handler_level=True)
+    _listener.start()
+    return _ring_handler
+
+
+def ring_handler():
+    return _ring_handler
+
+
+def set_level(level):
+    logging.getLogger(ROOT_LOGGER).setLevel(level)
+
+
+def shutdown_logging():
+    """写完队列中剩余的日志后停止后台线程"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
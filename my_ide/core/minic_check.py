@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# MiniC 命令行检查器，按诊断协议输出错误
+# 用法: python -m my_ide.core.minic_check [--stdin] [--format jsonl|json] FILE
+#   --stdin  从标准输入读取源码(编辑器中未保存的内容)，FILE 只用来标识文件
+#       python -m my_ide.core.minic_check --daemon
+#   --daemon 常驻模式，每行读取一个请求，每行返回一个响应:
+#       请求 {"id": 1, "file": "a.mc", "content_hash": "...", "text": "..."}
+#       响应 {"id": 1, "file": "a.mc", "content_hash": "...", "errors": [...]}
+#       请求 {"command": "shutdown"} 退出
+import sys
+import json
+import argparse
+from collections import OrderedDict
+
+from my_ide.core.minic_parser import MiniCChecker
+from my_ide.core.diagnostics_protocol import encode_diagnostic
+from my_ide.core.diagnostics_cache import content_hash
+
+
+# 常驻模式最多保留多少个文件的解析结果
+DAEMON_MAX_FILES = 64
+
+
+def check_file(file_path):
+    """
+    检查磁盘上的一个文件，供工作区检查的进程池调用
+    返回 (文件路径, 内容哈希, 错误列表)，文件读取失败时错误列表为 None
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        return file_path, None, None
+    # 和编辑器中的文本一致：统一换行符后再计算哈希，才能和诊断缓存对上
+    text = raw.decode('utf-8', errors='replace').replace('\r\n', '\n')
+    return file_path, content_hash(text), MiniCChecker().check(text)
+
+
+def serve(stdin, stdout):
+    """
+    常驻模式的主循环，stdin/stdout 为二进制流
+    每个文件保留一个 MiniCChecker，未变化的顶层声明在请求之间复用；
+    内容哈希和上次相同时直接返回上次的结果
+    """
+    checkers = OrderedDict()  # 文件 -> (MiniCChecker, 内容哈希, 错误列表)
+    for raw_line in iter(stdin.readline, b""):
+        try:
+            request = json.loads(raw_line)
+        except ValueError:
+            stdout.write(b'{"error": "bad request"}\n')
+            stdout.flush()
+            continue
+        if request.get("command") == "shutdown":
+            break
+        file_path = request.get("file", "")
+        content_hash = request.get("content_hash")
+        entry = checkers.pop(file_path, None)
+        if entry and content_hash and entry[1] == content_hash:
+            errors = entry[2]
+        else:
+            checker = entry[0] if entry else MiniCChecker()
+            try:
+                errors = checker.check(request.get("text", ""))
+            except Exception as e:
+                # 检查器自身出错时不退出，丢弃这个文件的缓存
+                response = {"id": request.get("id"), "file": file_path, "error": str(e), "errors": []}
+                stdout.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                stdout.flush()
+                continue
+            entry = (checker, content_hash, errors)
+        checkers[file_path] = entry
+        while len(checkers) > DAEMON_MAX_FILES:
+            checkers.popitem(last=False)
+        response = {"id": request.get("id"), "file": file_path, "content_hash": content_hash, "errors": errors}
+        stdout.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+        stdout.flush()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="MiniC 语法检查")
+    parser.add_argument("file", nargs="?")
+    parser.add_argument("--stdin", action="store_true", help="从标准输入读取源码")
+    parser.add_argument("--format", choices=["jsonl", "json"], default="jsonl")
+    parser.add_argument("--daemon", action="store_true", help="常驻模式，按行处理检查请求")
+    args = parser.parse_args(argv)
+
+    if args.daemon:
+        return serve(sys.stdin.buffer, sys.stdout.buffer)
+    if not args.file:
+        parser.error("需要指定文件")
+
+    if args.stdin:
+        text = sys.stdin.buffer.read().decode('utf-8', errors='replace')
+    else:
+        with open(args.file, 'r', encoding='utf-8', errors='replace') as f:
+            text = f.read()
+
+    out = sys.stdout
+    checker = MiniCChecker()
+    if args.format == "json":
+        # 旧格式：全部检查完后输出一个文档
+        errors = checker.check(text)
+        json.dump({"errors": errors, "errorCount": len(errors)}, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+        return 1 if errors else 0
+
+    # 流式格式：每个顶层声明检查完就把其中的错误写出去
+    count = 0
+    for chunk_errors in checker.iter_chunk_errors(text):
+        for error in chunk_errors:
+            out.write(encode_diagnostic(dict(error, file=args.file)) + "\n")
+            count += 1
+        if chunk_errors:
+            out.flush()
+    out.write(json.dumps({"errorCount": count}) + "\n")
+    out.flush()
+    return 1 if count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
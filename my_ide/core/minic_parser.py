@@ -0,0 +1,502 @@
+# -*- coding: utf-8 -*-
+# MiniC 语法检查：词法分析 + 递归下降语法分析，不依赖Qt，方便在后台线程里运行
+# 错误格式和外部编译器输出的 error_missing_brace.json 相同: line, message, actual, expected
+import os
+import re
+from collections import namedtuple
+
+from my_ide.config.settings import MINIC_EXTS
+
+Token = namedtuple("Token", ["kind", "text", "line"])
+PositionedToken = namedtuple("PositionedToken", ["kind", "text", "line", "column"])
+
+KEYWORDS = {
+    'int': 'TYPE', 'float': 'TYPE', 'char': 'TYPE', 'void': 'TYPE', 'double': 'TYPE',
+    'long': 'TYPE', 'short': 'TYPE', 'unsigned': 'TYPE', 'signed': 'TYPE',
+    'const': 'QUALIFIER', 'static': 'QUALIFIER', 'extern': 'QUALIFIER',
+    'struct': 'STRUCT', 'if': 'IF', 'else': 'ELSE', 'while': 'WHILE', 'for': 'FOR', 'do': 'DO',
+    'return': 'RETURN', 'break': 'BREAK', 'continue': 'CONTINUE',
+}
+
+OPERATORS = {
+    ';': 'SEMI', ',': 'COMMA', '(': 'LP', ')': 'RP', '[': 'LB', ']': 'RB', '{': 'LC', '}': 'RC',
+    '=': 'ASSIGNOP', '+=': 'ASSIGNOP', '-=': 'ASSIGNOP', '*=': 'ASSIGNOP', '/=': 'ASSIGNOP',
+    '%=': 'ASSIGNOP', '<<=': 'ASSIGNOP', '>>=': 'ASSIGNOP', '&=': 'ASSIGNOP', '|=': 'ASSIGNOP', '^=': 'ASSIGNOP',
+    '||': 'OR', '&&': 'AND', '!': 'NOT', '|': 'BITOR', '^': 'BITXOR', '&': 'BITAND', '~': 'BITNOT',
+    '<': 'RELOP', '>': 'RELOP', '<=': 'RELOP', '>=': 'RELOP', '==': 'RELOP', '!=': 'RELOP',
+    '<<': 'SHIFT', '>>': 'SHIFT',
+    '+': 'PLUS', '-': 'MINUS', '*': 'STAR', '/': 'DIV', '%': 'MOD',
+    '++': 'INC', '--': 'DEC', '.': 'DOT', '->': 'ARROW', '?': 'QUESTION', ':': 'COLON',
+}
+
+# 二元运算符优先级，数字越大结合越紧
+BINARY_PRECEDENCE = {
+    'OR': 1, 'AND': 2, 'BITOR': 3, 'BITXOR': 4, 'BITAND': 5, 'RELOP': 6, 'SHIFT': 7,
+    'PLUS': 8, 'MINUS': 8, 'STAR': 9, 'DIV': 9, 'MOD': 9,
+}
+UNARY_OPERATORS = {'NOT', 'MINUS', 'PLUS', 'INC', 'DEC', 'STAR', 'BITAND', 'BITNOT'}
+DECLARATION_START = {'TYPE', 'STRUCT', 'QUALIFIER'}
+
+_TOKEN_RE = re.compile(r"""
+    (?P<COMMENT>//[^\n]*|/\*[\s\S]*?\*/)
+  | (?P<BAD_COMMENT>/\*[\s\S]*)
+  | (?P<PREPROC>\#[^\n]*)
+  | (?P<WS>\s+)
+  | (?P<FLOAT_CONST>\d+\.\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?|\d+[eE][+-]?\d+)
+  | (?P<INT_CONST>0[xX][0-9a-fA-F]+|\d+)
+  | (?P<CHAR_CONST>'(?:\\.|[^'\\\n])+')
+  | (?P<STRING>"(?:\\.|[^"\\\n])*")
+  | (?P<ID>[A-Za-z_]\w*)
+  | (?P<OP><<=|>>=|->|\+\+|--|&&|\|\||<=|>=|==|!=|<<|>>|[-+*/%&|^]=|[-+*/%<>=!&|^~?:.,;()\[\]{}])
+  | (?P<MISMATCH>.)
+""", re.VERBOSE)
+
+# 切分顶层声明时只关心括号、分号，注释/字符串/预处理行需要整体跳过
+_SPLIT_RE = re.compile(r"""
+    //[^\n]*|/\*[\s\S]*?(?:\*/|\Z)
+  | "(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?
+  | ^[ \t]*\#[^\n]*
+  | [{}();]
+""", re.VERBOSE | re.MULTILINE)
+
+
+def is_minic_file(file_path):
+    """根据后缀判断是否使用内置的 MiniC 检查"""
+    return bool(file_path) and os.path.splitext(file_path)[1] in MINIC_EXTS
+
+
+class MiniCSyntaxError(Exception):
+    def __init__(self, token, expected):
+        super().__init__(token.text)
+        self.token = token
+        self.expected = list(expected)
+
+    def to_error(self):
+        actual = self.token.text if self.token.kind != 'EOF' else 'EOF'
+        message = f"syntax error, unexpected {self.token.kind}"
+        if self.expected:
+            message += f", expecting {' or '.join(self.expected)}"
+        return {"line": self.token.line, "message": message, "actual": actual, "expected": self.expected}
+
+
+def tokenize(text, first_line=1):
+    """
+    把源码切分成 Token 列表，末尾带一个 EOF
+    无法识别的字符作为 MISMATCH 保留，由语法分析报告
+    """
+    tokens = []
+    line = first_line
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'ID':
+            tokens.append(Token(KEYWORDS.get(value, 'ID'), value, line))
+        elif kind == 'OP':
+            tokens.append(Token(OPERATORS[value], value, line))
+        elif kind not in ('WS', 'COMMENT', 'PREPROC'):
+            tokens.append(Token(kind, value, line))
+        line += value.count('\n')
+    tokens.append(Token('EOF', '', line))
+    return tokens
+
+
+def tokenize_positions(text):
+    """
+    和 tokenize 相同，但每个 Token 还带列号(从0开始)，末尾没有 EOF
+    供符号索引等需要定位到标识符的地方使用
+    """
+    tokens = []
+    line = 1
+    line_start = 0
+    for match in _TOKEN_RE.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'ID':
+            tokens.append(PositionedToken(KEYWORDS.get(value, 'ID'), value, line, match.start() - line_start))
+        elif kind == 'OP':
+            tokens.append(PositionedToken(OPERATORS[value], value, line, match.start() - line_start))
+        elif kind not in ('WS', 'COMMENT', 'PREPROC'):
+            tokens.append(PositionedToken(kind, value, line, match.start() - line_start))
+        newlines = value.count('\n')
+        if newlines:
+            line += newlines
+            line_start = match.start() + value.rindex('\n') + 1
+    return tokens
+
+
+def split_top_level(text):
+    """
+    按顶层声明把源码切成连续的片段，返回 (start, end) 列表
+    函数定义在右花括号处结束，其余声明(包括结构体定义)在分号处结束
+    """
+    spans = []
+    start = 0
+    depth = 0
+    header_has_paren = False   # 当前声明在第一个 '{' 之前是否出现过 '('
+    brace_is_function = False
+    for match in _SPLIT_RE.finditer(text):
+        ch = match.group()
+        if ch == '{':
+            if depth == 0:
+                brace_is_function = header_has_paren
+            depth += 1
+        elif ch == '}':
+            if depth == 0:
+                # 多余的右花括号单独切开，由语法分析报告错误
+                spans.append((start, match.end()))
+                start = match.end()
+                header_has_paren = False
+                continue
+            depth -= 1
+            if depth == 0 and brace_is_function:
+                spans.append((start, match.end()))
+                start = match.end()
+                header_has_paren = False
+        elif ch == ';':
+            if depth == 0:
+                spans.append((start, match.end()))
+                start = match.end()
+                header_has_paren = False
+        elif ch == '(':
+            if depth == 0:
+                header_has_paren = True
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+class MiniCParser:
+    """
+    递归下降语法分析，遇到第一个错误即停止(和bison不做错误恢复时一致)
+    """
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    # --- 基础操作 ---
+    def peek(self, offset=0):
+        index = min(self.pos + offset, len(self.tokens) - 1)
+        return self.tokens[index]
+
+    def advance(self):
+        token = self.tokens[self.pos]
+        if token.kind != 'EOF':
+            self.pos += 1
+        return token
+
+    def accept(self, kind):
+        if self.tokens[self.pos].kind == kind:
+            return self.advance()
+        return None
+
+    def expect(self, *kinds):
+        token = self.tokens[self.pos]
+        if token.kind in kinds:
+            return self.advance()
+        raise MiniCSyntaxError(token, kinds)
+
+    # --- 声明 ---
+    def parse_program(self):
+        while self.peek().kind != 'EOF':
+            self.parse_external()
+
+    def parse_specifier(self):
+        while self.accept('QUALIFIER'):
+            pass
+        if self.accept('STRUCT'):
+            has_name = self.accept('ID')
+            if self.peek().kind == 'LC':
+                self.parse_struct_body()
+            elif not has_name:
+                self.expect('ID', 'LC')
+        else:
+            self.expect('TYPE', 'STRUCT')
+            while self.accept('TYPE') or self.accept('QUALIFIER'):
+                pass
+        while self.accept('QUALIFIER'):
+            pass
+
+    def parse_struct_body(self):
+        self.expect('LC')
+        while self.peek().kind != 'RC':
+            if self.peek().kind not in DECLARATION_START:
+                raise MiniCSyntaxError(self.peek(), ['TYPE', 'STRUCT', 'RC'])
+            self.parse_specifier()
+            self.parse_declarator()
+            while self.accept('COMMA'):
+                self.parse_declarator()
+            self.expect('SEMI')
+        self.expect('RC')
+
+    def parse_declarator(self):
+        while self.accept('STAR') or self.accept('QUALIFIER'):
+            pass
+        name = self.expect('ID')
+        while self.accept('LB'):
+            if self.peek().kind != 'RB':
+                self.parse_conditional()
+            self.expect('RB')
+        return name
+
+    def parse_external(self):
+        self.parse_specifier()
+        if self.accept('SEMI'):
+            return  # struct S {...};
+        self.parse_declarator()
+        if self.accept('LP'):
+            self.parse_parameters()
+            if self.peek().kind == 'LC':
+                self.parse_compound()
+                return
+            self.expect('SEMI', 'LC')
+            return
+        self.parse_init_declarator_rest()
+
+    def parse_init_declarator_rest(self):
+        """声明符之后的初值和逗号分隔的其余部分，直到分号"""
+        while True:
+            if self.accept('ASSIGNOP'):
+                self.parse_initializer()
+            if not self.accept('COMMA'):
+                break
+            self.parse_declarator()
+        self.expect('SEMI', 'COMMA', 'ASSIGNOP')
+
+    def parse_parameters(self):
+        if self.accept('RP'):
+            return
+        if self.peek().kind == 'TYPE' and self.peek().text == 'void' and self.peek(1).kind == 'RP':
+            self.advance()
+            self.advance()
+            return
+        while True:
+            self.parse_specifier()
+            if self.peek().kind in ('STAR', 'ID'):
+                self.parse_declarator()
+            if not self.accept('COMMA'):
+                break
+        self.expect('RP', 'COMMA')
+
+    def parse_initializer(self):
+        if self.accept('LC'):
+            if self.peek().kind != 'RC':
+                self.parse_initializer()
+                while self.accept('COMMA'):
+                    if self.peek().kind == 'RC':
+                        break
+                    self.parse_initializer()
+            self.expect('RC', 'COMMA')
+        else:
+            self.parse_assignment()
+
+    def parse_local_declaration(self):
+        self.parse_specifier()
+        if self.accept('SEMI'):
+            return
+        self.parse_declarator()
+        self.parse_init_declarator_rest()
+
+    # --- 语句 ---
+    def parse_compound(self):
+        self.expect('LC')
+        while self.peek().kind != 'RC':
+            if self.peek().kind == 'EOF':
+                raise MiniCSyntaxError(self.peek(), ['RC'])
+            if self.peek().kind in DECLARATION_START:
+                self.parse_local_declaration()
+            else:
+                self.parse_statement()
+        self.expect('RC')
+
+    def parse_statement(self):
+        kind = self.peek().kind
+        if kind == 'LC':
+            self.parse_compound()
+        elif kind == 'IF':
+            self.advance()
+            self.parse_condition()
+            self.parse_statement()
+            if self.accept('ELSE'):
+                self.parse_statement()
+        elif kind == 'WHILE':
+            self.advance()
+            self.parse_condition()
+            self.parse_statement()
+        elif kind == 'DO':
+            self.advance()
+            self.parse_statement()
+            self.expect('WHILE')
+            self.parse_condition()
+            self.expect('SEMI')
+        elif kind == 'FOR':
+            self.advance()
+            self.expect('LP')
+            if self.peek().kind in DECLARATION_START:
+                self.parse_local_declaration()
+            else:
+                if self.peek().kind != 'SEMI':
+                    self.parse_expression()
+                self.expect('SEMI')
+            if self.peek().kind != 'SEMI':
+                self.parse_expression()
+            self.expect('SEMI')
+            if self.peek().kind != 'RP':
+                self.parse_expression()
+            self.expect('RP')
+            self.parse_statement()
+        elif kind == 'RETURN':
+            self.advance()
+            if self.peek().kind != 'SEMI':
+                self.parse_expression()
+            self.expect('SEMI')
+        elif kind in ('BREAK', 'CONTINUE'):
+            self.advance()
+            self.expect('SEMI')
+        elif kind == 'SEMI':
+            self.advance()
+        else:
+            self.parse_expression()
+            self.expect('SEMI')
+
+    def parse_condition(self):
+        self.expect('LP')
+        self.parse_expression()
+        self.expect('RP')
+
+    # --- 表达式 ---
+    def parse_expression(self):
+        self.parse_assignment()
+        while self.accept('COMMA'):
+            self.parse_assignment()
+
+    def parse_assignment(self):
+        self.parse_conditional()
+        if self.accept('ASSIGNOP'):
+            self.parse_assignment()
+
+    def parse_conditional(self):
+        self.parse_binary(1)
+        if self.accept('QUESTION'):
+            self.parse_expression()
+            self.expect('COLON')
+            self.parse_conditional()
+
+    def parse_binary(self, min_precedence):
+        self.parse_unary()
+        while True:
+            precedence = BINARY_PRECEDENCE.get(self.peek().kind)
+            if precedence is None or precedence < min_precedence:
+                return
+            self.advance()
+            self.parse_binary(precedence + 1)
+
+    def parse_unary(self):
+        kind = self.peek().kind
+        if kind in UNARY_OPERATORS:
+            self.advance()
+            self.parse_unary()
+        elif kind == 'LP' and self.peek(1).kind in DECLARATION_START:
+            # 类型转换 (int)x
+            self.advance()
+            self.parse_specifier()
+            while self.accept('STAR'):
+                pass
+            self.expect('RP')
+            self.parse_unary()
+        else:
+            self.parse_postfix()
+
+    def parse_postfix(self):
+        self.parse_primary()
+        while True:
+            kind = self.peek().kind
+            if kind == 'LB':
+                self.advance()
+                self.parse_expression()
+                self.expect('RB')
+            elif kind == 'LP':
+                self.advance()
+                if self.peek().kind != 'RP':
+                    self.parse_assignment()
+                    while self.accept('COMMA'):
+                        self.parse_assignment()
+                self.expect('RP', 'COMMA')
+            elif kind in ('DOT', 'ARROW'):
+                self.advance()
+                self.expect('ID')
+            elif kind in ('INC', 'DEC'):
+                self.advance()
+            else:
+                return
+
+    def parse_primary(self):
+        token = self.peek()
+        if token.kind in ('ID', 'INT_CONST', 'FLOAT_CONST', 'CHAR_CONST'):
+            self.advance()
+        elif token.kind == 'STRING':
+            while self.accept('STRING'):
+                pass
+        elif token.kind == 'LP':
+            self.advance()
+            self.parse_expression()
+            self.expect('RP')
+        else:
+            raise MiniCSyntaxError(token, ['ID', 'INT_CONST', 'FLOAT_CONST', 'CHAR_CONST', 'STRING', 'LP'])
+
+
+def parse_chunk(text):
+    """检查一段独立的顶层声明，返回错误列表，行号从1开始相对于这段文本"""
+    tokens = tokenize(text)
+    for token in tokens:
+        if token.kind == 'MISMATCH':
+            return [{"line": token.line, "message": f"unknown character '{token.text}'",
+                     "actual": token.text, "expected": []}]
+        if token.kind == 'BAD_COMMENT':
+            return [{"line": token.line, "message": "unterminated comment",
+                     "actual": "/*", "expected": ["*/"]}]
+    try:
+        MiniCParser(tokens).parse_program()
+    except MiniCSyntaxError as e:
+        return [e.to_error()]
+    return []
+
+
+class MiniCChecker:
+    """
+    增量检查：源码按顶层声明切片，文本没有变化的片段直接复用上次的结果
+    """
+    def __init__(self):
+        self._cache = {}  # 片段文本 -> 相对行号的错误列表
+
+    def iter_chunk_errors(self, text):
+        """
+        逐个顶层声明检查，每个片段产出一次错误列表(行号已换算为整个文件的行号)
+        完整遍历后才会更新缓存
+        """
+        new_cache = {}
+        line = 1
+        last = 0
+        for start, end in split_top_level(text):
+            line += text.count('\n', last, start)
+            last = start
+            chunk = text[start:end]
+            result = new_cache.get(chunk)
+            if result is None:
+                result = self._cache.get(chunk)
+                if result is None:
+                    result = parse_chunk(chunk)
+                new_cache[chunk] = result
+            yield [dict(error, line=error["line"] + line - 1) for error in result]
+        self._cache = new_cache
+
+    def check(self, text, is_cancelled=None):
+        """
+        检查整个缓冲区，返回错误列表
+        is_cancelled 返回 True 时中途放弃，返回 None
+        """
+        errors = []
+        for chunk_errors in self.iter_chunk_errors(text):
+            if is_cancelled and is_cancelled():
+                return None
+            errors.extend(chunk_errors)
+        return errors
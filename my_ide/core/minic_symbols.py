@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+# 符号提取：从 MiniC/C 源码的 Token 流中找出函数、全局变量、结构体、字段和局部变量的声明位置
+# 不做完整的语法分析，有语法错误的文件也能提取出错误之前和之后的大部分符号
+from collections import namedtuple
+
+from my_ide.core.minic_parser import tokenize_positions, DECLARATION_START
+
+# line 从1开始，column 从0开始；end_line 为函数/结构体右花括号所在行，其余符号等于 line
+# container 为所属的函数(参数、局部变量)或结构体(字段)名称
+Symbol = namedtuple("Symbol", ["name", "kind", "line", "column", "end_line", "container"])
+
+# 可以跨文件跳转的符号种类，按跳转时的优先顺序排列
+DEFINITION_KINDS = ("function", "struct", "enum", "type", "variable", "constant", "prototype", "field")
+# 只在所属函数内可见的符号
+LOCAL_KINDS = ("parameter", "local")
+
+# MiniC 之外、C 源码中常见的说明符，按 ID 识别
+_C_SPECIFIERS = {'typedef', 'inline', 'register', 'volatile', 'auto', 'restrict'}
+_C_TAGS = {'union': "struct", 'enum': "enum"}
+# 用户类型名后面跟着声明符时，声明符之后可能出现的 Token
+_DECLARATOR_FOLLOW = {'SEMI', 'COMMA', 'ASSIGNOP', 'LB', 'LP'}
+
+
+def extract_symbols(text):
+    """返回源码中声明的所有符号(Symbol 列表)，按出现顺序"""
+    return _SymbolExtractor(tokenize_positions(text)).run()
+
+
+def analyze_source(text):
+    """
+    只切分一次 Token，同时返回 (符号列表, 标识符出现位置)
+    出现位置为 {名称: [(行, 列), ...]}，只包括标识符 Token，字符串和注释中的同名文本不算
+    """
+    tokens = tokenize_positions(text)
+    occurrences = {}
+    for token in tokens:
+        if token.kind == 'ID':
+            positions = occurrences.get(token.text)
+            if positions is None:
+                occurrences[token.text] = positions = []
+            positions.append((token.line, token.column))
+    return _SymbolExtractor(tokens).run(), occurrences
+
+
+def enclosing_function(symbols, line):
+    """第 line 行所在的函数定义，不在函数中时返回 None"""
+    for symbol in symbols:
+        if symbol.kind == "function" and symbol.line <= line <= symbol.end_line:
+            return symbol
+    return None
+
+
+def kind_rank(kind):
+    """跳转时的优先顺序，局部符号排在最后"""
+    return DEFINITION_KINDS.index(kind) if kind in DEFINITION_KINDS else len(DEFINITION_KINDS)
+
+
+def definitions_at(symbols, name, line, member=False):
+    """
+    在一个文件的符号中查找 name 在第 line 行可见的定义，按跳转的优先顺序排列
+    局部变量和参数只在所属函数内可见，取 line 之前最近的一个；member 为 True 时(a.x、a->x)只找字段
+    """
+    if member:
+        return [symbol for symbol in symbols if symbol.name == name and symbol.kind == "field"]
+    function = enclosing_function(symbols, line)
+    function = function.name if function is not None else None
+    local = None
+    for symbol in symbols:
+        if symbol.line > line:
+            break
+        if symbol.name == name and symbol.kind in LOCAL_KINDS and symbol.container == function:
+            local = symbol
+    if function is not None and local is not None:
+        return [local]
+    found = [symbol for symbol in symbols
+             if symbol.name == name and symbol.kind in DEFINITION_KINDS and symbol.kind != "field"]
+    found.sort(key=lambda symbol: kind_rank(symbol.kind))
+    return found
+
+
+class _SymbolExtractor:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+        self.symbols = []  # [名称, 种类, 行, 列, 结束行, 所属]，结束时转换为 Symbol
+        # 每层花括号一项: (种类, 名称, 符号下标, 是否为 typedef)，种类为 function/struct/enum/block
+        self.scopes = []
+
+    def kind_at(self, index):
+        return self.tokens[index].kind if index < len(self.tokens) else 'EOF'
+
+    def run(self):
+        statement_start = True
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            kind = token.kind
+            if kind == 'LC':
+                self.scopes.append(("block", None, None, False))
+                self.pos += 1
+                statement_start = True
+            elif kind == 'RC':
+                self.pos += 1
+                self._close_scope(token)
+                statement_start = True
+            elif kind == 'SEMI':
+                self.pos += 1
+                statement_start = True
+            elif self.scopes and self.scopes[-1][0] == "enum":
+                if kind == 'ID' and self.kind_at(self.pos - 1) in ('LC', 'COMMA'):
+                    self._add(token, "constant", None)
+                self.pos += 1
+            elif statement_start and self._is_declaration():
+                self._declaration()
+                statement_start = True
+            else:
+                # for 的初始化部分可以声明变量
+                statement_start = kind == 'LP' and self.kind_at(self.pos - 1) == 'FOR'
+                self.pos += 1
+        return [Symbol(*entry) for entry in self.symbols]
+
+    # --- 作用域 ---
+    def _innermost(self, *kinds):
+        for scope in reversed(self.scopes):
+            if scope[0] in kinds:
+                return scope
+        return None
+
+    def _variable_kind(self):
+        if not self.scopes:
+            return "variable", None
+        scope = self._innermost("struct", "function")
+        if scope is not None and scope[0] == "struct" and self.scopes[-1][0] == "struct":
+            return "field", scope[1]
+        function = self._innermost("function")
+        return "local", function[1] if function else None
+
+    def _close_scope(self, token):
+        if not self.scopes:
+            return  # 多余的右花括号
+        kind, _name, index, is_typedef = self.scopes.pop()
+        if index is not None:
+            self.symbols[index][4] = token.line
+        if kind in ("struct", "enum") and self.kind_at(self.pos) not in ('SEMI', 'EOF'):
+            # struct S {...} a, b;
+            self._declarators(is_typedef)
+
+    def _add(self, token, kind, container):
+        self.symbols.append([token.text, kind, token.line, token.column, token.line, container])
+        return len(self.symbols) - 1
+
+    # --- 声明 ---
+    def _is_declaration(self):
+        token = self.tokens[self.pos]
+        if token.kind in DECLARATION_START:
+            return True
+        if token.kind != 'ID':
+            return False
+        if token.text in _C_SPECIFIERS or token.text in _C_TAGS:
+            return True
+        # 用户类型名开头的声明: T x; T *p = ...; T f(...)
+        index = self.pos + 1
+        while self.kind_at(index) == 'STAR':
+            index += 1
+        if self.kind_at(index) != 'ID' or self.kind_at(index + 1) not in _DECLARATOR_FOLLOW:
+            return False
+        follow = self.tokens[index + 1]
+        return follow.kind != 'ASSIGNOP' or follow.text == '='
+
+    def _declaration(self):
+        is_typedef = False
+        has_specifier = False
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            if token.kind in ('TYPE', 'QUALIFIER'):
+                pass
+            elif token.kind == 'ID' and token.text in _C_SPECIFIERS:
+                is_typedef = is_typedef or token.text == 'typedef'
+            else:
+                break
+            has_specifier = True
+            self.pos += 1
+        token = self.tokens[self.pos] if self.pos < len(self.tokens) else None
+        if token is None:
+            return
+        if token.kind == 'STRUCT' or (token.kind == 'ID' and token.text in _C_TAGS):
+            tag_kind = _C_TAGS.get(token.text, "struct")
+            self.pos += 1
+            tag = None
+            if self.kind_at(self.pos) == 'ID':
+                tag = self.tokens[self.pos]
+                self.pos += 1
+            if self.kind_at(self.pos) == 'LC':
+                index = self._add(tag, tag_kind, None) if tag is not None else None
+                self.scopes.append((tag_kind, tag.text if tag else None, index, is_typedef))
+                self.pos += 1
+                return
+        elif token.kind == 'ID' and not has_specifier:
+            self.pos += 1  # 用户类型名
+        self._declarators(is_typedef)
+
+    def _declarators(self, is_typedef):
+        """逗号分隔的声明符，直到分号；函数定义在左花括号处结束"""
+        while self.pos < len(self.tokens):
+            while self.kind_at(self.pos) in ('STAR', 'QUALIFIER'):
+                self.pos += 1
+            if self.kind_at(self.pos) != 'ID':
+                self._skip_to_end()
+                return
+            name = self.tokens[self.pos]
+            self.pos += 1
+            if self.kind_at(self.pos) == 'LP' and self._innermost("function", "struct") is None:
+                close = self._matching(self.pos)
+                if self.kind_at(close + 1) == 'LC' and not is_typedef:
+                    index = self._add(name, "function", None)
+                    self.scopes.append(("function", name.text, index, False))
+                    self._parameters(self.pos + 1, close, name.text)
+                    self.pos = close + 2
+                    return
+                self._add(name, "type" if is_typedef else "prototype", None)
+                self.pos = close + 1
+            else:
+                kind, container = ("type", None) if is_typedef else self._variable_kind()
+                self._add(name, kind, container)
+            # 跳过数组维数和初值
+            depth = 0
+            while self.pos < len(self.tokens):
+                kind = self.tokens[self.pos].kind
+                if kind in ('LP', 'LB', 'LC'):
+                    depth += 1
+                elif kind in ('RP', 'RB', 'RC'):
+                    if depth == 0:
+                        return
+                    depth -= 1
+                elif depth == 0 and kind in ('COMMA', 'SEMI'):
+                    break
+                self.pos += 1
+            if self.kind_at(self.pos) == 'COMMA':
+                self.pos += 1
+                continue
+            if self.kind_at(self.pos) == 'SEMI':
+                self.pos += 1
+            return
+
+    def _parameters(self, start, end, function_name):
+        """参数表中每个参数的名称为其中最后一个(不在开头的)标识符"""
+        name = None
+        first = True
+        depth = 0
+        for index in range(start, end):
+            token = self.tokens[index]
+            if token.kind == 'LP':
+                depth += 1
+            elif token.kind == 'RP':
+                depth -= 1
+            elif token.kind == 'COMMA' and depth == 0:
+                if name is not None:
+                    self._add(name, "parameter", function_name)
+                name = None
+                first = True
+                continue
+            elif token.kind == 'ID' and not first:
+                name = token
+            first = False
+        if name is not None:
+            self._add(name, "parameter", function_name)
+
+    def _matching(self, index):
+        """index 处左括号对应的右括号下标，没有时返回最后一个 Token 的下标"""
+        depth = 0
+        for i in range(index, len(self.tokens)):
+            kind = self.tokens[i].kind
+            if kind == 'LP':
+                depth += 1
+            elif kind == 'RP':
+                depth -= 1
+                if depth == 0:
+                    return i
+            elif kind in ('LC', 'RC', 'SEMI'):
+                return i - 1
+        return len(self.tokens) - 1
+
+    def _skip_to_end(self):
+        """跳过无法识别的声明剩余部分，停在分号之后或花括号之前"""
+        while self.pos < len(self.tokens):
+            kind = self.tokens[self.pos].kind
+            if kind in ('LC', 'RC'):
+                return
+            self.pos += 1
+            if kind == 'SEMI':
+                return
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+# 文档结构：按行记录花括号和 region 标记，编辑时只重新扫描变化的行(块注释开闭变化时继续向后扫描)
+# 需要时再把各行的记录配对成区域树，供大纲和代码折叠使用
+import re
+
+from my_ide.core.minic_parser import KEYWORDS
+
+# // region 标题 / #pragma region 标题，以及对应的 endregion
+_REGION_START_RE = re.compile(r'\s*(?://\s*|#\s*pragma\s+)region\b\s*(.*)')
+_REGION_END_RE = re.compile(r'\s*(?://\s*|#\s*pragma\s+)endregion\b')
+_SPECIAL_RE = re.compile(r'[{}"\']|//|/\*')
+_TAG_RE = re.compile(r'\b(struct|union|enum)\b\s*([A-Za-z_]\w*)?')
+_CALL_RE = re.compile(r'([A-Za-z_]\w*)\s*\(')
+# 不作为函数名的关键字
+_CONTROL_WORDS = set(KEYWORDS) | {'switch', 'sizeof', 'case', 'else', 'do'}
+
+_EMPTY = ()
+
+
+def scan_line(text, in_comment):
+    """
+    扫描一行，返回 (事件元组, 行尾是否在块注释中)
+    事件为 ('{' 或 '}', 列, None)、('region', 0, 标题) 或 ('endregion', 0, None)
+    字符串、字符常量、注释和预处理行中的花括号不算
+    """
+    if not in_comment:
+        match = _REGION_START_RE.match(text)
+        if match:
+            return (('region', 0, match.group(1).strip()),), False
+        if _REGION_END_RE.match(text):
+            return (('endregion', 0, None),), False
+        if text.lstrip().startswith('#'):
+            return _EMPTY, False
+        if '{' not in text and '}' not in text and '/*' not in text:
+            return _EMPTY, False
+    events = []
+    position = 0
+    length = len(text)
+    while position < length:
+        if in_comment:
+            end = text.find('*/', position)
+            if end < 0:
+                break
+            in_comment = False
+            position = end + 2
+            continue
+        match = _SPECIAL_RE.search(text, position)
+        if match is None:
+            break
+        token = match.group()
+        position = match.end()
+        if token in ('{', '}'):
+            events.append((token, match.start(), None))
+        elif token == '//':
+            break
+        elif token == '/*':
+            in_comment = True
+        else:
+            # 跳过字符串/字符常量，处理转义
+            while position < length:
+                ch = text[position]
+                position += 2 if ch == '\\' else 1
+                if ch == token:
+                    break
+    return (tuple(events) if events else _EMPTY), in_comment
+
+
+def replaced_line_count(first, last, block_count, old_block_count):
+    """
+    一次编辑后第 first 到 last 行(编辑后的行号)在编辑前对应的行数
+    块数的变化全部来自这一段，编辑前有 old_block_count 个块，编辑后有 block_count 个
+    """
+    return last - first + 1 - (block_count - old_block_count)
+
+
+class Region:
+    """
+    一个可折叠的区域: 花括号(种类为 function/struct/enum/block)或 region 标记
+    line 从0开始，为折叠后仍然显示的行：函数、结构体和枚举是声明所在行(左花括号可能在下一行)，其他是左花括号所在行
+    折叠时隐藏 line + 1 到 fold_end 行(花括号区域保留右花括号所在行)
+    """
+    __slots__ = ("kind", "name", "line", "end_line", "fold_end", "children")
+
+    def __init__(self, kind, name, line):
+        self.kind = kind
+        self.name = name
+        self.line = line
+        self.end_line = line
+        self.fold_end = line
+        self.children = []
+
+    def foldable(self):
+        return self.fold_end > self.line
+
+
+class DocumentStructure:
+    """
+    文档每一行的结构事件，lines[n] 为 (事件, 行首是否在块注释中, 行尾是否在块注释中)
+    编辑后用 replace_lines 替换变化的行；区域树在用到时只重新配对变化的部分：
+    变化之前已经结束的顶层区域直接保留，变化之后配对状态回到和原来相同(没有未结束的区域)时，
+    后面原来的顶层区域平移行号后接上
+    """
+    def __init__(self):
+        self.lines = []
+        self._top = []
+        # 每个顶层区域一项 [确定种类时看到的最前一行, 开始事件的行, 事件下标, 结束事件的行, 事件下标]，没有结束时为 None
+        self._spans = []
+        self._dirty = None  # 上次配对后的变化 (开始行, 结束行, 之后的行号偏移)，None 表示区域树是最新的
+
+    def __len__(self):
+        return len(self.lines)
+
+    def replace_lines(self, first, old_count, texts, line_text=None):
+        """
+        把从 first 开始的 old_count 行换成 texts 中的行
+        之后一行开头的块注释状态变化时，用 line_text(n) 取文档中第 n 行的文本继续重新扫描
+        """
+        state = self.lines[first - 1][2] if first > 0 else False
+        new_lines = []
+        for text in texts:
+            events, end_state = scan_line(text, state)
+            new_lines.append((events, state, end_state))
+            state = end_state
+        old_end = first + len(self.lines[first:first + old_count])
+        self.lines[first:first + old_count] = new_lines
+        line = first + len(new_lines)
+        while line < len(self.lines) and self.lines[line][1] != state and line_text is not None:
+            events, end_state = scan_line(line_text(line), state)
+            self.lines[line] = (events, state, end_state)
+            state = end_state
+            line += 1
+        self._mark_dirty(first, old_end, first + len(new_lines), line)
+
+    def _mark_dirty(self, first, old_end, new_end, changed_end):
+        """编辑前的 [first, old_end) 行换成了 [first, new_end) 行，[first, changed_end) 行的事件可能变化"""
+        delta = new_end - old_end
+        end = max(new_end, changed_end)
+        if self._dirty is None:
+            self._dirty = (first, end, delta)
+            return
+        dirty_start, dirty_end, dirty_delta = self._dirty
+        # 之前的变化范围换算到这次编辑之后的行号
+        if dirty_end >= old_end:
+            dirty_end += delta
+        elif dirty_end > first:
+            dirty_end = new_end
+        self._dirty = (min(dirty_start, first), max(dirty_end, end), dirty_delta + delta)
+
+    def regions(self, line_text):
+        """顶层区域列表，line_text(n) 用于取函数/结构体所在行的文本来确定名称"""
+        if self._dirty is not None:
+            self._update(line_text, *self._dirty)
+            self._dirty = None
+        return self._top
+
+    def _update(self, line_text, dirty_start, dirty_end, delta):
+        old_top, old_spans = self._top, self._spans
+        # 在变化之前结束的顶层区域不受影响
+        keep = 0
+        while keep < len(old_spans) and old_spans[keep][3] is not None and old_spans[keep][3] < dirty_start:
+            keep += 1
+        top = old_top[:keep]
+        spans = old_spans[:keep]
+        line, index = (spans[-1][3], spans[-1][4] + 1) if spans else (0, 0)
+        next_old = keep  # 开始事件不在当前行之前的第一个旧的顶层区域
+
+        stack = []  # 还没有结束的区域
+        braces = 0  # stack 中花括号区域的个数
+        lines = self.lines
+        while line < len(lines):
+            events = lines[line][0]
+            if not events:
+                line += 1
+                continue
+            if not stack and not index and line >= dirty_end:
+                # 没有未结束的区域，并且已经过了变化的行：原来在这里也没有未结束的区域、
+                # 后面的区域确定种类时也没有看到变化的行，就可以接上原来的区域树
+                while next_old < len(old_spans) and old_spans[next_old][1] + delta < line:
+                    next_old += 1
+                previous_end = old_spans[next_old - 1][3] if next_old else -1
+                if previous_end is not None and previous_end + delta < line and (
+                        next_old == len(old_spans) or old_spans[next_old][0] + delta >= dirty_end):
+                    for region, span in zip(old_top[next_old:], old_spans[next_old:]):
+                        if delta:
+                            _shift(region, delta)
+                            span = [span[0] + delta, span[1] + delta, span[2],
+                                    None if span[3] is None else span[3] + delta, span[4]]
+                        top.append(region)
+                        spans.append(span)
+                    break
+            for position in range(index, len(events)):
+                kind, column, label = events[position]
+                if kind == '}':
+                    if not braces:
+                        continue  # 多余的右花括号
+                    # 结束最近的花括号区域，中间没有结束的 region 一起结束
+                    while True:
+                        region = stack.pop()
+                        region.end_line = line
+                        region.fold_end = line - 1
+                        if region.kind != 'region':
+                            braces -= 1
+                            break
+                    if not stack:
+                        spans[-1][3:] = [line, position]
+                    continue
+                if kind == 'endregion':
+                    if stack and stack[-1].kind == 'region':
+                        region = stack.pop()
+                        region.end_line = region.fold_end = line
+                        if not stack:
+                            spans[-1][3:] = [line, position]
+                    continue
+                head = line
+                if kind == 'region':
+                    region = Region('region', label, line)
+                elif braces:
+                    region = Region("block", None, line)
+                else:
+                    # 只有顶层的花括号需要根据前面的文本确定种类和名称
+                    header, head = _header(line_text, line, column)
+                    region_kind, name = _classify(header)
+                    region = Region(region_kind, name, line if region_kind == 'block' else head)
+                if kind == '{':
+                    braces += 1
+                if stack:
+                    stack[-1].children.append(region)
+                else:
+                    top.append(region)
+                    spans.append([head, line, position, None, None])
+                stack.append(region)
+            line += 1
+            index = 0
+        self._top = top
+        self._spans = spans
+
+
+def _shift(region, delta):
+    """区域和其中的子区域整体平移 delta 行"""
+    region.line += delta
+    region.end_line += delta
+    region.fold_end += delta
+    for child in region.children:
+        _shift(child, delta)
+
+
+def _header(line_text, line, column):
+    """(左花括号前面的文本, 文本所在行)，左花括号单独成行时取上一个非空行"""
+    text = line_text(line)[:column].strip()
+    while not text and line > 0:
+        line -= 1
+        text = line_text(line).strip()
+        if text.endswith((';', '}', '{')):
+            return "", line
+    return text, line
+
+
+def _classify(header):
+    """根据顶层左花括号前面的文本判断区域种类和名称"""
+    if header.endswith('='):
+        return "block", None  # 初值列表
+    match = _TAG_RE.search(header)
+    if match and not header.rstrip().endswith(')'):
+        return ("enum" if match.group(1) == 'enum' else "struct"), match.group(2)
+    if header.endswith(')'):
+        names = [name for name in _CALL_RE.findall(header) if name not in _CONTROL_WORDS]
+        if names:
+            return "function", names[0]
+    return "block", None
+
+
+def outline_items(regions):
+    """大纲中显示的区域(函数、结构体、枚举和 region)，嵌套在普通代码块中的也提升上来"""
+    items = []
+    for region in regions:
+        if region.kind == 'block':
+            items.extend(outline_items(region.children))
+        else:
+            items.append(region)
+    return items
+
+
+def innermost_region(regions, line):
+    """包含第 line 行的最内层可折叠区域"""
+    found = None
+    while True:
+        for region in regions:
+            if region.line <= line <= region.end_line:
+                if region.foldable():
+                    found = region
+                regions = region.children
+                break
+        else:
+            return found
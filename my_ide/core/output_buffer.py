@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+# 程序输出的环形缓冲区：只保留最近的若干行，旧的行自动丢弃
+from collections import deque
+
+
+class OutputRingBuffer:
+    """
+    按行保存流式输出，最多保留 max_lines 行
+    输出块可能在一行中间截断，未结束的行会和下一块拼接
+    """
+    def __init__(self, max_lines):
+        self.max_lines = max_lines
+        self._lines = deque(maxlen=max_lines)
+        self.dropped = 0  # 因超过上限被丢弃的行数
+
+    def __len__(self):
+        return len(self._lines)
+
+    def write(self, text):
+        """追加一段输出文本"""
+        if not text:
+            return
+        parts = text.split('\n')
+        lines = [part + '\n' for part in parts[:-1]]
+        if parts[-1]:
+            lines.append(parts[-1])
+        # 上一块最后一行没有结束，和这一块的第一行合并
+        if self._lines and not self._lines[-1].endswith('\n'):
+            lines[0] = self._lines.pop() + lines[0]
+        overflow = len(self._lines) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.dropped += overflow
+            if len(lines) > self.max_lines:
+                lines = lines[-self.max_lines:]
+        self._lines.extend(lines)
+
+    def set_max_lines(self, max_lines):
+        """修改保留的行数，deque 的容量不能修改，按新的上限重建，多出的旧行计入 dropped"""
+        overflow = len(self._lines) - max_lines
+        if overflow > 0:
+            self.dropped += overflow
+        self.max_lines = max_lines
+        self._lines = deque(self._lines, maxlen=max_lines)
+
+    def text(self):
+        return ''.join(self._lines)
+
+    def take(self):
+        """取出全部内容并清空，返回 (文本, 这段时间丢弃的行数)"""
+        text = ''.join(self._lines)
+        dropped = self.dropped
+        self.clear()
+        return text, dropped
+
+    def clear(self):
+        self._lines.clear()
+        self.dropped = 0
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+# 程序输出的逐行解析：从构建/运行输出中识别编译器诊断，交给问题面板
+# 每种格式是一个解析函数 line -> 诊断字典或 None，可以用 register_line_parser 添加
+import os
+import re
+
+from my_ide.core.diagnostics_protocol import parse_diagnostic_line
+
+SEVERITIES = {
+    "error": "Error",
+    "fatal error": "Error",
+    "warning": "Warning",
+    "note": "Info",
+    "remark": "Info",
+}
+
+# gcc/clang: file:line:col: error: message，列号可以省略
+GCC_PATTERN = re.compile(
+    r'^(?P<file>(?:[A-Za-z]:)?[^:\n]+):(?P<line>\d+):(?:(?P<column>\d+):)?\s*'
+    r'(?P<severity>fatal error|error|warning|note|remark):\s*(?P<message>.*)$')
+# MSVC: file(line,col): error C2065: message
+MSVC_PATTERN = re.compile(
+    r'^(?P<file>[^(\n]+)\((?P<line>\d+)(?:,(?P<column>\d+))?\)\s*:\s*'
+    r'(?P<severity>fatal error|error|warning|note)\s*(?P<code>[A-Z]+\d+)?\s*:\s*(?P<message>.*)$')
+
+
+def _parse_with(pattern):
+    def parse(line):
+        match = pattern.match(line)
+        if not match:
+            return None
+        code = match.groupdict().get("code")
+        message = match.group("message").strip()
+        return {
+            "file": match.group("file").strip(),
+            "line": int(match.group("line")),
+            "column": int(match.group("column")) if match.group("column") else None,
+            "severity": SEVERITIES[match.group("severity")],
+            "message": f"{code}: {message}" if code else message,
+        }
+    return parse
+
+
+def _parse_json_line(line):
+    """MiniC 检查器等按诊断协议输出的 JSON Lines"""
+    error = parse_diagnostic_line(line)
+    if error is None or "file" not in error:
+        return None
+    return {
+        "file": error["file"],
+        "line": error["line"],
+        "column": error.get("column"),
+        "severity": error.get("severity", "Error"),
+        "message": error["message"],
+    }
+
+
+# 诊断行中一定出现的关键字，不包含这些关键字的行不再逐个尝试解析函数
+DIAGNOSTIC_HINT = re.compile(r'error|warning|note|remark|"message"')
+
+# 按顺序尝试，第一个识别成功的为准
+LINE_PARSERS = [
+    ("gcc", _parse_with(GCC_PATTERN)),
+    ("msvc", _parse_with(MSVC_PATTERN)),
+    ("jsonl", _parse_json_line),
+]
+
+
+def register_line_parser(name, parse, hint=None):
+    """
+    添加一种输出格式，parse(line) 返回包含 file/line/severity/message 的字典或 None
+    hint 为这种格式的行中一定出现的关键字(正则)，会加入预筛选
+    """
+    global DIAGNOSTIC_HINT
+    LINE_PARSERS.append((name, parse))
+    if hint:
+        DIAGNOSTIC_HINT = re.compile(f"{DIAGNOSTIC_HINT.pattern}|{hint}")
+
+
+class CompilerOutputParser:
+    """
+    增量解析流式输出，feed 传入任意切分的文本块，返回其中完整行里识别出的诊断
+    诊断中的相对路径按 cwd 转换为完整路径
+    """
+    def __init__(self, cwd=None, parsers=None, hint=None):
+        self.cwd = cwd or os.getcwd()
+        self.parsers = parsers if parsers is not None else LINE_PARSERS
+        self.hint = hint or DIAGNOSTIC_HINT
+        self._partial = ""
+
+    def feed(self, text):
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        return self._parse_lines(lines)
+
+    def finish(self):
+        """输出结束，处理最后一行没有换行的内容"""
+        line, self._partial = self._partial, ""
+        return self._parse_lines([line]) if line else []
+
+    def _parse_lines(self, lines):
+        diagnostics = []
+        for line in lines:
+            # 先排除大部分普通输出
+            if ':' not in line or not self.hint.search(line):
+                continue
+            line = line.rstrip('\r')
+            for _, parse in self.parsers:
+                diagnostic = parse(line)
+                if diagnostic is not None:
+                    diagnostic["file"] = os.path.normpath(os.path.join(self.cwd, diagnostic["file"]))
+                    diagnostics.append(diagnostic)
+                    break
+        return diagnostics
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+# 工作区检查和符号索引共用的进程池
+# 不用 fork：调用方在 QThread 中，fork 出的子进程会继承 Qt、日志和采样线程持有的锁，可能死锁
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# 工作进程需要的模块，forkserver 服务进程预先导入，之后 fork 出的工作进程不用再导入
+_PRELOAD_MODULES = ["my_ide.core.minic_check", "my_ide.core.symbol_index"]
+
+
+def create_process_pool(max_workers):
+    """
+    支持 forkserver 的平台上由预先导入了解析模块的服务进程 fork 出工作进程，其他平台用 spawn
+    两种方式下工作进程都会重新导入 __main__ 所在的模块，所以 my_ide.main 在模块顶层只导入标准库
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(_PRELOAD_MODULES)
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
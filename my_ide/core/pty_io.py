@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Linux/macOS 下终端面板使用的伪终端后端，接口和 termqt 的 TerminalWinptyIO 相同
+import os
+import sys
+import errno
+import signal
+import struct
+import threading
+
+if sys.platform != "win32":
+    import pty
+    import fcntl
+    import termios
+
+
+def default_shell():
+    """用户的登录 shell，没有设置时使用 /bin/sh"""
+    return os.environ.get("SHELL") or "/bin/sh"
+
+
+class PosixPtyIO:
+    """
+    用 pty.fork 启动 shell，在读取线程中读取输出并交给 stdout_callback
+    stdout_callback 在读取线程中调用，界面更新需要由回调自己转到主线程
+    """
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, row_len, col_len, cmd=None, env=None, logger=None):
+        self.row_len = row_len
+        self.col_len = col_len
+        self.cmd = cmd or default_shell()
+        self.env = env
+        self.logger = logger
+        self.stdout_callback = None
+        self.exit_callback = None
+        self.pid = None
+        self.fd = None
+        self._reader = None
+
+    def spawn(self):
+        env = dict(os.environ if self.env is None else self.env)
+        env.setdefault("TERM", "xterm-256color")
+        argv = self.cmd if isinstance(self.cmd, (list, tuple)) else [self.cmd]
+        pid, fd = pty.fork()
+        if pid == 0:
+            # 子进程：pty.fork 已经把伪终端设为控制终端和标准输入输出
+            try:
+                os.execvpe(argv[0], list(argv), env)
+            finally:
+                os._exit(127)
+        self.pid = pid
+        self.fd = fd
+        self.resize(self.row_len, self.col_len)
+        self._reader = threading.Thread(target=self._read_loop, name="pty-reader", daemon=True)
+        self._reader.start()
+
+    def is_alive(self):
+        return self._reader is not None and self._reader.is_alive()
+
+    def write(self, buffer):
+        if self.fd is None:
+            return
+        try:
+            while buffer:
+                written = os.write(self.fd, buffer)
+                buffer = buffer[written:]
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"pty write failed: {e}")
+
+    def resize(self, rows, cols):
+        self.row_len = rows
+        self.col_len = cols
+        if self.fd is None:
+            return
+        try:
+            fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+        except OSError as e:
+            if self.logger:
+                self.logger.warning(f"pty resize failed: {e}")
+
+    def terminate(self):
+        if self.pid is None:
+            return
+        try:
+            os.kill(self.pid, signal.SIGHUP)
+        except ProcessLookupError:
+            pass
+        if self._reader:
+            self._reader.join(timeout=1)
+
+    def _read_loop(self):
+        while True:
+            try:
+                data = os.read(self.fd, self.READ_SIZE)
+            except OSError as e:
+                # 子进程退出后 Linux 上读取伪终端返回 EIO
+                if e.errno == errno.EINTR:
+                    continue
+                break
+            if not data:
+                break
+            if self.stdout_callback:
+                self.stdout_callback(data)
+        try:
+            os.waitpid(self.pid, 0)
+        except ChildProcessError:
+            pass
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+        self.fd = None
+        if self.exit_callback:
+            self.exit_callback()
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# 性能跟踪：记录耗时区间、计数器和瞬时事件，导出为 Chrome trace_event JSON
+# 导出的文件可以用 Perfetto(ui.perfetto.dev) 或 chrome://tracing 打开
+# 设置环境变量 MY_IDE_TRACE=输出文件 时从启动开始记录，退出时写出；也可以在 View 菜单中开关
+# 关闭时 span() 返回同一个空对象，热路径上的开销只有一次函数调用
+import os
+import json
+import time
+import threading
+from collections import deque
+from functools import wraps
+
+from my_ide.config.settings import TRACE_MAX_EVENTS
+
+TRACE_ENV_VAR = "MY_IDE_TRACE"
+
+_enabled = False
+# 每个事件为元组 (ph, 名称, 类别, 时间戳, 持续时间或异步编号, 线程, 参数)，参数为 ((键, 值), ...)
+# 写出时才转换成字典，比每个事件保存一个字典省内存
+# 超过上限时丢弃最早的事件
+_events = deque(maxlen=TRACE_MAX_EVENTS)
+_thread_names = {}
+_pid = os.getpid()
+_clock = time.perf_counter_ns
+
+
+def _now_us():
+    return _clock() / 1000
+
+
+def _pack(args):
+    return tuple(args.items()) if args else None
+
+
+def _tid():
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    return tid
+
+
+class _Span:
+    """一个耗时区间，退出时记录为完整事件(ph=X)"""
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _events.append(("X", self.name, self.category, self.start, _now_us() - self.start, _tid(),
+                         _pack(self.args)))
+        return False
+
+
+class _NullSpan:
+    """跟踪关闭时使用，什么也不做"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def clear():
+    _events.clear()
+
+
+def event_count():
+    return len(_events)
+
+
+def span(name, category="ide", **args):
+    """
+    记录一段代码的耗时:
+        with tracing.span("open_file", file=path):
+            ...
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name=None, category="ide"):
+    """装饰器形式的 span，名称默认为函数的限定名"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, category, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def counter(name, category="ide", **values):
+    """记录计数器的当前值，例如 counter("output", bytes=n)"""
+    if not _enabled:
+        return
+    _events.append(("C", name, category, _now_us(), None, _tid(), _pack(values)))
+
+
+def instant(name, category="ide", **args):
+    """记录一个时间点，例如首次绘制"""
+    if not _enabled:
+        return
+    _events.append(("i", name, category, _now_us(), None, _tid(), _pack(args)))
+
+
+def begin_async(name, async_id, category="ide", **args):
+    """开始一个跨回调的区间(例如一次编译)，用 end_async 以相同的名称和编号结束"""
+    if not _enabled:
+        return
+    _events.append(("b", name, category, _now_us(), async_id, _tid(), _pack(args)))
+
+
+def end_async(name, async_id, category="ide", **args):
+    if not _enabled:
+        return
+    _events.append(("e", name, category, _now_us(), async_id, _tid(), _pack(args)))
+
+
+def snapshot():
+    """已记录事件的副本，之后可以在其他线程中用 save 写出"""
+    return list(_events), dict(_thread_names)
+
+
+def _event_dict(event):
+    ph, name, category, ts, extra, tid, args = event
+    result = {"name": name, "cat": category, "ph": ph, "ts": ts, "pid": _pid, "tid": tid}
+    if ph == "X":
+        result["dur"] = extra
+    elif ph in ("b", "e"):
+        result["id"] = extra
+    elif ph == "i":
+        result["s"] = "p"
+    if args:
+        result["args"] = dict(args)
+    return result
+
+
+def save(path, recorded=None):
+    """
+    把事件写成 Chrome trace_event JSON，返回事件数
+    recorded 为 snapshot() 的结果，默认为当前记录的全部事件；事件逐个转换写出，不在内存中组装整个文档
+    """
+    events, thread_names = recorded if recorded is not None else snapshot()
+    metadata = [
+        {"name": "thread_name", "ph": "M", "pid": _pid, "tid": tid, "args": {"name": name}}
+        for tid, name in thread_names.items()
+    ]
+    metadata.append({"name": "process_name", "ph": "M", "pid": _pid, "tid": 0, "args": {"name": "my_ide"}})
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        f.write(",\n".join(json.dumps(event, ensure_ascii=False) for event in metadata))
+        for event in events:
+            f.write(",\n")
+            f.write(json.dumps(_event_dict(event), ensure_ascii=False))
+        f.write("\n]}\n")
+    os.replace(tmp_path, path)
+    return len(events)
+
+
+def save_in_background(path, on_done=None):
+    """
+    在后台线程中写出当前记录的事件，事件很多时不阻塞界面
+    写完后在后台线程中调用 on_done(路径, 事件数, 错误信息)，成功时错误信息为空字符串
+    线程不是守护线程，退出时解释器会等它写完
+    """
+    recorded = snapshot()
+
+    def run():
+        try:
+            count, error = save(path, recorded), ""
+        except OSError as e:
+            count, error = 0, str(e)
+        if on_done is not None:
+            on_done(path, count, error)
+
+    thread = threading.Thread(target=run, name="trace-writer")
+    thread.start()
+    return thread
+
+
+def env_output_path():
+    """环境变量中指定的输出文件，没有设置时返回 None"""
+    return os.environ.get(TRACE_ENV_VAR) or None
+
+
+# 从启动开始记录，才能看到启动各阶段的耗时
+if env_output_path():
+    enable()
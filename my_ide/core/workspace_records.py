@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# 工作区文件记录：每个文件一个编号，大小/修改时间/语言按编号存放在紧凑的数组中
+import os
+from array import array
+
+from my_ide.core.minic_parser import is_minic_file
+
+# 语言编号，记录中只保存下标
+LANGUAGES = ("other", "minic", "c", "cpp", "header", "python", "text")
+_LANGUAGE_BY_EXT = {
+    '.c': "c",
+    '.cpp': "cpp", '.cc': "cpp", '.cxx': "cpp",
+    '.h': "header", '.hpp': "header",
+    '.py': "python",
+    '.txt': "text", '.md': "text", '.json': "text",
+}
+_LANGUAGE_CODES = {name: code for code, name in enumerate(LANGUAGES)}
+
+
+def language_of(name):
+    """按后缀判断语言，返回语言编号；使用内置 MiniC 检查的文件记为 minic"""
+    if is_minic_file(name):
+        return _LANGUAGE_CODES["minic"]
+    language = _LANGUAGE_BY_EXT.get(os.path.splitext(name)[1].lower(), "other")
+    return _LANGUAGE_CODES[language]
+
+
+class FileRecords:
+    """
+    工作区中所有文件的记录，编号 -> (相对路径, 大小, 修改时间, 语言)
+    删除的编号放回空闲列表，之后新增的文件重复使用
+    """
+    def __init__(self):
+        self.paths = []              # 编号 -> 相对路径，已删除的为 None
+        self.sizes = array('q')
+        self.mtimes = array('d')
+        self.languages = array('B')
+        self._ids = {}               # 相对路径 -> 编号
+        self._free = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, rel_path):
+        return rel_path in self._ids
+
+    def clear(self):
+        self.__init__()
+
+    def id_of(self, rel_path):
+        return self._ids.get(rel_path)
+
+    def set(self, rel_path, size, mtime):
+        """
+        添加或更新一个文件，返回 (编号, 状态)
+        状态为 "added"、"modified" 或 None(大小和修改时间都没有变化)
+        """
+        file_id = self._ids.get(rel_path)
+        if file_id is not None:
+            if self.sizes[file_id] == size and self.mtimes[file_id] == mtime:
+                return file_id, None
+            self.sizes[file_id] = size
+            self.mtimes[file_id] = mtime
+            return file_id, "modified"
+        language = language_of(rel_path)
+        if self._free:
+            file_id = self._free.pop()
+            self.paths[file_id] = rel_path
+            self.sizes[file_id] = size
+            self.mtimes[file_id] = mtime
+            self.languages[file_id] = language
+        else:
+            file_id = len(self.paths)
+            self.paths.append(rel_path)
+            self.sizes.append(size)
+            self.mtimes.append(mtime)
+            self.languages.append(language)
+        self._ids[rel_path] = file_id
+        return file_id, "added"
+
+    def remove(self, rel_path):
+        """删除一个文件，返回它原来的编号，不存在时返回 None"""
+        file_id = self._ids.pop(rel_path, None)
+        if file_id is not None:
+            self.paths[file_id] = None
+            self._free.append(file_id)
+        return file_id
+
+    def ids(self, language=None):
+        """所有有效的编号，可以只取某种语言(名称)的文件"""
+        if language is None:
+            return list(self._ids.values())
+        code = _LANGUAGE_CODES[language]
+        languages = self.languages
+        return [file_id for file_id in self._ids.values() if languages[file_id] == code]
+
+    def record(self, file_id):
+        """(相对路径, 大小, 修改时间, 语言名称)"""
+        return (self.paths[file_id], self.sizes[file_id], self.mtimes[file_id],
+                LANGUAGES[self.languages[file_id]])
@@ -1,14 +1,32 @@
+import time
+STARTED_AT = time.perf_counter()  # 尽早记录，用来统计启动到首次绘制的耗时
+
 import sys
-from PySide6.QtWidgets import QApplication
-from my_ide.windows.main_window import MainWindow
+
+# 模块顶层只导入标准库：工作区检查和符号索引的工作进程启动时会重新导入 __main__ 所在的模块(即本模块)，
+# Qt 和界面相关的模块放到 main() 中导入，工作进程中不会加载
+
 
 def main():
     """
     程序入口
     """
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    sys.exit(app.exec())
+    from PySide6.QtWidgets import QApplication
+    from my_ide.core import tracing
+    from my_ide.core.logging_config import setup_logging, shutdown_logging
+    with tracing.span("startup.import_main_window", "startup"):
+        from my_ide.windows.main_window import MainWindow
+        from my_ide.windows.first_paint import FirstPaintReporter
+
+    setup_logging()
+    with tracing.span("startup.create_application", "startup"):
+        app = QApplication(sys.argv)
+    with tracing.span("startup.create_main_window", "startup"):
+        window = MainWindow()
+    FirstPaintReporter(window, STARTED_AT)
+    exit_code = app.exec()
+    shutdown_logging()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
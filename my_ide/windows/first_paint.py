@@ -0,0 +1,32 @@
+import os
+import time
+import logging
+
+from PySide6.QtCore import QObject, QEvent, QTimer
+
+from my_ide.core import tracing
+
+logger = logging.getLogger("my_ide.main")
+
+
+class FirstPaintReporter(QObject):
+    """
+    主窗口第一次绘制时输出启动耗时(从 started_at 算起)
+    设置环境变量 MY_IDE_QUIT_AFTER_PAINT=1 时绘制后立即退出，供启动基准使用
+    """
+    def __init__(self, window, started_at):
+        super().__init__(window)
+        self.window = window
+        self.started_at = started_at
+        self.quit_after_paint = os.environ.get("MY_IDE_QUIT_AFTER_PAINT") == "1"
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.window and event.type() == QEvent.Paint:
+            self.window.removeEventFilter(self)
+            elapsed = (time.perf_counter() - self.started_at) * 1000
+            logger.info("启动到首次绘制 %.1f ms", elapsed)
+            tracing.instant("startup.first_paint", "startup", elapsed_ms=round(elapsed, 1))
+            if self.quit_after_paint:
+                QTimer.singleShot(0, self.window.close)
+        return False
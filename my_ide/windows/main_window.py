@@ -1,79 +1,74 @@
+import logging
 import sys
 import os
-import json
-import subprocess
-
-import qdarkstyle
+import time
 
 from PySide6.QtWidgets import (QApplication,QMainWindow,QFileDialog, QDockWidget, 
-                                QHBoxLayout, QStackedWidget, QWidget,QDialog,QInputDialog,QLineEdit)
+                                QHBoxLayout, QStackedWidget, QWidget,QDialog,QInputDialog,QLineEdit,QProgressBar)
 from PySide6.QtGui import QAction,QTextCursor,QTextOption,QResizeEvent,QColor,QPalette
-from PySide6.QtCore import Qt,QEvent,QTimer, QThread, QObject, Signal
+from PySide6.QtCore import Qt,QEvent,QTimer, Signal
 from my_ide.components.file_tree import FileTreeWidget
 from my_ide.components.activity_bar import ActivityBar
 from my_ide.components.menu_bar import MenuBar
 from my_ide.components.search_panel import SearchPanel
 from my_ide.components.find_panel import FindPanel
 from my_ide.components.output_bar import OutputBar
+from my_ide.components.questions_panel import Problem
 from my_ide.controllers.editor_controller import EditorController
+from my_ide.controllers.diagnostics_controller import DiagnosticsController
+from my_ide.controllers.compiler_daemon import CompilerDaemon
+from my_ide.controllers.workspace_checker import WorkspaceChecker
+from my_ide.controllers.task_runner import TaskRunner, Task
+from my_ide.controllers.build_controller import BuildController
+from my_ide.controllers.workspace_inventory import WorkspaceInventory
+from my_ide.controllers.stall_detector import StallDetector
+from my_ide.controllers.symbol_indexer import SymbolIndexer
+from my_ide.components.latency_panel import LatencyPanel
+from my_ide.components.log_viewer import LogViewer
+from my_ide.components.quick_open import QuickOpenPanel
+from my_ide.components.symbol_picker import SymbolPicker
+from my_ide.components.outline_panel import OutlinePanel
+from my_ide.core.output_parsers import CompilerOutputParser
+from my_ide.core.minic_symbols import (extract_symbols, analyze_source, definitions_at, enclosing_function,
+                                      kind_rank, LOCAL_KINDS)
+from my_ide.core import tracing
 from my_ide.components.code_editor import CodeEditor
-from pygments import lexers
-from pygments.util import ClassNotFound
-from my_ide.components.syntax_highlighter_customer import CustomHighlighter
-from my_ide.config.settings import DEFAULT_BACKGROUND_COLOR,DEFAULT_TEXT_COLOR
-
-# 用于在后台线程中运行子进程，避免UI冻结
-class ProcessWorker(QObject):
-    new_output = Signal(str)
-    finished = Signal(int)
-
-    def __init__(self, command, parent=None):
-        super().__init__(parent)
-        self.command = command
-
-    def run(self):
-        """执行命令并实时发送输出"""
-        try:
-            # 在Windows上使用 CREATE_NO_WINDOW 防止弹出控制台窗口
-            creationflags = 0
-            if sys.platform == "win32":
-                creationflags = subprocess.CREATE_NO_WINDOW
-
-            # shell=True 允许我们运行更复杂的命令，但要注意安全风险
-            process = subprocess.Popen(
-                self.command,
-                shell=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                creationflags=creationflags
-            )
-
-            # 实时读取输出
-            for line in iter(process.stdout.readline, ''):
-                self.new_output.emit(line.strip())
-            
-            process.stdout.close()
-            return_code = process.wait()
-            self.finished.emit(return_code)
-
-        except Exception as e:
-            self.new_output.emit(f"执行时发生错误: {e}")
-            self.finished.emit(-1)
+from my_ide.config.settings import (DEFAULT_BACKGROUND_COLOR,DEFAULT_TEXT_COLOR,COMPILER_DAEMON_COMMAND,DIAGNOSTICS_BATCH_MS,REFERENCES_MAX_RESULTS,
+                                    WORKSPACE_DATA_DIR,TRACE_DIR_NAME,WORKSPACE_DATA_IN_STARTUP_DIR)
 
+logger = logging.getLogger(__name__)
 
 class MainWindow(QMainWindow):
+    _trace_saved = Signal(str, int, str)  # 后台线程写完跟踪文件: 路径, 事件数, 错误信息
+
     def __init__(self):
         super().__init__()
+        self._trace_saved.connect(self._on_trace_saved)
         self.current_file_path = None  # 跟踪当前打开的文件路径
-        self.run_thread = None # 用于跟踪运行命令的线程
-        self.run_worker = None # 用于跟踪运行命令的worker
-        self.init_ui()
-        self._init_find_panel()
-        self._init_output_bar()
-        self._init_controller()
+        self.workspace_root = os.getcwd()  # 当前工作区根目录
+        self.recent_files = []  # 最近打开的文件，工作区检查时优先处理
+        self.problems_by_file = {}  # 完整路径 -> 该文件的错误列表
+        self.output_problems = {}  # 输出通道 -> 从任务输出中识别出的 Problem 列表
+        self.task_channels = {} # 任务编号 -> 输出通道名
+        # 工作区文件清单，文件树、搜索、快速打开和工作区检查共用
+        self.workspace_inventory = WorkspaceInventory(self)
+        # 事件循环延迟和卡顿监视，事件循环开始运行后才启动
+        self.stall_detector = StallDetector(self)
+        if WORKSPACE_DATA_IN_STARTUP_DIR:
+            self.stall_detector.set_workspace(self.workspace_root)
+        QTimer.singleShot(0, self.stall_detector.start)
+        with tracing.span("startup.init_ui", "startup"):
+            self.init_ui()
+        with tracing.span("startup.init_panels", "startup"):
+            self._init_find_panel()
+            self._init_output_bar()
+        with tracing.span("startup.init_controller", "startup"):
+            self._init_controller()
+        self._init_services()
+
+    @tracing.traced("startup.init_services", "startup")
+    def _init_services(self):
+        """诊断、工作区检查、任务和快速打开等后台服务"""
         # 安装事件过滤器
         QApplication.instance().installEventFilter(self)
         self.default_palette = QApplication.instance().palette()
@@ -83,13 +78,52 @@ class MainWindow(QMainWindow):
 
         self.current_style_name = 'default'
 
-        # 编译器
-        self.compiler_timer = QTimer(self)
-        self.compiler_timer.timeout.connect(self._run_compiler_cycle)
-        self.compiler_timer.start(10000)
-
+        # 编译器，由编辑、保存和输出文件变化触发，不再定时轮询
         self.error_json_path = os.path.join(os.getcwd(), "my_ide", "core", "error_missing_brace.json")
-        # print(f"Console: Error JSON path set to {self.error_json_path}")
+        # logger.debug("错误文件路径: %s", self.error_json_path)
+        # 常驻的 MiniC 检查进程，避免每次检查都启动新进程
+        self.compiler_daemon = None
+        if COMPILER_DAEMON_COMMAND:
+            self.compiler_daemon = CompilerDaemon(COMPILER_DAEMON_COMMAND, self)
+            self.compiler_daemon.start()
+        self.diagnostics = DiagnosticsController(self.editor, self.error_json_path, self, daemon=self.compiler_daemon)
+        self.diagnostics.problems_updated.connect(self._on_problems_updated)
+        if WORKSPACE_DATA_IN_STARTUP_DIR:
+            self.diagnostics.set_workspace(self.workspace_root)
+
+        # 工作区检查
+        self.workspace_checker = WorkspaceChecker(self)
+        self.workspace_checker.files_checked.connect(self._on_workspace_files_checked)
+        self.workspace_checker.progress.connect(self._on_workspace_check_progress)
+        self.workspace_checker.finished.connect(self._on_workspace_check_finished)
+
+        # 后台任务(运行/构建/测试命令)
+        self.task_runner = TaskRunner(self)
+        self.task_runner.task_started.connect(self._on_task_started)
+        self.task_runner.task_output.connect(self._on_task_output)
+        self.task_runner.task_diagnostics.connect(self._on_task_diagnostics)
+        # 任务输出中的诊断合并后再刷新问题面板
+        self.problems_refresh_timer = QTimer(self)
+        self.problems_refresh_timer.setSingleShot(True)
+        self.problems_refresh_timer.setInterval(DIAGNOSTICS_BATCH_MS)
+        self.problems_refresh_timer.timeout.connect(self._refresh_problems_panel)
+        self.task_runner.task_finished.connect(self._on_task_finished)
+        self.build_controller = BuildController(self.task_runner, self._run_task, self)
+        self.build_controller.status_message.connect(lambda message: self.statusBar().showMessage(message, 3000))
+        self.build_controller.set_workspace(self.workspace_root)
+
+        # 快速打开
+        self.quick_open = QuickOpenPanel(self)
+        self.quick_open.file_selected.connect(self._open_file)
+        self.workspace_inventory.changed.connect(self._on_workspace_inventory_changed)
+        # 符号索引和转到符号，需要在清单开始遍历之前创建
+        self.symbol_indexer = SymbolIndexer(self.workspace_inventory, self)
+        self.symbol_indexer.set_enabled(WORKSPACE_DATA_IN_STARTUP_DIR)
+        self.symbol_indexer.progress.connect(self._on_symbol_index_progress)
+        self.symbol_indexer.names_ready.connect(self.editor.completion.set_workspace_names)
+        self.symbol_picker = SymbolPicker(self)
+        self.symbol_picker.symbol_selected.connect(self._on_search_result_clicked)
+        self.workspace_inventory.set_root(self.workspace_root)
 
     def init_ui(self):
         """
@@ -123,6 +157,12 @@ class MainWindow(QMainWindow):
         """
         statusBar = self.statusBar()
         statusBar.showMessage("Ready",3000)
+        # 工作区检查进度
+        self.check_progress = QProgressBar()
+        self.check_progress.setMaximumWidth(200)
+        self.check_progress.setTextVisible(True)
+        self.check_progress.hide()
+        statusBar.addPermanentWidget(self.check_progress)
 
     def _init_menu_bar(self):
         """
@@ -132,6 +172,8 @@ class MainWindow(QMainWindow):
         self.setMenuBar(self.custom_menu_bar)
         self.custom_menu_bar.action_triggered.connect(self._handle_menu_action)
         self.custom_menu_bar.style_changed.connect(self._on_style_changed)
+        # 通过环境变量开启跟踪时菜单项显示为选中
+        self.custom_menu_bar.trace_action.setChecked(tracing.is_enabled())
         
     def _init_sidebar(self):
         current_dir = os.getcwd()
@@ -140,14 +182,16 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget(self)
 
         self.file_tree_view = FileTreeWidget(self)
-        self.search_panel_view = SearchPanel(current_dir,self)
 
         self.views = {
             "resource_manager": self.file_tree_view,
-            "search_panel": self.search_panel_view
+        }
+        # 其他视图第一次切换过去时才创建
+        self.view_factories = {
+            "search_panel": self._create_search_panel,
+            "outline_panel": self._create_outline_panel,
         }
         self.stacked_widget.addWidget(self.views["resource_manager"])
-        self.stacked_widget.addWidget(self.views["search_panel"])
 
         sidebar_container = QWidget()
         sidebar_layout = QHBoxLayout(sidebar_container)
@@ -166,15 +210,30 @@ class MainWindow(QMainWindow):
         self.activity_bar.view_changed.connect(self.switch_sidebar_view)
 
         # file_tree初始化
+        self.views["resource_manager"].set_inventory(self.workspace_inventory)
         self.views["resource_manager"].set_root_path(current_dir)
         self.views["resource_manager"].tree_view.doubleClicked.connect(self._on_file_double_clicked)
         self.views["resource_manager"].new_file_clicked.connect(self._on_new_file)
         self.views["resource_manager"].new_folder_clicked.connect(self._on_new_folder)
         self.views["resource_manager"].delete_button_clicked.connect(self._on_file_delete)
-        # search_panel初始化
-        self.views["search_panel"].result_clicked.connect(self._on_search_result_clicked)
-        self.views["search_panel"].error_found.connect(self._on_search_error_found)
-        self.views["search_panel"].search_completed.connect(self._on_search_completed)
+
+    def _create_search_panel(self):
+        search_panel = SearchPanel(self.workspace_root, self)
+        search_panel.set_inventory(self.workspace_inventory)
+        search_panel.result_clicked.connect(self._on_search_result_clicked)
+        search_panel.error_found.connect(self._on_search_error_found)
+        search_panel.search_completed.connect(self._on_search_completed)
+        return search_panel
+
+    def _create_outline_panel(self):
+        outline_panel = OutlinePanel(self.editor, self)
+        outline_panel.line_selected.connect(self._on_outline_line_selected)
+        return outline_panel
+
+    def _on_outline_line_selected(self, line):
+        if self._select_in_editor(line + 1, 0, 0):
+            self.editor.centerCursor()
+            self.editor.setFocus()
 
     def _init_controller(self):
         """
@@ -205,12 +264,29 @@ class MainWindow(QMainWindow):
             "zoom_out": self.editor_controller.zoom_out,
             "zoom_reset": self.editor_controller.zoom_reset,
             "toggle_word_wrap": self.editor_controller.toggle_word_wrap,
+            "fold": self.editor_controller.fold,
+            "unfold": self.editor_controller.unfold,
+            "fold_all": self.editor_controller.fold_all,
+            "unfold_all": self.editor_controller.unfold_all,
             "toggle_fullscreen": self._on_toggle_fullscreen,
             "toggle_sidebar": self._on_toggle_sidebar,
             "toggle_output": self._on_toggle_output,
+            "toggle_trace": self._on_toggle_trace,
+            "show_latency_panel": self._on_show_latency_panel,
+            "show_log_viewer": self._on_show_log_viewer,
             "toggle_dark_theme": self._on_toggle_dark_theme,
             "run_with_terminal": self._on_run_with_terminal,
             "run_without_terminal": self._on_run_without_terminal,
+            "quick_open": self._on_quick_open,
+            "go_to_definition": self._on_go_to_definition,
+            "go_to_workspace_symbol": self._on_go_to_workspace_symbol,
+            "find_references": self._on_find_references,
+            "build": self._on_build,
+            "build_and_run": self._on_build_and_run,
+            "cancel_task": self._on_cancel_task,
+            "cancel_all_tasks": self._on_cancel_all_tasks,
+            "check_workspace": self._on_check_workspace,
+            "cancel_workspace_check": self._on_cancel_workspace_check,
         }
 
     def _init_find_panel(self):
@@ -239,78 +315,109 @@ class MainWindow(QMainWindow):
         
         self.output_bar.problem_clicked.connect(self._jump_to_problem_location)
 
+        # 事件循环延迟和卡顿记录
+        self.latency_panel = LatencyPanel(self.stall_detector)
+        self.output_bar.tabs.addTab(self.latency_panel, "性能")
+        self.log_viewer = LogViewer()
+        self.output_bar.tabs.addTab(self.log_viewer, "日志")
+
         # 隐藏
         self.output_dock.hide()
 
-    def _run_compiler_cycle(self):
-        """
-        每10秒被调用一次。
-        尝试读取编译器的输出文件，并更新 UI。
-        """
-        # 如果当前没有打开任何文件，就不应该显示错误（或者清空错误）
-        if not self.current_file_path:
-            self.output_bar.clear_problems()
+    def _on_problems_updated(self, file_path, errors):
+        """当前文件的诊断结果变化时更新问题面板"""
+        if not file_path:
             return
-
-        print("Console: Checking for compiler errors...")
-        # 
-        # 未来这里负责调用编译器
-        #
-        self._parse_problems_and_update_ui()
-
-    def _parse_problems_and_update_ui(self):
-        """读取 JSON 并更新 UI，描述只显示 message"""
-        if not os.path.exists(self.error_json_path):
+        self._set_file_problems(file_path, errors)
+        self._refresh_problems_panel()
+
+    def _set_file_problems(self, file_path, errors):
+        """按完整路径记录一个文件的错误，同名文件不会混在一起"""
+        file_path = os.path.normpath(file_path)
+        if errors:
+            self.problems_by_file[file_path] = errors
+        else:
+            self.problems_by_file.pop(file_path, None)
+
+    def _refresh_problems_panel(self):
+        """把所有文件的错误和任务输出中的诊断整体交给问题面板，描述只显示 message"""
+        problems = [
+            Problem(error.get("message", "Unknown Error"), file_path, error.get("line", 1), error.get("severity", "Error"))
+            for file_path, errors in self.problems_by_file.items()
+            for error in errors
+        ]
+        for channel_problems in self.output_problems.values():
+            problems.extend(channel_problems)
+        self.output_bar.set_problems(problems)
+
+    def _on_check_workspace(self):
+        """用进程池检查整个工作区，打开过的文件优先"""
+        priority = ([self.current_file_path] if self.current_file_path else []) + self.recent_files
+        source_files = None
+        if self.workspace_inventory.is_ready():
+            source_files = self.workspace_inventory.files("minic")
+        if not self.workspace_checker.start(self.workspace_root, priority, source_files):
+            self.statusBar().showMessage("工作区检查正在进行中...", 3000)
             return
+        self.output_dock.show()
+        self.output_bar.tabs.setCurrentWidget(self.output_bar.problems_panel)
+        self.check_progress.setValue(0)
+        self.check_progress.show()
+
+    def _on_cancel_workspace_check(self):
+        if self.workspace_checker.is_running():
+            self.workspace_checker.cancel()
+            self.statusBar().showMessage("正在取消工作区检查...", 3000)
+
+    def _on_workspace_files_checked(self, results):
+        for file_path, file_hash, errors in results:
+            self.diagnostics.cache.put(file_path, file_hash, errors)
+            # 当前文件以编辑器中的内容为准
+            if self.current_file_path and os.path.normpath(self.current_file_path) == os.path.normpath(file_path):
+                continue
+            self._set_file_problems(file_path, errors)
+        self._refresh_problems_panel()
+
+    def _on_workspace_check_progress(self, done, total):
+        self.check_progress.setMaximum(max(total, 1))
+        self.check_progress.setValue(done)
+        self.check_progress.setFormat(f"检查 {done}/{total}")
+
+    def _on_workspace_check_finished(self, cancelled):
+        self.check_progress.hide()
+        count = sum(len(errors) for errors in self.problems_by_file.values())
+        if cancelled:
+            self.statusBar().showMessage("工作区检查已取消", 3000)
+        else:
+            self.statusBar().showMessage(f"工作区检查完成，共 {count} 个问题", 5000)
 
-        try:
-            with open(self.error_json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.output_bar.clear_problems()
-            
-            current_file_name = os.path.basename(self.current_file_path)
-            
-            for error in data.get("errors", []):
-                line = error.get("line", 1)
-                # 直接使用 message，不进行任何拼接
-                msg = error.get("message", "Unknown Error")
-                
-                self.output_bar.add_problem(
-                    description=msg,
-                    file=current_file_name,
-                    line=line,
-                    severity="Error"
-                )
-                
-        except Exception as e:
-            print(f"Console: Error updating problems: {e}")
-
-    def _jump_to_problem_location(self, file_name, line_number):
+    def _jump_to_problem_location(self, file_path, line_number):
         """
-        响应问题点击，跳转到对应行
+        响应问题点击，跳转到对应文件的对应行
         """
-        # 确认点击的是当前文件的错误
-        current_name = os.path.basename(self.current_file_path) if self.current_file_path else ""
+        current_path = os.path.normpath(self.current_file_path) if self.current_file_path else ""
+        if current_path != os.path.normpath(file_path):
+            if not os.path.isfile(file_path):
+                self.statusBar().showMessage(f"文件不存在: {file_path}", 3000)
+                return
+            self._open_file(file_path)
+            if self.current_file_path != file_path:
+                return
+
+        doc = self.editor.document()
+        # line_number 从 1 开始，block number 从 0 开始
+        block = doc.findBlockByNumber(line_number - 1)
         
-        if current_name == file_name:
-            doc = self.editor.document()
-            # line_number 从 1 开始，block number 从 0 开始
-            block = doc.findBlockByNumber(line_number - 1)
+        if block.isValid():
+            cursor = QTextCursor(block)
+            cursor.movePosition(QTextCursor.StartOfBlock)
+            cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
             
-            if block.isValid():
-                cursor = QTextCursor(block)
-                cursor.movePosition(QTextCursor.StartOfBlock)
-                cursor.movePosition(QTextCursor.EndOfBlock, QTextCursor.KeepAnchor)
-                
-                self.editor.setTextCursor(cursor)
-                self.editor.ensureCursorVisible()
-                self.editor.setFocus()
-                
-                self.statusBar().showMessage(f"已跳转到第 {line_number} 行", 2000)
-        else:
-            # 这种情况理论上在我们的逻辑里不会发生，因为我们只加载当前文件的错误
-            pass
+            self.editor.setTextCursor(cursor)
+            self.editor.ensureCursorVisible()
+            self.editor.setFocus()
+            
+            self.statusBar().showMessage(f"已跳转到第 {line_number} 行", 2000)
 
     def _position_find_panel(self):
         """将查找面板定位在编辑器的右上角"""
@@ -337,9 +444,35 @@ class MainWindow(QMainWindow):
         
         return super().eventFilter(watched, event)
 
+    def changeEvent(self, event):
+        # 最小化时暂停诊断，恢复时再补做
+        if event.type() == QEvent.WindowStateChange and hasattr(self, 'diagnostics'):
+            self.diagnostics.set_paused(self.isMinimized())
+        super().changeEvent(event)
+
     # 确保在窗口关闭时移除过滤器，避免内存泄漏
     def closeEvent(self, event):
         QApplication.instance().removeEventFilter(self)
+        self.stall_detector.shutdown()
+        # 通过环境变量开启的跟踪在退出时写出
+        trace_path = tracing.env_output_path()
+        if trace_path and tracing.is_enabled():
+            # 写文件的线程不是守护线程，进程退出前会等它写完
+            tracing.disable()
+            tracing.save_in_background(trace_path)
+            logger.info("正在保存性能跟踪到 %s", trace_path)
+        self.task_runner.shutdown()
+        self.output_bar.shutdown_terminal()
+        self.file_tree_view.shutdown()
+        self.quick_open.shutdown()
+        self.symbol_picker.shutdown()
+        self.symbol_indexer.shutdown()
+        self.workspace_inventory.shutdown()
+        self.build_controller.shutdown()
+        self.workspace_checker.shutdown()
+        self.diagnostics.shutdown()
+        if self.compiler_daemon:
+            self.compiler_daemon.shutdown()
         super().closeEvent(event)
 
     def _on_new_file(self):
@@ -347,7 +480,7 @@ class MainWindow(QMainWindow):
         # 1. 确定要在哪个目录下新建
         selected_path = self.file_tree_view.get_selected_file_path()
         if not selected_path:
-            current_dir = self.file_tree_view.model.filePath(self.file_tree_view.tree_view.rootIndex())
+            current_dir = self.file_tree_view.root_path()
         elif os.path.isfile(selected_path):
             # 如果选中了一个文件，则使用该文件的父目录
             current_dir = os.path.dirname(selected_path)
@@ -366,13 +499,13 @@ class MainWindow(QMainWindow):
                 
                 self.statusBar().showMessage(f"已创建文件: {file_name}", 3000)
                 # 刷新这一块
-                self.file_tree_view.model.layoutChanged.emit()
+                self.file_tree_view.refresh(current_dir)
                 # 展开到新建文件的父目录
                 self.file_tree_view.expand_to_path(current_dir) 
                 
             except Exception as e:
                 self.statusBar().showMessage(f"创建文件失败: {str(e)}", 3000)
-                print(f"Error creating file: {e}")
+                logger.error("创建文件失败: %s", e)
 
     def _on_new_folder(self):
         """处理文件树中新建文件夹按钮点击的槽函数"""
@@ -380,7 +513,7 @@ class MainWindow(QMainWindow):
         selected_path = self.file_tree_view.get_selected_file_path()
         if not selected_path:
             # 如果没选中任何东西则使用根路径
-            current_dir = self.file_tree_view.model.filePath(self.file_tree_view.tree_view.rootIndex())
+            current_dir = self.file_tree_view.root_path()
         elif os.path.isfile(selected_path):
             # 如果选中了一个文件，则使用该文件的父目录
             current_dir = os.path.dirname(selected_path)
@@ -399,16 +532,16 @@ class MainWindow(QMainWindow):
                 
                 self.statusBar().showMessage(f"已创建文件夹: {folder_name}", 3000)
                 # 4. 刷新文件树视图
-                self.file_tree_view.model.layoutChanged.emit()
+                self.file_tree_view.refresh(current_dir)
                 self.file_tree_view.expand_to_path(current_dir) 
             except Exception as e:
                 self.statusBar().showMessage(f"创建文件夹失败: {str(e)}", 3000)
-                print(f"Error creating folder: {e}")
+                logger.error("创建文件夹失败: %s", e)
 
     def _on_file_delete(self):
         """处理文件删除动作的槽函数"""
         selected_path = self.file_tree_view.get_selected_file_path()
-        print(f"Console: 尝试删除的文件路径: {selected_path}")
+        logger.info("尝试删除的文件路径: %s", selected_path)
         if not selected_path:
             self.statusBar().showMessage("没有选中的文件可删除", 3000)
             return
@@ -421,15 +554,21 @@ class MainWindow(QMainWindow):
                 self.statusBar().showMessage(f"已删除文件夹: {selected_path}", 3000)
 
             # 刷新文件树视图
-            self.file_tree_view.model.layoutChanged.emit()
+            self.file_tree_view.refresh(os.path.dirname(selected_path))
         except Exception as e:
             self.statusBar().showMessage(f"删除文件失败: {str(e)}", 3000)
-            print(f"Error deleting file: {e}")
+            logger.error("删除文件失败: %s", e)
 
     def switch_sidebar_view(self, view_id):
-        if view_id in self.views:
-            widget = self.views[view_id]
-            self.stacked_widget.setCurrentWidget(widget)
+        widget = self.views.get(view_id)
+        if widget is None:
+            factory = self.view_factories.pop(view_id, None)
+            if factory is None:
+                return
+            widget = factory()
+            self.views[view_id] = widget
+            self.stacked_widget.addWidget(widget)
+        self.stacked_widget.setCurrentWidget(widget)
 
     def _on_file_open(self):
         """处理文件打开动作的槽函数"""
@@ -449,23 +588,140 @@ class MainWindow(QMainWindow):
         参数: file_path - 要打开的文件路径
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            with tracing.span("open_file", "editor", file=file_path), \
+                    open(file_path, 'r', encoding='utf-8') as file:
                 content = file.read()
                 self.editor_controller._clear_search()
-                self.editor.setPlainText(content)
+                # 先切换lexer再设置文本，文本只被高亮一次
+                self._apply_syntax_highlighting(file_path)
                 self.current_file_path = file_path
+                with tracing.span("open_file.set_text", "editor", chars=len(content)):
+                    self.editor.setPlainText(content)
+                self._remember_recent_file(file_path)
                 self.statusBar().showMessage(f"已打开文件: {file_path}", 3000)
                 if self.find_panel.isVisible():
                     # 延迟执行搜索，确保文本已加载
                     QTimer.singleShot(0, self.find_panel._on_search)
-                self._apply_syntax_highlighting(file_path)
-                self.output_bar.clear_problems()
-                # 重启编译器定时器，并对当前文本进行一次分析
-                self.compiler_timer.start(10000)
-                self._run_compiler_cycle()
+                # 对当前文本进行一次分析
+                self.diagnostics.set_file(file_path)
         except Exception as e:
             self.statusBar().showMessage(f"打开文件失败: {str(e)}", 3000)
-            print(f"Error opening file: {e}")
+            logger.error("打开文件失败: %s", e)
+
+    def _on_quick_open(self):
+        self.quick_open.recent_files = list(self.recent_files)
+        self.quick_open.popup()
+
+    def _on_symbol_index_progress(self, done, total):
+        if done < total:
+            self.statusBar().showMessage(f"正在建立符号索引 {done}/{total}", 2000)
+
+    def _identifier_under_cursor(self):
+        """
+        光标处的标识符，返回 (名称, 行号, 是否为成员访问 a.x / a->x)
+        光标处不是标识符时在状态栏提示并返回 None
+        """
+        cursor = self.editor.textCursor()
+        cursor.select(QTextCursor.WordUnderCursor)
+        name = cursor.selectedText()
+        if not name or not (name[0].isalpha() or name[0] == '_'):
+            self.statusBar().showMessage("光标处没有标识符", 3000)
+            return None
+        block = cursor.block()
+        before = block.text()[:cursor.selectionStart() - block.position()].rstrip()
+        return name, block.blockNumber() + 1, before.endswith('.') or before.endswith('->')
+
+    def _on_go_to_definition(self):
+        """
+        转到光标处标识符的定义
+        当前文件从编辑器的文本中查找(包括局部变量和未保存的修改)，其他文件从符号索引中查找
+        """
+        identifier = self._identifier_under_cursor()
+        if identifier is None:
+            return
+        name, line, member = identifier
+
+        with tracing.span("go_to_definition", "editor", name=name):
+            current = self.current_file_path
+            current_key = os.path.normpath(current) if current else None
+            candidates = [(current, symbol) for symbol in
+                          definitions_at(extract_symbols(self.editor.toPlainText()), name, line, member)]
+            if not candidates or candidates[0][1].kind not in ("parameter", "local"):
+                candidates += [(path, symbol) for path, symbol in self.symbol_indexer.definitions(name)
+                               if os.path.normpath(path) != current_key and (symbol.kind == "field") == member]
+                # 同一种类时当前文件优先
+                candidates.sort(key=lambda item: (kind_rank(item[1].kind), item[0] != current))
+        if not candidates:
+            self.statusBar().showMessage(f"没有找到 {name} 的定义", 3000)
+            return
+        path, symbol = candidates[0]
+        if len(candidates) > 1:
+            self.statusBar().showMessage(f"{name} 有 {len(candidates)} 处定义", 3000)
+        if path is None:
+            # 未保存的新文件
+            self._select_in_editor(symbol.line, symbol.column, symbol.column + len(name))
+        else:
+            self._on_search_result_clicked(path, symbol.line, symbol.column, symbol.column + len(name))
+
+    def _select_in_editor(self, line_number, start_col, end_col):
+        """选中当前编辑器中第 line_number 行的 [start_col, end_col)，行号无效时返回 False"""
+        block = self.editor.document().findBlockByNumber(line_number - 1)
+        if not block.isValid():
+            return False
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, start_col)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, end_col - start_col)
+        self.editor.setTextCursor(cursor)
+        self.editor.ensureCursorVisible()
+        return True
+
+    def _on_find_references(self):
+        """
+        查找光标处标识符的所有引用，结果按文件显示在搜索面板中
+        局部变量和参数只在所属函数中查找；其他符号当前文件用编辑器的文本，其余文件用符号索引中的出现位置
+        """
+        identifier = self._identifier_under_cursor()
+        if identifier is None:
+            return
+        name, line, member = identifier
+        current = self.current_file_path or ""
+        current_key = os.path.normpath(current) if current else None
+        document = self.editor.document()
+        with tracing.span("find_references", "editor", name=name):
+            symbols, occurrences = analyze_source(self.editor.toPlainText())
+            positions = occurrences.get(name, [])
+            definitions = definitions_at(symbols, name, line, member)
+            is_local = bool(definitions) and definitions[0].kind in LOCAL_KINDS
+            if is_local:
+                function = enclosing_function(symbols, line)
+                positions = [(l, c) for l, c in positions if function.line <= l <= function.end_line]
+            references = [(current, l, c, c + len(name), document.findBlockByNumber(l - 1).text())
+                          for l, c in positions]
+            if not is_local:
+                references += [(path, l, c, c + len(name), None) for path, l, c in self.symbol_indexer.references(name)
+                               if os.path.normpath(path) != current_key]
+        total = len(references)
+        if total > REFERENCES_MAX_RESULTS:
+            references = references[:REFERENCES_MAX_RESULTS]
+            self.statusBar().showMessage(f"{name} 有 {total} 处引用，只显示前 {REFERENCES_MAX_RESULTS} 处", 5000)
+        self.sidebar_dock.show()
+        self.switch_sidebar_view("search_panel")
+        self.views["search_panel"].show_references(name, references)
+
+    def _on_go_to_workspace_symbol(self):
+        self.symbol_picker.popup(self.symbol_indexer.root or self.workspace_root, self.symbol_indexer.db_path)
+
+    def _on_workspace_inventory_changed(self, delta):
+        # 快速打开只关心文件的增删
+        if delta.reset or delta.added or delta.removed:
+            self.quick_open.set_workspace(self.workspace_inventory.root, self.workspace_inventory.files())
+
+    def _remember_recent_file(self, file_path):
+        file_path = os.path.normpath(file_path)
+        if file_path in self.recent_files:
+            self.recent_files.remove(file_path)
+        self.recent_files.insert(0, file_path)
+        del self.recent_files[20:]
 
     def _on_file_folder_open(self):
         """处理文件夹打开动作的槽函数"""
@@ -477,10 +733,23 @@ class MainWindow(QMainWindow):
         
         if folder_path:
             self.views["resource_manager"].set_root_path(folder_path)
-            self.views["search_panel"].set_search_root(folder_path)
-            self.editor.clear()
+            if "search_panel" in self.views:
+                self.views["search_panel"].set_search_root(folder_path)
+            self.diagnostics.set_workspace(folder_path)
+            self.workspace_root = folder_path
+            self.build_controller.set_workspace(folder_path)
+            self.stall_detector.set_workspace(folder_path)
+            self.symbol_indexer.set_enabled(True)
+            self.workspace_inventory.set_root(folder_path)
+            self.workspace_checker.cancel()
+            self.recent_files = []
+            self.problems_by_file = {}
+            self.output_problems = {}
+            self._refresh_problems_panel()
             self._apply_syntax_highlighting(None) # 清除高亮
+            self.editor.clear()
             self.current_file_path = None
+            self.diagnostics.set_file(None)
             self.statusBar().showMessage(f"已打开文件夹: {folder_path}", 3000)
 
     def _on_file_save(self):
@@ -491,9 +760,11 @@ class MainWindow(QMainWindow):
                 with open(self.current_file_path, 'w', encoding='utf-8') as file:
                     file.write(self.editor.toPlainText())
                 self.statusBar().showMessage(f"文件已保存: {self.current_file_path}", 3000)
+                self.diagnostics.notify_saved()
+                self.symbol_indexer.file_saved(self.current_file_path, self.editor.toPlainText())
             except Exception as e:
                 self.statusBar().showMessage(f"保存文件失败: {str(e)}", 3000)
-                print(f"Error saving file: {e}")
+                logger.error("保存文件失败: %s", e)
         else:
             # 如果没有文件路径，则调用另存为对话框
             file_path, _ = QFileDialog.getSaveFileName(
@@ -510,9 +781,11 @@ class MainWindow(QMainWindow):
                     self.current_file_path = file_path
                     self.setWindowTitle(f"My IDE - {file_path}")
                     self.statusBar().showMessage(f"文件已保存: {file_path}", 3000)
+                    self.diagnostics.set_file(file_path)
+                    self.symbol_indexer.file_saved(file_path, self.editor.toPlainText())
                 except Exception as e:
                     self.statusBar().showMessage(f"保存文件失败: {str(e)}", 3000)
-                    print(f"Error saving file: {e}")
+                    logger.error("保存文件失败: %s", e)
 
     def _on_file_double_clicked(self, index):
         """
@@ -532,18 +805,11 @@ class MainWindow(QMainWindow):
         参数: file_path - 点击的结果对应的文件路径
               line_number - 点击的结果对应的行号
         """
-        if self.current_file_path != file_path:
+        if file_path and self.current_file_path != file_path:
             self._open_file(file_path)
-        # 定位到指定行号
-        if self.editor and self.current_file_path == file_path:
-            doucument = self.editor.document()
-            block = doucument.findBlockByNumber(line_number - 1)
-            if block.isValid():
-                cursor = QTextCursor(block)
-                cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, start_col)
-                cursor.movePosition(QTextCursor.Right, QTextCursor.KeepAnchor, end_col - start_col)
-                self.editor.setTextCursor(cursor)
-                self.editor.ensureCursorVisible()
+        # 定位到指定行号，路径为空表示当前未保存的文件
+        if self.editor and (not file_path or self.current_file_path == file_path):
+            if self._select_in_editor(line_number, start_col, end_col):
                 self.editor.setFocus()
             else:
                 self.statusBar().showMessage(f"无法定位到指定行号 {line_number}", 3000)
@@ -570,24 +836,24 @@ class MainWindow(QMainWindow):
         if handler and callable(handler):
             handler()
         else:
-            print(f"警告：没有为动作 '{action}' 找到处理函数。")
+            logger.warning("没有为动作 %r 找到处理函数", action)
 
     def _on_toggle_dark_theme(self):
         self.is_dark_theme = not self.is_dark_theme
         if self.is_dark_theme:
+            import qdarkstyle  # 第一次切换到深色主题时才加载
             QApplication.instance().setStyleSheet(qdarkstyle.load_stylesheet())
             self.statusBar().showMessage("已切换到深色主题", 1500)
-            print("Console: 已切换到深色主题")
+            logger.info("已切换到深色主题")
             self.current_style_name = self.dark_style_name
         else:
             QApplication.instance().setStyleSheet("")
             QApplication.instance().setPalette(self.default_palette)
             self.statusBar().showMessage("已切换到浅色主题", 1500)
-            print("Console: 已切换到浅色主题")
+            logger.info("已切换到浅色主题")
             self.current_style_name = self.light_style_name
         self.custom_menu_bar.update_style_selection(self.current_style_name)
-        if self.current_file_path:
-            self._apply_syntax_highlighting(self.current_file_path)
+        self._refresh_syntax_style()
 
     def _on_select_all_matches(self):
         """处理选择所有匹配项动作的槽函数"""
@@ -602,18 +868,50 @@ class MainWindow(QMainWindow):
         if self.isFullScreen():
             self.showNormal()
             self.statusBar().showMessage("已退出全屏模式", 1500)
-            print("Console: 已退出全屏")
+            logger.info("已退出全屏")
         else:
             self.showFullScreen()
             self.statusBar().showMessage("已进入全屏模式", 1500)
-            print("Console: 已进入全屏")
+            logger.info("已进入全屏")
 
     def _on_toggle_sidebar(self):
         """处理查看外观里主侧边栏可见性动作的槽函数"""
         is_visible = self.sidebar_dock.isVisible()
         self.sidebar_dock.setVisible(not is_visible)
         self.statusBar().showMessage(f"侧边栏 {'已隐藏' if is_visible else '已显示'}", 1500)
-        print(f"Console: 侧边栏可见性切换为 {not is_visible}")
+        logger.info("侧边栏可见性切换为 %s", not is_visible)
+
+    def _on_toggle_trace(self):
+        """开始或停止记录性能跟踪，停止时写到工作区的 .seu_ide/traces 目录"""
+        if not tracing.is_enabled():
+            tracing.clear()
+            tracing.enable()
+            self.statusBar().showMessage("已开始记录性能跟踪", 3000)
+            logger.info("已开始记录性能跟踪")
+            return
+        tracing.disable()
+        file_name = time.strftime("trace-%Y%m%d-%H%M%S.json")
+        path = os.path.join(self.workspace_root, WORKSPACE_DATA_DIR, TRACE_DIR_NAME, file_name)
+        # 事件多时写文件要几秒，放到后台线程，写完后通过信号回到界面线程
+        tracing.save_in_background(path, self._trace_saved.emit)
+        tracing.clear()
+        self.statusBar().showMessage("正在保存性能跟踪...", 3000)
+
+    def _on_trace_saved(self, path, count, error):
+        if error:
+            self.statusBar().showMessage(f"保存性能跟踪失败: {error}", 5000)
+            logger.error("保存性能跟踪失败: %s", error)
+            return
+        self.statusBar().showMessage(f"性能跟踪已保存({count} 个事件): {path}", 5000)
+        logger.info("性能跟踪已保存到 %s，可以用 Perfetto 打开", path)
+
+    def _on_show_latency_panel(self):
+        self.output_dock.show()
+        self.output_bar.tabs.setCurrentWidget(self.latency_panel)
+
+    def _on_show_log_viewer(self):
+        self.output_dock.show()
+        self.output_bar.tabs.setCurrentWidget(self.log_viewer)
 
     def _on_toggle_output(self):
         """处理查看输出动作的槽函数，切换输出面板的可见性"""
@@ -634,7 +932,8 @@ class MainWindow(QMainWindow):
 # 下面这几个其实完全可以丢进controller里面，但是我懒了,嘻嘻
     def _on_find_triggered(self, term, case_sensitive, whole_word):
         """处理查找请求"""
-        current, total = self.editor_controller.edit_find(term, case_sensitive, whole_word)
+        with tracing.span("find", "editor", term=term):
+            current, total = self.editor_controller.edit_find(term, case_sensitive, whole_word)
         self.find_panel.update_results_label(current, total)
         if total == 0 and term:
             self.statusBar().showMessage("未找到匹配项", 1500)
@@ -658,11 +957,11 @@ class MainWindow(QMainWindow):
         count = self.editor_controller.replace_all(replace_term)
         if count > 0:
             self.statusBar().showMessage(f"已替换 {count} 处匹配项", 3000)
-            print(f"Console: 已替换 {count} 处匹配项")
+            logger.info("已替换 %d 处匹配项", count)
             self.find_panel.update_results_label(-1,0)
         else:
             self.statusBar().showMessage("未找到匹配项，未进行替换", 3000)
-            print("Console: 未找到匹配项，未进行替换")
+            logger.info("未找到匹配项，未进行替换")
 
     def _on_run_with_terminal(self):
         """通过向内置终端发送命令来运行"""
@@ -672,6 +971,7 @@ class MainWindow(QMainWindow):
             # 确保输出面板和终端是可见的
             self.output_dock.show()
             self.output_bar.tabs.setCurrentWidget(self.output_bar.terminal_widget)
+            self.output_bar.ensure_terminal()
             
             # termqt 需要 bytes 并以 \r 结尾来模拟回车
             command_bytes = (command + '\r').encode('utf-8')
@@ -679,31 +979,45 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage(f"命令 '{command}' 已发送到终端", 3000)
     
     def _apply_syntax_highlighting(self, file_path):
-        """根据文件路径应用或移除高亮"""
-        lexer = None
-        try:
-            # 更具后缀判断lexer
-            lexer = lexers.get_lexer_for_filename(file_path, stripall=True)
-            print(f"Console: Found lexer for {os.path.basename(file_path)}: {lexer.name}")
-            print(f"{type(lexer)}")
-        except ClassNotFound:
-            # 不进行高亮
-            print(f"Console: No lexer found for {os.path.basename(file_path)}.")
-            pass
-        
-        # 清理旧的高亮
-        if self.editor_controller.highlighter:
-            self.editor_controller.highlighter.setDocument(None)
-            self.editor_controller.highlighter = None
-        highlighter = None
-        if lexer:
-            self.editor_controller.highlighter = CustomHighlighter(
-                self.editor.document(), 
+        """
+        根据文件路径应用或移除高亮
+        已有高亮器时只替换lexer，不重建高亮器
+        """
+        if not file_path and self.editor_controller.highlighter is None:
+            self._apply_editor_palette(None)
+            return
+        # Pygments 在第一次打开文件时才加载
+        with tracing.span("highlight.load_lexer", "highlight", file=file_path):
+            from my_ide.components.syntax_highlighter_customer import CustomHighlighter, get_lexer_for_file
+            lexer = get_lexer_for_file(file_path)
+        highlighter = self.editor_controller.highlighter
+        if lexer is None:
+            # 不进行高亮，清理旧的高亮
+            if file_path:
+                logger.debug("没有找到 %s 的词法分析器", os.path.basename(file_path))
+            if highlighter:
+                highlighter.setDocument(None)
+                self.editor_controller.highlighter = None
+            highlighter = None
+        elif highlighter:
+            highlighter.set_lexer(lexer)
+        else:
+            highlighter = CustomHighlighter(
+                self.editor.document(),
                 lexer,
                 self.current_style_name
             )
             self.editor_controller.highlighter = highlighter
-        
+
+        self._apply_editor_palette(highlighter)
+
+    def _refresh_syntax_style(self):
+        """主题或风格切换时原地替换格式表，只重新高亮可见部分"""
+        self.editor_controller.set_highlight_style(self.current_style_name)
+        self._apply_editor_palette(self.editor_controller.highlighter)
+
+    def _apply_editor_palette(self, highlighter):
+        """根据高亮器的风格设置编辑器背景色和文字颜色"""
         palette = self.editor.palette()
         if highlighter:
             palette.setColor(QPalette.Base, highlighter.background_color)
@@ -731,59 +1045,93 @@ class MainWindow(QMainWindow):
         else:
             self.light_style_name = style_name
         # 对当前打开的文件重新应用高亮
-        if self.current_file_path:
-            self._apply_syntax_highlighting(self.current_file_path)
+        self._refresh_syntax_style()
 
     def _on_run_without_terminal(self):
-        """使用subprocess在后台运行命令，并将输出重定向到输出面板"""
-        if self.run_thread and self.run_thread.isRunning():
-            self.statusBar().showMessage("已有命令正在运行，请稍后...", 3000)
-            return
-
+        """在后台运行命令，并将输出重定向到该任务的输出通道，可以和其他任务同时运行"""
         command, ok = QInputDialog.getText(self, "运行命令", "输入命令:", QLineEdit.Normal)
 
         if ok and command:
-            # 准备UI
-            self.output_dock.show()
-            self.output_bar.tabs.setCurrentWidget(self.output_bar.output_panel)
-            self.output_bar.clear_output()
-            self.output_bar.append_output(f"> {command}\n" + "="*20)
-
-            # 创建并配置线程和worker
-            self.run_thread = QThread()
-            self.run_worker = ProcessWorker(command)
-            self.run_worker.moveToThread(self.run_thread)
-
-            # 连接信号和槽
-            self.run_thread.started.connect(self.run_worker.run)
-            self.run_worker.new_output.connect(self.output_bar.append_output)
-
-            # 3. Worker 任务完成时，打印最终信息，并请求线程退出
-            self.run_worker.finished.connect(self._on_process_finished)
-            self.run_worker.finished.connect(self.run_thread.quit)
-            
-            # 4. 确保在任务完成后，worker 和 thread 对象最终会被Qt安全删除
-            self.run_worker.finished.connect(self.run_worker.deleteLater)
-            self.run_thread.finished.connect(self.run_thread.deleteLater)
-
-            # 5. 当线程真正结束后，再执行最终的清理工作,防止闪退
-            self.run_thread.finished.connect(self._on_thread_finished)
-
-            # 启动线程
-            self.run_thread.start()
-            self.statusBar().showMessage(f"正在执行: {command}", 3000)
-
-    def _on_process_finished(self, return_code):
-        """当后台进程结束后调用的槽函数"""
-        self.output_bar.append_output("="*20 + f"\n进程已结束，退出代码: {return_code}")
-
-    def _on_thread_finished(self):
-        """当后台线程结束后调用的槽函数"""
-        self.statusBar().showMessage("命令执行完毕", 3000)
-        # 此时线程已安全停止，可以安全地移除对它们的引用了
-        self.run_thread = None
-        self.run_worker = None
-        print("Console: Run thread and worker have been cleaned up.")
+            self._run_task(command, command)
+
+    def _run_task(self, name, command, cwd=None):
+        """提交任务，同名任务正在运行时给通道名加上编号"""
+        running_names = {self.task_channels[task.id] for task in self.task_runner.tasks()}
+        channel = name
+        index = 2
+        while channel in running_names:
+            channel = f"{name} #{index}"
+            index += 1
+        # 准备UI
+        self.output_dock.show()
+        self.output_bar.clear_output(channel)
+        self.output_bar.show_output_channel(channel)
+        self.output_bar.append_output(f"> {command}\n" + "="*20, channel)
+        # 同一通道上一次运行识别出的诊断不再有效
+        if self.output_problems.pop(channel, None):
+            self.problems_refresh_timer.start()
+        parser = CompilerOutputParser(cwd or self.workspace_root)
+        task_id = self.task_runner.submit(name, command, cwd, parser)
+        self.task_channels[task_id] = channel
+        if self.task_runner.task(task_id).state == Task.QUEUED:
+            self.output_bar.append_output("等待其他任务结束...", channel)
+        return task_id
+
+    def _on_task_started(self, task_id):
+        tracing.begin_async("task", task_id, "process", command=self.task_runner.task(task_id).command)
+        self.statusBar().showMessage(f"正在执行: {self.task_runner.task(task_id).command}", 3000)
+
+    def _on_task_output(self, task_id, text):
+        self.output_bar.write_output(text, self.task_channels.get(task_id))
+
+    def _on_task_diagnostics(self, task_id, diagnostics):
+        channel = self.task_channels.get(task_id)
+        problems = self.output_problems.setdefault(channel, [])
+        problems.extend(
+            Problem(d["message"], d["file"], d["line"], d["severity"]) for d in diagnostics)
+        if not self.problems_refresh_timer.isActive():
+            self.problems_refresh_timer.start()
+
+    def _on_task_finished(self, task_id, exit_code, elapsed, cancelled):
+        """任务结束后显示退出代码和耗时，失败且输出中有诊断时切换到问题面板"""
+        tracing.end_async("task", task_id, "process", exit_code=exit_code, cancelled=cancelled)
+        channel = self.task_channels.pop(task_id, None)
+        if exit_code != 0 and not cancelled and self.output_problems.get(channel):
+            self.output_bar.tabs.setCurrentWidget(self.output_bar.problems_panel)
+        if cancelled:
+            message = f"任务已取消，用时 {elapsed:.2f} 秒"
+        else:
+            message = f"进程已结束，退出代码: {exit_code}，用时 {elapsed:.2f} 秒"
+        self.output_bar.append_output("\n" + "="*20 + f"\n{message}", channel)
+        self.statusBar().showMessage(f"{channel}: {message}", 5000)
+
+    def _on_build(self):
+        self._save_before_build()
+        self.build_controller.build(self.current_file_path)
+
+    def _on_build_and_run(self):
+        self._save_before_build()
+        self.build_controller.build(self.current_file_path, run=True)
+
+    def _save_before_build(self):
+        """构建读取的是磁盘上的文件，先保存当前修改"""
+        if self.current_file_path and self.editor.document().isModified():
+            self._on_file_save()
+            self.editor.document().setModified(False)
+
+    def _on_cancel_task(self):
+        """从正在运行和排队的任务中选择一个取消"""
+        tasks = self.task_runner.tasks()
+        if not tasks:
+            self.statusBar().showMessage("没有正在运行的任务", 3000)
+            return
+        labels = [f"[{task.state}] {self.task_channels.get(task.id, task.name)}" for task in tasks]
+        label, ok = QInputDialog.getItem(self, "取消任务", "选择要取消的任务:", labels, 0, False)
+        if ok and label:
+            self.task_runner.cancel(tasks[labels.index(label)].id)
+
+    def _on_cancel_all_tasks(self):
+        self.task_runner.cancel_all()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
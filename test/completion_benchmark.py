@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.core.completion import DocumentWords, CompletionEngine
+
+# 代码补全基准：生成一个大文件和一批工作区符号名称，统计统计全文标识符、逐行编辑后的增量更新和逐字输入时每次补全查询的耗时
+# 用法: python test/completion_benchmark.py --lines 50000 --workspace-names 100000 --output result.json
+
+WORDS = ["parse", "token", "buffer", "node", "list", "tree", "read", "write", "count", "value",
+         "index", "table", "hash", "queue", "stack", "point", "line", "file", "state", "error"]
+
+
+def generate_lines(rng, count):
+    lines = []
+    while len(lines) < count:
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{len(lines)}"
+        lines.append(f"int {name}(int a, int b) {{")
+        lines.append(f"    int {rng.choice(WORDS)}_sum = a + b;")
+        lines.append(f"    return {rng.choice(WORDS)}_{rng.choice(WORDS)}(a) + b;")
+        lines.append("}")
+    return lines[:count]
+
+
+def timed(func, inputs):
+    times = []
+    for value in inputs:
+        start = time.perf_counter()
+        func(value)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 3), "p99_ms": round(sorted(times)[int(len(times) * 0.99)], 3),
+            "max_ms": round(max(times), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="代码补全基准测试")
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--workspace-names", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--output", default="completion_benchmark.json")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lines = generate_lines(rng, args.lines)
+    words = DocumentWords()
+    start = time.perf_counter()
+    words.replace_lines(0, 0, lines)
+    build_ms = (time.perf_counter() - start) * 1000
+    engine = CompletionEngine(words)
+    engine.set_workspace_names(sorted({f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_ws{i}"
+                                       for i in range(args.workspace_names)}))
+    print(f"统计全文标识符: {args.lines} 行, {len(words.index)} 个不同的标识符, {build_ms:.0f} ms")
+
+    # 修改一行(相当于输入一个字符)
+    edit_lines = [rng.randrange(args.lines) for _ in range(args.queries)]
+    edit = timed(lambda line: words.replace_lines(line, 1, [lines[line] + " x_new"]), edit_lines)
+
+    # 逐字输入一个名称，每个前缀查询一次
+    prefixes = []
+    for _ in range(args.queries // 10):
+        word = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}"
+        prefixes += [word[:n] for n in range(1, len(word) + 1)]
+    budget = 5
+    query = timed(lambda prefix: engine.complete(prefix, rng.randrange(args.lines), 50, budget), prefixes)
+
+    result = {
+        "python": platform.python_version(),
+        "lines": args.lines,
+        "document_words": len(words.index),
+        "workspace_names": len(engine.workspace_names),
+        "build_ms": round(build_ms, 1),
+        "line_edit": edit,
+        "query": query,
+        "budget_ms": budget,
+    }
+    for key in ("line_edit", "query"):
+        print(f"{key}: 中位数 {result[key]['median_ms']} ms, p99 {result[key]['p99_ms']} ms, 最大 {result[key]['max_ms']} ms")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+# 无显示环境下也能运行，必须在导入Qt之前设置
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import gc
+import json
+import time
+import random
+import platform
+import argparse
+import tracemalloc
+import statistics
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtGui import QTextDocument, QTextCursor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.components.syntax_highlighter_customer import CustomHighlighter, get_lexer_for_file
+
+# CustomHighlighter 性能基准测试
+# 用法: python test/highlight_benchmark.py --output result.json [--compare last.json]
+
+C_SNIPPET = [
+    "#include <stdio.h>",
+    "/* block comment {n} */",
+    "static int table_{n}[16] = {{0, 1, 2, 3}};",
+    "int func_{n}(int a, char *s) {{",
+    "    // line comment",
+    "    if (a > {n} && s != NULL) {{",
+    "        printf(\"value %d\\n\", a * 0x1F);",
+    "    }}",
+    "    return a + table_{n}[a & 15];",
+    "}}",
+]
+
+MINIC_SNIPPET = [
+    "int g_{n};",
+    "int func_{n}(int a, int b) {{",
+    "    int i;",
+    "    i = 0;",
+    "    while (i < a) {{",
+    "        if (i == b || i > {n}) {{ g_{n} = g_{n} + i; }} else {{ i = i + 1; }}",
+    "        i = i + 1;",
+    "    }}",
+    "    return g_{n};",
+    "}}",
+]
+
+PY_SNIPPET = [
+    "import os",
+    "# comment {n}",
+    "class Item{n}(object):",
+    "    \"\"\"docstring {n}\"\"\"",
+    "    def run(self, value=0x{n:x}):",
+    "        if value and self.name != 'x':",
+    "            return [v * 2 for v in range(value)]",
+    "        return f\"{{value}} done\"",
+    "",
+    "",
+]
+
+LANGUAGES = {
+    # MiniC 是 C 的子集，使用 C 的 lexer
+    "c": ("bench.c", C_SNIPPET),
+    "minic": ("bench.c", MINIC_SNIPPET),
+    "python": ("bench.py", PY_SNIPPET),
+}
+
+
+def generate_source(snippet, line_count):
+    """重复代码片段直到达到指定行数"""
+    lines = []
+    n = 0
+    while len(lines) < line_count:
+        lines.extend(line.format(n=n) for line in snippet)
+        n += 1
+    return "\n".join(lines[:line_count])
+
+
+def rss_bytes():
+    """当前进程常驻内存，仅在 Linux 上可用"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def bench_case(file_name, snippet, line_count, keystrokes, style_name):
+    lexer = get_lexer_for_file(file_name)
+    text = generate_source(snippet, line_count)
+    doc = QTextDocument()
+    doc.setPlainText(text)
+
+    gc.collect()
+    rss_before = rss_bytes()
+    tracemalloc.start()
+    # 先不绑定文档，保证计时只包含一次完整的高亮
+    highlighter = CustomHighlighter(None, lexer, style_name)
+    highlighter.setDocument(doc)
+    start = time.perf_counter()
+    highlighter.rehighlight()
+    full_ms = (time.perf_counter() - start) * 1000
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = rss_bytes()
+
+    # 在随机行中间插入字符，模拟逐键输入
+    rng = random.Random(line_count)
+    latencies = []
+    for _ in range(keystrokes):
+        block = doc.findBlockByNumber(rng.randrange(doc.blockCount()))
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.Right, QTextCursor.MoveAnchor, block.length() // 2)
+        start = time.perf_counter()
+        cursor.insertText("x")
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    highlighter.setDocument(None)
+    latencies.sort()
+    return {
+        "lines": line_count,
+        "full_highlight_ms": round(full_ms, 3),
+        "keystroke_ms": {
+            "median": round(statistics.median(latencies), 4),
+            "p95": round(latencies[int(len(latencies) * 0.95) - 1], 4),
+            "max": round(latencies[-1], 4),
+        },
+        "python_peak_bytes": py_peak,
+        "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+    }
+
+
+def compare(results, baseline_path):
+    """和上一次的结果比较，打印耗时变化"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(c["language"], c["lines"]): c for c in json.load(f)["cases"]}
+    for case in results["cases"]:
+        old = baseline.get((case["language"], case["lines"]))
+        if not old:
+            continue
+        for key, new_value, old_value in (
+            ("full", case["full_highlight_ms"], old["full_highlight_ms"]),
+            ("keystroke p95", case["keystroke_ms"]["p95"], old["keystroke_ms"]["p95"]),
+        ):
+            ratio = new_value / old_value if old_value else float("inf")
+            flag = "  <-- 变慢" if ratio > 1.1 else ""
+            print(f"{case['language']:>7} {case['lines']:>7} {key:>14}: {old_value:.3f} -> {new_value:.3f} ms (x{ratio:.2f}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="语法高亮性能基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--languages", nargs="+", default=list(LANGUAGES), choices=list(LANGUAGES))
+    parser.add_argument("--keystrokes", type=int, default=50)
+    parser.add_argument("--style", default="default")
+    parser.add_argument("--output", default="highlight_benchmark.json")
+    parser.add_argument("--compare", help="上一次运行输出的JSON，用来对比")
+    args = parser.parse_args()
+
+    # 文本格式和字体需要 QApplication，PySide6 自己持有这个单例，不需要保留引用
+    QApplication.instance() or QApplication([])
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "style": args.style,
+        "cases": [],
+    }
+    for language in args.languages:
+        file_name, snippet = LANGUAGES[language]
+        for size in args.sizes:
+            case = bench_case(file_name, snippet, size, args.keystrokes, args.style)
+            case["language"] = language
+            results["cases"].append(case)
+            print(f"{language:>7} {size:>7} lines: full {case['full_highlight_ms']:.1f} ms, "
+                  f"keystroke p95 {case['keystroke_ms']['p95']:.3f} ms")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"结果已写入 {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.core.outline import DocumentStructure, outline_items
+
+# 大纲/折叠基准：生成一个大的 MiniC 文件，统计全文扫描、单行编辑后的增量扫描、打开/关闭块注释后的重新扫描、区域树配对
+# 以及打字时(编辑一行后更新区域树)的耗时
+# 用法: python test/outline_benchmark.py --lines 50000 --output result.json
+
+
+def generate_lines(rng, count):
+    lines = []
+    while len(lines) < count:
+        n = len(lines)
+        if rng.random() < 0.1:
+            lines += [f"struct S{n} {{", "    int x; /* 坐标 */", "    int y;", "};"]
+            continue
+        lines += [f"int f{n}(int a, int b)", "{", "    int s = 0; // 累加", "    for (int i = 0; i < b; i++) {",
+                  "        s = s + \"{\"[0];", "    }", "    return s;", "}"]
+    return lines[:count]
+
+
+def timed(func, inputs):
+    times = []
+    for value in inputs:
+        start = time.perf_counter()
+        func(value)
+        times.append((time.perf_counter() - start) * 1000)
+    return {"median_ms": round(statistics.median(times), 3), "max_ms": round(max(times), 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大纲/折叠基准测试")
+    parser.add_argument("--lines", type=int, default=50000)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--output", default="outline_benchmark.json")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lines = generate_lines(rng, args.lines)
+    structure = DocumentStructure()
+    start = time.perf_counter()
+    structure.replace_lines(0, 0, lines)
+    scan_ms = (time.perf_counter() - start) * 1000
+    line_text = lines.__getitem__
+    start = time.perf_counter()
+    items = outline_items(structure.regions(line_text))
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"全文扫描: {args.lines} 行, {scan_ms:.0f} ms; 区域树: {len(items)} 个大纲项, {build_ms:.0f} ms")
+
+    def edit_line(line):
+        lines[line] = lines[line] + " x"
+        structure.replace_lines(line, 1, [lines[line]], line_text)
+    line_edit = timed(edit_line, [rng.randrange(args.lines) for _ in range(args.edits)])
+
+    def toggle_comment(line):
+        # 插入 "/*" 后后面的行全部变成注释，再删除恢复，都需要一直扫描到文件末尾
+        original = lines[line]
+        lines[line] = "/*" + original
+        structure.replace_lines(line, 1, [lines[line]], line_text)
+        lines[line] = original
+        structure.replace_lines(line, 1, [original], line_text)
+    comment_toggle = timed(toggle_comment, [rng.randrange(args.lines // 2) for _ in range(10)])
+
+    def rebuild(_):
+        structure.replace_lines(0, 1, [lines[0]], line_text)
+        structure.regions(line_text)
+    regions = timed(rebuild, range(20))
+
+    def type_line(line):
+        # 打字时的情况：在某一行输入字符并插入一个空行，然后更新区域树
+        lines[line] = lines[line] + " y"
+        lines.insert(line + 1, "")
+        structure.replace_lines(line, 1, lines[line:line + 2], line_text)
+        structure.regions(line_text)
+    typing = timed(type_line, [rng.randrange(args.lines) for _ in range(args.edits)])
+
+    result = {
+        "python": platform.python_version(),
+        "lines": args.lines,
+        "outline_items": len(items),
+        "scan_ms": round(scan_ms, 1),
+        "line_edit": line_edit,
+        "comment_toggle": comment_toggle,
+        "regions": regions,
+        "typing": typing,
+    }
+    for key in ("line_edit", "comment_toggle", "regions", "typing"):
+        print(f"{key}: 中位数 {result[key]['median_ms']} ms, 最大 {result[key]['max_ms']} ms")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
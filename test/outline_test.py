@@ -0,0 +1,185 @@
+# 文档结构和标识符的增量更新测试：每次编辑后按行增量更新的结果应当和整篇重新扫描相同
+# 编辑按 QTextDocument.contentsChange 的参数模拟，行号计算和 CodeEditor._on_contents_change 一致
+# 运行: python -m pytest test/outline_test.py 或 python -m unittest test.outline_test
+import random
+import unittest
+
+from my_ide.core.completion import DocumentWords
+from my_ide.core.outline import DocumentStructure, replaced_line_count, outline_items, innermost_region
+
+SAMPLE = """\
+// region 工具函数
+int add(int a, int b)
+{
+    return a + b; /* { */
+}
+// endregion
+
+struct Point {
+    int x;
+    int y;
+};
+
+int table[] =
+{
+    1, 2, 3
+};
+
+int main()
+{
+    char *s = "}{";
+    if (add(1, 2) > 2) {
+        return 1;
+    }
+    return 0;
+}
+"""
+
+# 随机编辑时插入的片段，包括会改变块注释、花括号和行数的文本
+SNIPPETS = ["{", "}", "\n", "/*", "*/", "//", '"', "x", "int f()\n{\n", "\n}\n", "// region r\n", "// endregion\n",
+            "/* a\nb */", "  ", "\n\n"]
+
+
+def block_of(text, position):
+    """position 所在的块号，和 QTextDocument.findBlock 一致"""
+    return text.count('\n', 0, position)
+
+
+class EditedDocument:
+    """用字符串模拟编辑器文档，编辑后像 CodeEditor 一样增量更新 DocumentStructure 和 DocumentWords"""
+    def __init__(self, text):
+        self.text = text
+        self.lines = text.split('\n')
+        self.structure = DocumentStructure()
+        self.structure.replace_lines(0, 0, self.lines)
+        self.words = DocumentWords()
+        self.words.replace_lines(0, 0, self.lines)
+
+    def line_text(self, line):
+        return self.lines[line]
+
+    def edit(self, position, chars_removed, inserted):
+        old_block_count = len(self.lines)
+        self.text = self.text[:position] + self.text[position + chars_removed:]
+        self.text = self.text[:position] + inserted + self.text[position:]
+        self.lines = self.text.split('\n')
+        first = block_of(self.text, position)
+        last = block_of(self.text, position + len(inserted))
+        old_count = replaced_line_count(first, last, len(self.lines), old_block_count)
+        texts = self.lines[first:last + 1]
+        self.structure.replace_lines(first, old_count, texts, self.line_text)
+        self.words.replace_lines(first, old_count, texts)
+
+
+def region_tree(regions):
+    return [(r.kind, r.name, r.line, r.end_line, r.fold_end, region_tree(r.children)) for r in regions]
+
+
+class IncrementalUpdateTest(unittest.TestCase):
+    def assert_matches_full_scan(self, document):
+        structure = DocumentStructure()
+        structure.replace_lines(0, 0, document.lines)
+        self.assertEqual(document.structure.lines, structure.lines)
+        self.assertEqual(region_tree(document.structure.regions(document.line_text)),
+                         region_tree(structure.regions(document.line_text)))
+        words = DocumentWords()
+        words.replace_lines(0, 0, document.lines)
+        self.assertEqual(document.words.lines, words.lines)
+        self.assertEqual(document.words.index.counts, words.index.counts)
+        self.assertEqual(document.words.index.words, words.index.words)
+
+    def test_replaced_line_count(self):
+        # 在一行中间输入字符
+        self.assertEqual(replaced_line_count(3, 3, 10, 10), 1)
+        # 在第3行输入回车，第3、4行在编辑前是一行
+        self.assertEqual(replaced_line_count(3, 4, 11, 10), 1)
+        # 删除第3行末尾的换行，第3行在编辑前是两行
+        self.assertEqual(replaced_line_count(3, 3, 9, 10), 2)
+        # 选中第2到5行替换成一行文本
+        self.assertEqual(replaced_line_count(2, 2, 7, 10), 4)
+
+    def test_single_edits(self):
+        for position in range(len(SAMPLE) + 1):
+            for inserted in ("\n", "{", "/*"):
+                document = EditedDocument(SAMPLE)
+                document.edit(position, 0, inserted)
+                self.assert_matches_full_scan(document)
+            if position < len(SAMPLE):
+                document = EditedDocument(SAMPLE)
+                document.edit(position, 1, "")
+                self.assert_matches_full_scan(document)
+
+    def test_block_comment_rescans_following_lines(self):
+        document = EditedDocument(SAMPLE)
+
+        def names():
+            return [r.name for r in outline_items(document.structure.regions(document.line_text))]
+
+        # 注释一直到 add 函数中的 */ 为止
+        document.edit(0, 0, "/*\n")
+        self.assert_matches_full_scan(document)
+        self.assertEqual(names(), ["Point", "main"])
+        # 删掉 */ 后注释延续到文件末尾，后面的行都要重新扫描
+        position = document.text.index("*/")
+        document.edit(position, 2, "")
+        self.assert_matches_full_scan(document)
+        self.assertEqual(names(), [])
+        document.edit(position, 0, "*/")
+        self.assert_matches_full_scan(document)
+        self.assertEqual(names(), ["Point", "main"])
+        document.edit(0, 3, "")
+        self.assert_matches_full_scan(document)
+        self.assertEqual(names(), ["工具函数", "Point", "main"])
+
+    def test_random_edits(self):
+        rng = random.Random(50)
+        document = EditedDocument(SAMPLE)
+        for _ in range(2000):
+            position = rng.randint(0, len(document.text))
+            removed = min(rng.choice((0, 0, 1, 3, 12)), len(document.text) - position)
+            document.edit(position, removed, rng.choice(SNIPPETS + [""]))
+            self.assert_matches_full_scan(document)
+
+    def test_random_edits_between_regions(self):
+        # 两次取区域树之间有多次编辑，变化的范围要合并后再重新配对
+        rng = random.Random(51)
+        document = EditedDocument(SAMPLE * 4)
+        for _ in range(500):
+            for _ in range(rng.randint(1, 5)):
+                position = rng.randint(0, len(document.text))
+                removed = min(rng.choice((0, 0, 1, 3, 12)), len(document.text) - position)
+                document.edit(position, removed, rng.choice(SNIPPETS + [""]))
+            self.assert_matches_full_scan(document)
+
+
+class RegionLineTest(unittest.TestCase):
+    def regions(self, text):
+        lines = text.split('\n')
+        structure = DocumentStructure()
+        structure.replace_lines(0, 0, lines)
+        return structure.regions(lambda line: lines[line])
+
+    def test_function_starts_at_declaration(self):
+        function, = self.regions("int f(int x)\n{\n    return x;\n}\n")
+        self.assertEqual((function.kind, function.name), ("function", "f"))
+        # 跳转到声明所在行，折叠时左花括号所在行也隐藏
+        self.assertEqual((function.line, function.fold_end, function.end_line), (0, 2, 3))
+        self.assertIs(innermost_region([function], 0), function)
+
+    def test_declaration_with_brace_on_same_line(self):
+        struct, = self.regions("struct S {\n    int x;\n};\n")
+        self.assertEqual((struct.kind, struct.name, struct.line, struct.fold_end), ("struct", "S", 0, 1))
+
+    def test_blank_lines_before_brace(self):
+        function, = self.regions("void g()\n\n{\n}\n")
+        self.assertEqual((function.name, function.line, function.fold_end), ("g", 0, 2))
+
+    def test_block_starts_at_brace(self):
+        block, = self.regions("int a[] =\n{\n    1\n};\n")
+        self.assertEqual((block.kind, block.line, block.fold_end), ("block", 1, 2))
+        block, = self.regions("int x;\n{\n    x = 1;\n}\n")
+        self.assertEqual((block.kind, block.line), ("block", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
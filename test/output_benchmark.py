@@ -0,0 +1,158 @@
+import os
+# 无显示环境下也能运行，必须在导入Qt之前设置
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import json
+import time
+import platform
+import argparse
+
+from PySide6.QtWidgets import QApplication, QPlainTextEdit
+from PySide6.QtCore import QThread, QEventLoop
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.components.output_panel import OutputPanel
+from my_ide.controllers.process_worker import ProcessWorker
+from my_ide.config.settings import OUTPUT_READ_CHUNK
+
+# 输出面板吞吐量基准测试(行/秒)
+# 用法: python test/output_benchmark.py --output result.json [--compare last.json]
+
+
+def generate_output(line_count):
+    return "".join(f"line {i}: the quick brown fox jumps over the lazy dog\n" for i in range(line_count))
+
+
+def wait_until(app, condition, timeout=600):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        app.processEvents(QEventLoop.AllEvents, 50)
+
+
+def bench_panel(app, line_count, max_lines):
+    """按子进程读取的块大小直接写入面板，只测面板本身"""
+    text = generate_output(line_count)
+    panel = OutputPanel(max_lines=max_lines)
+    panel.resize(800, 400)
+    panel.show()
+    start = time.perf_counter()
+    for i in range(0, len(text), OUTPUT_READ_CHUNK):
+        panel.write(text[i:i + OUTPUT_READ_CHUNK])
+        app.processEvents()
+    panel.flush()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    blocks = panel.document().blockCount()
+    panel.deleteLater()
+    return elapsed, blocks
+
+
+def bench_legacy(app, line_count):
+    """旧实现：每行一次 appendPlainText，没有上限"""
+    lines = generate_output(line_count).splitlines()
+    panel = QPlainTextEdit()
+    panel.setReadOnly(True)
+    panel.resize(800, 400)
+    panel.show()
+    start = time.perf_counter()
+    for line in lines:
+        panel.appendPlainText(line)
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    blocks = panel.document().blockCount()
+    panel.deleteLater()
+    return elapsed, blocks
+
+
+def bench_process(app, line_count, max_lines):
+    """端到端：子进程输出 -> ProcessWorker -> 输出面板"""
+    command = f'"{sys.executable}" -c "import sys; sys.stdout.write(\'line 0123456789 abcdefghij\\n\' * {line_count})"'
+    panel = OutputPanel(max_lines=max_lines)
+    panel.resize(800, 400)
+    panel.show()
+    thread = QThread()
+    worker = ProcessWorker(command)
+    worker.moveToThread(thread)
+    done = []
+    thread.started.connect(worker.run)
+    worker.new_output.connect(panel.write)
+    worker.finished.connect(done.append)
+    worker.finished.connect(thread.quit)
+    start = time.perf_counter()
+    thread.start()
+    wait_until(app, lambda: done and thread.isFinished())
+    app.processEvents()
+    panel.flush()
+    elapsed = time.perf_counter() - start
+    thread.wait()
+    blocks = panel.document().blockCount()
+    panel.deleteLater()
+    return elapsed, blocks, done[0] if done else None
+
+
+def make_case(name, line_count, elapsed, blocks):
+    return {
+        "case": name,
+        "lines": line_count,
+        "seconds": round(elapsed, 4),
+        "lines_per_sec": round(line_count / elapsed) if elapsed else None,
+        "document_blocks": blocks,
+    }
+
+
+def compare(results, baseline_path):
+    """和上一次的结果比较，打印吞吐量变化"""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {(c["case"], c["lines"]): c for c in json.load(f)["cases"]}
+    for case in results["cases"]:
+        old = baseline.get((case["case"], case["lines"]))
+        if not old or not old["lines_per_sec"] or not case["lines_per_sec"]:
+            continue
+        ratio = case["lines_per_sec"] / old["lines_per_sec"]
+        flag = "  <-- 变慢" if ratio < 0.9 else ""
+        print(f"{case['case']:>8} {case['lines']:>8}: {old['lines_per_sec']} -> {case['lines_per_sec']} 行/秒 (x{ratio:.2f}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="输出面板吞吐量基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--max-lines", type=int, default=10000, help="输出面板保留的最大行数")
+    parser.add_argument("--legacy-limit", type=int, default=100000,
+                        help="旧实现只测不超过这个行数的用例，0 表示不测")
+    parser.add_argument("--output", default="output_benchmark.json")
+    parser.add_argument("--compare", help="上一次运行输出的JSON，用来对比")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "max_lines": args.max_lines,
+        "cases": [],
+    }
+    for size in args.sizes:
+        runs = [("panel", *bench_panel(app, size, args.max_lines))]
+        elapsed, blocks, return_code = bench_process(app, size, args.max_lines)
+        if return_code != 0:
+            print(f"子进程退出代码 {return_code}，结果可能不准确")
+        runs.append(("process", elapsed, blocks))
+        if 0 < size <= args.legacy_limit:
+            runs.append(("legacy", *bench_legacy(app, size)))
+        for name, elapsed, blocks in runs:
+            case = make_case(name, size, elapsed, blocks)
+            results["cases"].append(case)
+            print(f"{name:>8} {size:>8} lines: {case['seconds']:.3f} s, "
+                  f"{case['lines_per_sec']} 行/秒, 保留 {blocks} 行")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"结果已写入 {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
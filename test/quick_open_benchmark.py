@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.core.fuzzy import FuzzyFileMatcher
+
+# 快速打开模糊匹配基准测试：模拟逐键输入，统计每次按键的匹配耗时
+# 用法: python test/quick_open_benchmark.py --paths 100000 --output result.json
+#   "keystroke_ms" 为按键到第一次返回结果(时间预算内的部分结果)的耗时，"complete_ms" 为到完整结果的耗时
+
+WORDS = ["src", "lib", "core", "util", "test", "include", "app", "module", "view", "model",
+         "controller", "data", "io", "net", "ui", "widget", "parser", "lexer", "token", "main",
+         "config", "build", "docs", "vendor", "third_party", "common"]
+EXTS = [".c", ".h", ".py", ".cpp", ".md", ".txt", ".json", ".js"]
+QUERIES = ["main", "lexer.c", "tstpy", "ctrlpar", "xyzq", "uiwidget", "cfgjson"]
+
+
+def generate_paths(count, seed=1):
+    rng = random.Random(seed)
+    paths = set()
+    while len(paths) < count:
+        depth = rng.randint(1, 5)
+        parts = [rng.choice(WORDS) + (str(rng.randint(0, 30)) if rng.random() < 0.3 else "") for _ in range(depth)]
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}{rng.randint(0, 999)}{rng.choice(EXTS)}"
+        paths.add("/".join(parts + [name]))
+    return list(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="快速打开模糊匹配基准测试")
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--no-prepare", action="store_true", help="不在按键之间调用 prepare_next")
+    parser.add_argument("--budget-ms", type=float, default=10, help="每次按键的时间预算，0 表示不限制")
+    parser.add_argument("--output", default="quick_open_benchmark.json")
+    args = parser.parse_args()
+
+    paths = generate_paths(args.paths)
+    start = time.perf_counter()
+    matcher = FuzzyFileMatcher(paths)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    cases = []
+    all_latencies = []
+    all_complete = []
+    for query in QUERIES:
+        matcher.reset()
+        latencies = []
+        complete = []
+        for end in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = matcher.match(query[:end], args.limit, budget_ms=args.budget_ms or None)
+            latencies.append((time.perf_counter() - start) * 1000)
+            # 和 QuickOpenWorker 一样，先返回部分结果，再扫描完剩下的部分，然后在两次按键之间补全增量过滤需要的结果
+            if not matcher.is_complete():
+                results = matcher.finish(args.limit)
+            complete.append((time.perf_counter() - start) * 1000)
+            if not args.no_prepare:
+                matcher.prepare_next()
+        all_latencies.extend(latencies)
+        all_complete.extend(complete)
+        cases.append({
+            "query": query,
+            "keystroke_ms": [round(value, 3) for value in latencies],
+            "complete_ms": [round(value, 3) for value in complete],
+            "results": len(results),
+            "top": results[0][1] if results else None,
+        })
+        print(f"{query:>10}: " + " ".join(f"{value:.1f}" for value in latencies) + f" ms, {len(results)} 个结果")
+
+    all_latencies.sort()
+    summary = {
+        "median": round(statistics.median(all_latencies), 3),
+        "p95": round(all_latencies[int(len(all_latencies) * 0.95) - 1], 3),
+        "max": round(all_latencies[-1], 3),
+        "over_16ms": sum(1 for value in all_latencies if value > 16),
+    }
+    all_complete.sort()
+    complete_summary = {
+        "median": round(statistics.median(all_complete), 3),
+        "p95": round(all_complete[int(len(all_complete) * 0.95) - 1], 3),
+        "max": round(all_complete[-1], 3),
+    }
+    results = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "paths": args.paths,
+        "build_ms": round(build_ms, 3),
+        "budget_ms": args.budget_ms,
+        "keystrokes": summary,
+        "complete": complete_summary,
+        "cases": cases,
+    }
+    print(f"构建 {build_ms:.1f} ms，每次按键 median {summary['median']} ms, p95 {summary['p95']} ms, max {summary['max']} ms")
+    print(f"完整结果 median {complete_summary['median']} ms, p95 {complete_summary['p95']} ms, max {complete_summary['max']} ms")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"结果已写入 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
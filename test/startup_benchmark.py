@@ -0,0 +1,71 @@
+import os
+import re
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动基准测试：多次冷启动 IDE，记录启动到主窗口首次绘制的耗时
+# 用法: python test/startup_benchmark.py --runs 5 --output result.json
+#   每次启动一个新进程(offscreen)，窗口绘制后立即退出
+#   "first_paint_ms" 为 main.py 报告的从导入 main 到首次绘制的时间
+#   "process_ms" 为进程从启动到退出的总时间，包括解释器启动和退出
+
+FIRST_PAINT = re.compile(r"启动到首次绘制 ([\d.]+) ms")
+
+
+def run_once(workspace):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", MY_IDE_QUIT_AFTER_PAINT="1")
+    env["PYTHONPATH"] = PROJECT_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-m", "my_ide.main"], cwd=workspace, env=env,
+                          capture_output=True, timeout=120)
+    process_ms = (time.perf_counter() - start) * 1000
+    # 首次绘制时间由日志输出到 stderr
+    output = proc.stderr.decode("utf-8", errors="replace")
+    match = FIRST_PAINT.search(output)
+    if not match:
+        raise RuntimeError(f"没有找到首次绘制时间(退出代码 {proc.returncode}):\n{output}")
+    return float(match.group(1)), process_ms
+
+
+def summarize(values):
+    return {
+        "median": round(statistics.median(values), 1),
+        "min": round(min(values), 1),
+        "max": round(max(values), 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="启动时间基准测试")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workspace", default=PROJECT_ROOT, help="启动时的工作目录(工作区)")
+    parser.add_argument("--output", default="startup_benchmark.json")
+    args = parser.parse_args()
+
+    first_paint, process = [], []
+    for i in range(args.runs):
+        paint_ms, process_ms = run_once(args.workspace)
+        first_paint.append(paint_ms)
+        process.append(process_ms)
+        print(f"第 {i + 1} 次: 首次绘制 {paint_ms:.1f} ms, 进程总耗时 {process_ms:.1f} ms")
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workspace": os.path.abspath(args.workspace),
+        "runs": args.runs,
+        "first_paint_ms": summarize(first_paint),
+        "process_ms": summarize(process),
+    }
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"结果已写入 {args.output}")
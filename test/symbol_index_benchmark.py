@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.core.symbol_index import SymbolIndex, index_source_file
+
+# 符号索引基准测试：生成一批 MiniC 源文件，统计建立索引、转到定义、查找引用、工作区符号搜索和单个文件更新的耗时
+# 用法: python test/symbol_index_benchmark.py --files 10000 --output result.json
+
+WORDS = ["parse", "token", "buffer", "node", "list", "tree", "read", "write", "count", "value",
+         "index", "table", "hash", "queue", "stack", "point", "line", "file", "state", "error"]
+
+
+def generate_source(rng, file_no):
+    lines = [f"struct {rng.choice(WORDS).title()}{file_no} {{ int x; int y; }};",
+             f"int {rng.choice(WORDS)}_total_{file_no} = 0;"]
+    for i in range(rng.randint(5, 15)):
+        name = f"{rng.choice(WORDS)}_{rng.choice(WORDS)}_{file_no}_{i}"
+        lines.append(f"int {name}(int a, int b) {{")
+        lines.append("    int sum = a + b;")
+        lines.append("    for (int k = 0; k < b; k++) { sum = sum + k; }")
+        lines.append("    return sum;")
+        lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="符号索引基准测试")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--output", default="symbol_index_benchmark.json")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    workspace = tempfile.mkdtemp(prefix="symbol_bench_")
+    try:
+        paths = []
+        for i in range(args.files):
+            rel_path = os.path.join(f"dir{i % 100}", f"file{i}.mc")
+            os.makedirs(os.path.join(workspace, os.path.dirname(rel_path)), exist_ok=True)
+            with open(os.path.join(workspace, rel_path), "w", encoding="utf-8") as f:
+                f.write(generate_source(rng, i))
+            paths.append(rel_path)
+
+        index = SymbolIndex(os.path.join(workspace, ".seu_ide", "symbols.db"))
+        start = time.perf_counter()
+        names = []
+        for rel_path in paths:
+            full_path = os.path.join(workspace, rel_path)
+            _, symbols, occurrences = index_source_file(full_path)
+            stat = os.stat(full_path)
+            index.replace_file(rel_path, stat.st_size, stat.st_mtime, symbols, occurrences)
+            names.extend(symbol.name for symbol in symbols if symbol.kind == "function")
+        index.commit()
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"建立索引: {args.files} 个文件, {len(names)} 个函数, {build_ms:.0f} ms(单进程)")
+
+        def timed(func, inputs):
+            times = []
+            for value in inputs:
+                start = time.perf_counter()
+                func(value)
+                times.append((time.perf_counter() - start) * 1000)
+            return {"median_ms": round(statistics.median(times), 3), "max_ms": round(max(times), 3)}
+
+        definition = timed(index.definitions, rng.sample(names, min(args.queries, len(names))))
+        references = timed(index.references, rng.sample(names, min(args.queries, len(names))))
+        # 参数名 a 在每个函数中都出现，是结果最多的情况
+        common_references = timed(index.references, ["a", "sum"])
+        prefixes = [name[:rng.randint(2, 6)] for name in rng.sample(names, min(args.queries, len(names)))]
+        prefix_search = timed(lambda query: index.search(query, 50), prefixes)
+        substring_search = timed(lambda query: index.search(query, 50), ["total_4", "count_point", "zzz"])
+
+        update_source = generate_source(rng, 0)
+        update = timed(lambda _: (index.replace_file(paths[0], len(update_source), time.time(),
+                                                     *index_source_file(os.path.join(workspace, paths[0]))[1:]),
+                                  index.commit()), range(20))
+        index.close()
+        db_size = os.path.getsize(os.path.join(workspace, ".seu_ide", "symbols.db"))
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    result = {
+        "python": platform.python_version(),
+        "files": args.files,
+        "functions": len(names),
+        "build_ms": round(build_ms, 1),
+        "db_bytes": db_size,
+        "definition": definition,
+        "references": references,
+        "common_references": common_references,
+        "prefix_search": prefix_search,
+        "substring_search": substring_search,
+        "single_file_update": update,
+    }
+    for key in ("definition", "references", "common_references", "prefix_search", "substring_search", "single_file_update"):
+        print(f"{key}: 中位数 {result[key]['median_ms']} ms, 最大 {result[key]['max_ms']} ms")
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
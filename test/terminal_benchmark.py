@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import tempfile
+from PySide6.QtWidgets import QApplication, QWidget, QHBoxLayout, QScrollBar
+from PySide6.QtCore import Qt, QObject, Signal
+from termqt import Terminal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from my_ide.core.pty_io import PosixPtyIO
+from my_ide.components.terminal_buffer import TerminalRenderBuffer
+
+# 终端吞吐量测试：在伪终端中 cat 一个大文件，统计从启动到输出结束的时间
+# 用法: python test/terminal_benchmark.py [--size-mb 100] [--mode buffered|direct] [--output result.json]
+#   buffered  每帧合并一次输出(终端面板当前的做法)
+#   direct    每块输出都立即写入终端(旧的做法)
+
+
+class DirectRelay(QObject):
+    """旧的做法：读取线程的每一块输出都单独转到主线程写入终端"""
+    chunk = Signal(bytes)
+
+
+def make_test_file(size_mb):
+    line = b"".join(bytes([48 + (i % 75)]) for i in range(79)) + b"\n"
+    f = tempfile.NamedTemporaryFile(prefix="terminal_bench_", suffix=".txt", delete=False)
+    block = line * (1024 * 1024 // len(line) + 1)
+    remaining = size_mb * 1024 * 1024
+    while remaining > 0:
+        f.write(block[:remaining])
+        remaining -= len(block)
+    f.close()
+    return f.name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="终端吞吐量测试")
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--mode", choices=["buffered", "direct"], default="buffered")
+    parser.add_argument("--output", help="把结果写入JSON文件")
+    args = parser.parse_args()
+
+    if platform.system() not in ["Linux", "Darwin"]:
+        print(f"Not supported platform: {platform.system()}")
+        sys.exit(-1)
+
+    logger = logging.getLogger()
+    logger.setLevel(logging.WARNING)
+    handler = logging.StreamHandler()
+    formatter = logging.Formatter(
+        "[%(asctime)s] > "
+        "[%(filename)s:%(lineno)d] %(message)s"
+    )
+    handler.setFormatter(formatter)
+    logger.addHandler(handler)
+
+    app = QApplication([])
+    window = QWidget()
+    window.setWindowTitle("terminal benchmark on {}".format(platform.system()))
+    layout = QHBoxLayout()
+    terminal = Terminal(800, 600, logger=logger)
+    terminal.set_font()
+    terminal.maximum_line_history = 2000
+    scroll = QScrollBar(Qt.Vertical, terminal)
+    terminal.connect_scroll_bar(scroll)
+
+    layout.addWidget(terminal)
+    layout.addWidget(scroll)
+    layout.setSpacing(0)
+    window.setLayout(layout)
+    window.show()
+
+    path = make_test_file(args.size_mb)
+    stats = {"chunks": 0, "renders": 0, "bytes": 0}
+
+    def render(data):
+        stats["renders"] += 1
+        stats["bytes"] += len(data)
+        terminal.stdout(data)
+
+    if args.mode == "buffered":
+        sink = TerminalRenderBuffer(render)
+        write = sink.write
+    else:
+        relay = DirectRelay()
+        relay.chunk.connect(render)
+        write = relay.chunk.emit
+
+    def on_output(data):
+        stats["chunks"] += 1
+        write(data)
+
+    terminal_io = PosixPtyIO(terminal.row_len, terminal.col_len, ["cat", path], logger=logger)
+    terminal.enable_auto_wrap(True)
+    terminal_io.stdout_callback = on_output
+    terminal.stdin_callback = terminal_io.write
+    terminal.resize_callback = terminal_io.resize
+
+    start = time.perf_counter()
+
+    def on_exit():
+        # 在读取线程中调用，回到主线程等剩余输出写完后结束
+        relay_exit.chunk.emit(b"")
+
+    def finish(_):
+        if args.mode == "buffered":
+            sink.flush()
+        app.processEvents()
+        elapsed = time.perf_counter() - start
+        result = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mode": args.mode,
+            "size_mb": args.size_mb,
+            "seconds": round(elapsed, 3),
+            "mb_per_sec": round(args.size_mb / elapsed, 2) if elapsed else None,
+            "chunks_read": stats["chunks"],
+            "renders": stats["renders"],
+            "bytes_rendered": stats["bytes"],
+        }
+        print(json.dumps(result, indent=2))
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+        os.unlink(path)
+        app.quit()
+
+    relay_exit = DirectRelay()
+    relay_exit.chunk.connect(finish)
+    terminal_io.exit_callback = on_exit
+    terminal_io.spawn()
+
+    sys.exit(app.exec())